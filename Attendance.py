@@ -142,15 +142,14 @@ def get_employee_history(emp_id, days=30):
     return df[(df["emp_id"] == emp_id) & (df["timestamp"] >= cutoff)].sort_values("timestamp", ascending=False)
 
 def get_attendance_stats():
-    today = datetime.now().strftime('%Y-%m-%d')
-    df = pd.DataFrame(st.session_state.attendance)
-    today_df = df[df["timestamp"].dt.strftime('%Y-%m-%d') == today] if not df.empty else pd.DataFrame()
+    # Today's summary is kept up to date by attendance_store on every check-in
+    today = attendance_store.daily_attendance()
     
     total = len([e for e in st.session_state.employees.keys() if e != "ADMIN"])
-    present = today_df["emp_id"].nunique() if not today_df.empty else 0
-    wfo = len(today_df[today_df["status"] == "WFO"]) if not today_df.empty else 0
-    wfh = len(today_df[today_df["status"] == "WFH"]) if not today_df.empty else 0
-    leave = len(today_df[today_df["status"] == "On Leave"]) if not today_df.empty else 0
+    present = len(today.latest)
+    wfo = today.count("WFO")
+    wfh = today.count("WFH")
+    leave = today.count("On Leave")
     
     return {"total": total, "present": present, "wfo": wfo, "wfh": wfh, "leave": leave, "absent": total-present}
 
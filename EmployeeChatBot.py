@@ -1,11 +1,11 @@
 import os
 import json
-from datetime import datetime, timedelta, time as dtime
-import pandas as pd
+from datetime import datetime, timedelta
 from dotenv import dotenv_values
 import threading
 import numpy as np
 import attendance_store
+import task_store
 
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
@@ -21,8 +21,6 @@ _last_refresh_ts = None
 _vocab = {}
 
 EXCEL_FILE_PATH = os.path.join(os.path.dirname(__file__), "task_tracker.xlsx")
-LATE_THRESHOLD_HOUR = 10
-LATE_THRESHOLD_MINUTE = 30
 
 System = f"""You are {Assistantname}, a smart employee analytics assistant.
 
@@ -79,35 +77,21 @@ def _load_employees():
         print(f"Error loading employees: {exc}")
         return {}
 
-def _load_attendance_records():
+def _load_attendance_records(since=None):
     try:
+        if since is not None:
+            return attendance_store.load_attendance_range(date_from=since)
         return attendance_store.load_attendance()
     except Exception as exc:
         print(f"Error loading attendance records: {exc}")
         return []
 
-def _load_performance_df():
+def _load_performance_df(emp_ids=None, names=None):
     try:
-        if not os.path.exists(EXCEL_FILE_PATH):
-            return None
-        df = pd.read_excel(EXCEL_FILE_PATH, engine="openpyxl")
+        df = task_store.load_tasks(EXCEL_FILE_PATH, emp_ids=emp_ids, names=names)
         if df is None or df.empty:
             return None
-        if "Employee Performance (%)" not in df.columns:
-            df["Employee Performance (%)"] = 0.0
-        df["Employee Performance (%)"] = (
-            pd.to_numeric(df["Employee Performance (%)"], errors="coerce")
-            .fillna(0.0)
-            .astype(float)
-        )
-        if "Effort (in hours)" in df.columns:
-            df["Effort (in hours)"] = (
-                pd.to_numeric(df["Effort (in hours)"], errors="coerce")
-                .fillna(0.0)
-                .astype(float)
-            )
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        # Dates, effort and performance are already typed by the task store
         return df
     except Exception as exc:
         print(f"Error loading performance data: {exc}")
@@ -199,14 +183,10 @@ def _summarise_attendance(emp_id: str):
     }
 
 def _summarise_performance(emp_id, emp_name):
-    df = _load_performance_df()
-    if df is None:
-        return None
-    emp_df = None
-    if "Emp Id" in df.columns and emp_id:
-        emp_df = df[df["Emp Id"].astype(str).str.upper() == emp_id.upper()]
-    if (emp_df is None or emp_df.empty) and emp_name and "Name" in df.columns:
-        emp_df = df[df["Name"].astype(str).str.strip().str.lower() == emp_name.strip().lower()]
+    # Only this employee's rows are read: by Emp Id, else by name
+    emp_df = _load_performance_df(emp_ids=[emp_id]) if emp_id else None
+    if (emp_df is None or emp_df.empty) and emp_name:
+        emp_df = _load_performance_df(names=[emp_name])
     if emp_df is None or emp_df.empty:
         return None
     total_tasks = len(emp_df)
@@ -346,56 +326,27 @@ def _build_employee_dashboard(emp_id: str, emp_info: dict):
 
 def _get_today_attendance_summary():
     try:
-        records = _load_attendance_records()
         employees = _load_employees() or {}
-        today = datetime.now().date()
-        present_employees = {}
-        wfo_list = []
-        wfh_list = []
-        leave_list = []
-        late_list = []
-        for rec in records:
-            ts = rec.get('timestamp')
-            try:
-                ts_dt = datetime.fromisoformat(ts.replace("Z", "+00:00")) if isinstance(ts, str) else ts
-            except Exception:
-                ts_dt = None
-            if ts_dt and ts_dt.date() == today:
-                emp_id = (rec.get('emp_id') or '').upper()
-                status = rec.get('status', '')
-                check_in = rec.get('check_in_time', '')
-                if emp_id and emp_id not in present_employees:
-                    emp_name = employees.get(emp_id, {}).get('name', emp_id)
-                    present_employees[emp_id] = {
-                        'name': emp_name,
-                        'status': status,
-                        'check_in': check_in
-                    }
-                    if status == 'WFO':
-                        wfo_list.append(f"{emp_name} ({emp_id})")
-                    elif status == 'WFH':
-                        wfh_list.append(f"{emp_name} ({emp_id})")
-                    elif status == 'On Leave':
-                        leave_list.append(f"{emp_name} ({emp_id})")
-                    if check_in:
-                        try:
-                            check_time = datetime.strptime(check_in, "%I:%M %p").time()
-                            threshold = dtime(LATE_THRESHOLD_HOUR, LATE_THRESHOLD_MINUTE)
-                            if check_time > threshold:
-                                late_list.append(f"{emp_name} ({emp_id}) - {check_in}")
-                        except Exception:
-                            pass
+        today = attendance_store.daily_attendance()
+        def _label(emp_id):
+            return f"{employees.get(emp_id, {}).get('name', emp_id)} ({emp_id})"
+        present_list = [_label(emp_id) for emp_id in today.latest]
+        wfo_list = [_label(emp_id) for emp_id in today.with_status('WFO')]
+        wfh_list = [_label(emp_id) for emp_id in today.with_status('WFH')]
+        leave_list = [_label(emp_id) for emp_id in today.with_status('On Leave')]
+        late_list = [
+            f"{_label(emp_id)} - {rec.get('check_in_time')}"
+            for emp_id, rec in today.latest.items() if emp_id in today.late
+        ]
         total_emps = len(employees)
-        present_count = len(present_employees)
+        present_count = len(today.latest)
         absent_count = total_emps - present_count
-        absent_list = []
-        for emp_id, emp_data in employees.items():
-            if emp_id not in present_employees:
-                absent_list.append(f"{emp_data.get('name', emp_id)} ({emp_id})")
+        absent_list = [_label(emp_id) for emp_id in today.absent(employees)]
         return {
             'total': total_emps,
             'present': present_count,
             'absent': absent_count,
+            'present_list': present_list,
             'wfo': wfo_list,
             'wfh': wfh_list,
             'leave': leave_list,
@@ -486,29 +437,18 @@ def _build_employee_doc(emp_id, info, df, records):
 
 def _build_corpus():
     employees = _load_employees() or {}
-    records = _load_attendance_records() or []
+    today = datetime.now().date()
+    # Employee docs only look back 30 days
+    records = _load_attendance_records(since=today - timedelta(days=30)) or []
     df = _load_performance_df()
     docs, ids, metas = [], [], []
-    today = datetime.now().date()
-    present = {}
-    wfo, wfh, leave = [], [], []
-    for rec in records:
-        ts = rec.get('timestamp')
-        try:
-            dt = datetime.fromisoformat(ts.replace('Z','+00:00')) if isinstance(ts, str) else ts
-        except Exception:
-            dt = None
-        if dt and dt.date() == today:
-            eid = (rec.get('emp_id') or '').upper()
-            nm = employees.get(eid, {}).get('name', eid)
-            present[eid] = nm
-            stt = rec.get('status')
-            if stt == 'WFO':
-                wfo.append(f"{nm} ({eid})")
-            elif stt == 'WFH':
-                wfh.append(f"{nm} ({eid})")
-            elif stt == 'On Leave':
-                leave.append(f"{nm} ({eid})")
+    summary = attendance_store.daily_attendance(today)
+    def _name(eid):
+        return employees.get(eid, {}).get('name', eid)
+    present = {eid: _name(eid) for eid in summary.latest}
+    wfo = [f"{_name(eid)} ({eid})" for eid in summary.with_status('WFO')]
+    wfh = [f"{_name(eid)} ({eid})" for eid in summary.with_status('WFH')]
+    leave = [f"{_name(eid)} ({eid})" for eid in summary.with_status('On Leave')]
     total_emps = len(employees)
     present_count = len(present)
     absent_count = total_emps - present_count
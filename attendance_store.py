@@ -1,14 +1,84 @@
+"""
+Attendance and employee account storage.
+
+Two backends sit behind the same functions, chosen with the
+``attendance_store_backend`` key in ``config.json``:
+
+- ``csv`` (default): attendance rows appended to ``attendance_records.csv`` and
+  accounts kept in ``employees.json``.
+- ``sqlite``: both in ``attendance.db`` (WAL mode), with attendance indexed by
+  (emp_id, date) and by date. The CSV/JSON files are imported once, the first
+  time the database is opened (see ``migrate_to_sqlite``).
+
+Accounts are served from a process-wide directory cache with lookups by id,
+email, name and department. Writes made through this module update it in
+place; changes made by other processes are noticed from the store's file
+stats, checked at most every ``RECHECK_SECONDS``.
+"""
+
 import csv
+import io
 import json
+import logging
 import os
-from datetime import datetime
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, time as dtime, timedelta
 import hashlib
 
+import pandas as pd
+
 BASE_DIR = os.path.dirname(__file__)
 EMP_FILE = os.path.join(BASE_DIR, "employees.json")
 ATTENDANCE_FILE = os.path.join(BASE_DIR, "attendance_records.csv")
+ATTENDANCE_DB = os.path.join(BASE_DIR, "attendance.db")
+CONFIG_FILE = "config.json"
+
+BACKEND_KEY = "attendance_store_backend"
+CSV_BACKEND = "csv"
+SQLITE_BACKEND = "sqlite"
+DEFAULT_BACKEND = CSV_BACKEND
 
 DEMO_IDS = {"EMP001", "EMP002", "EMP003", "EMP004", "EMP005"}
+ATTENDANCE_FIELDS = ["emp_id", "status", "timestamp", "check_in_time", "notes"]
+# Account fields that also get their own column in the SQLite employees table
+EMPLOYEE_FIELDS = ["name", "email", "department", "role", "password"]
+MIGRATION_KEY = "migrated_from_files"
+# Check-ins after this time of day count as late arrivals
+LATE_THRESHOLD = dtime(10, 30)
+
+# How often, at most, config.json and the account store are checked for changes
+# made outside this process
+RECHECK_SECONDS = 2.0
+
+# Databases already set up by this process
+_sqlite_lock = threading.Lock()
+_sqlite_ready = set()
+# (database, day) -> [last attendance id folded in, DailyAttendance]
+_sqlite_summaries = {}
+_summary_lock = threading.Lock()
+_backend_cache = {"config": None, "name": None, "checked_at": 0.0}
+
+# Employee directory: accounts plus lookup indexes, rebuilt when the store's
+# file signature changes and updated in place by this module's own writes
+_directory_lock = threading.RLock()
+_directory = {
+    "source": None, "signature": None, "checked_at": 0.0,
+    "employees": {}, "by_email": {}, "by_name": {}, "by_department": {},
+}
+
+# (date, emp_id) index and per-day summaries over the attendance CSV, kept in
+# step with the file by scanning only the bytes appended since the last lookup.
+# Only the last INDEXED_DAYS days are kept; older days are read from the store.
+INDEXED_DAYS = 2
+_index_lock = threading.Lock()
+_index = {"file": None, "inode": None, "offset": 0, "tail": b"", "header": None, "by_day": {}, "summaries": {}}
+# Bytes kept from the end of the indexed part to notice a rewritten file
+_TAIL_CHECK_BYTES = 64
+# Block size of the backward scan for the start of the indexed days
+_SCAN_BLOCK_BYTES = 64 * 1024
 
 def ensure_files():
     # Ensure attendance CSV exists with header
@@ -21,13 +91,160 @@ def ensure_files():
         with open(EMP_FILE, "w", encoding='utf-8') as f:
             json.dump({}, f, indent=2)
 
+def configured_backend():
+    """Backend name from config.json (``attendance_store_backend``), defaulting to CSV."""
+    now = time.monotonic()
+    if _backend_cache["config"] == CONFIG_FILE and now - _backend_cache["checked_at"] < RECHECK_SECONDS:
+        return _backend_cache["name"]
+    name = _read_backend_name()
+    _backend_cache.update(config=CONFIG_FILE, name=name, checked_at=now)
+    return name
+
+def _read_backend_name():
+    name = DEFAULT_BACKEND
+    try:
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, "r", encoding='utf-8') as f:
+                name = json.load(f).get(BACKEND_KEY, DEFAULT_BACKEND)
+    except Exception as error:
+        logging.warning(f"Could not read '{BACKEND_KEY}' from {CONFIG_FILE}: {error}")
+    if name in (CSV_BACKEND, SQLITE_BACKEND):
+        return name
+    logging.warning(f"Unknown {BACKEND_KEY} '{name}', using '{DEFAULT_BACKEND}'")
+    return DEFAULT_BACKEND
+
+def _use_sqlite():
+    return configured_backend() == SQLITE_BACKEND
+
+# ==================== SQLITE BACKEND ====================
+
+def _connect():
+    conn = sqlite3.connect(ATTENDANCE_DB, timeout=30)
+    if ATTENDANCE_DB not in _sqlite_ready:
+        with _sqlite_lock:
+            if ATTENDANCE_DB not in _sqlite_ready:
+                _initialise(conn)
+                _sqlite_ready.add(ATTENDANCE_DB)
+    return conn
+
+def _initialise(conn):
+    with conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS attendance ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, emp_id TEXT, status TEXT, "
+            "timestamp TEXT, date TEXT, check_in_time TEXT, notes TEXT)"
+        )
+        # "Checked in today?" and per-employee history, then whole-day/range reads
+        conn.execute("CREATE INDEX IF NOT EXISTS attendance_emp_date ON attendance (emp_id, date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS attendance_date ON attendance (date)")
+        # info holds the full account dict; the other columns are copies for lookups
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS employees ("
+            "emp_id TEXT PRIMARY KEY, name TEXT, email TEXT, department TEXT, "
+            "role TEXT, password TEXT, info TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+    _migrate_files(conn)
+
+def _migrate_files(conn):
+    """One-shot import of the CSV attendance log and employees.json."""
+    with conn:
+        # Hold the write lock while checking, so two processes cannot both import
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT value FROM store_meta WHERE key = ?", (MIGRATION_KEY,)).fetchone():
+            return
+        records = _load_attendance_csv() if os.path.exists(ATTENDANCE_FILE) else []
+        employees = _load_employees_json() if os.path.exists(EMP_FILE) else {}
+        summary = {
+            "attendance": len(records),
+            "employees": len(employees),
+            "migrated_at": datetime.now().isoformat(),
+        }
+        _insert_attendance(conn, records)
+        _upsert_employees(conn, employees)
+        conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+            (MIGRATION_KEY, json.dumps(summary)),
+        )
+    logging.info(f"Imported {len(records)} attendance rows and {len(employees)} employees into '{ATTENDANCE_DB}'")
+
+def migrate_to_sqlite():
+    """
+    Import the CSV/JSON files into the SQLite store if that has not happened
+    yet, and return what was imported ({'attendance', 'employees', 'migrated_at'}).
+    """
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (MIGRATION_KEY,)).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row[0])
+
+def _insert_attendance(conn, records):
+    conn.executemany(
+        "INSERT INTO attendance (emp_id, status, timestamp, date, check_in_time, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                record.get("emp_id"), record.get("status"), record.get("timestamp"),
+                day.isoformat() if (day := _record_day(record.get("timestamp"))) else None,
+                record.get("check_in_time"), record.get("notes") or "",
+            )
+            for record in records
+        ],
+    )
+
+def _upsert_employees(conn, employees):
+    conn.executemany(
+        "INSERT OR REPLACE INTO employees (emp_id, name, email, department, role, password, info) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (emp_id, *(info.get(field) for field in EMPLOYEE_FIELDS), json.dumps(info, default=str))
+            for emp_id, info in employees.items()
+        ],
+    )
+
+def _select_attendance(where="", params=()):
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(ATTENDANCE_FIELDS)} FROM attendance {where} ORDER BY id", params
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_record_from_row(dict(zip(ATTENDANCE_FIELDS, row))) for row in rows]
+
+def _select_employees(where="", params=()):
+    conn = _connect()
+    try:
+        rows = conn.execute(f"SELECT emp_id, info FROM employees {where}", params).fetchall()
+    finally:
+        conn.close()
+    return {emp_id: json.loads(info) for emp_id, info in rows}
+
+def _save_employees_sqlite(employees_dict):
+    """Write only the accounts that were added, changed or removed."""
+    employees = {emp_id: json.loads(json.dumps(info, default=str)) for emp_id, info in employees_dict.items()}
+    existing = _select_employees()
+    changed = {emp_id: info for emp_id, info in employees.items() if existing.get(emp_id) != info}
+    removed = [(emp_id,) for emp_id in existing if emp_id not in employees]
+    conn = _connect()
+    try:
+        with conn:
+            _upsert_employees(conn, changed)
+            conn.executemany("DELETE FROM employees WHERE emp_id = ?", removed)
+    finally:
+        conn.close()
+
+# ==================== ATTENDANCE ====================
+
 def append_attendance(emp_id, status, notes="", client_time=None):
     """
     Append an attendance record.
     - `timestamp` is always the server-side ISO timestamp (for audit).
     - `check_in_time` stores the actual check-in time in ISO format for accurate display.
     """
-    ensure_files()
     now = datetime.now()
     timestamp = now.isoformat()
     
@@ -37,33 +254,485 @@ def append_attendance(emp_id, status, notes="", client_time=None):
     else:
         check_in_time = now.isoformat()  # Changed from strftime to isoformat
     
+    if _use_sqlite():
+        conn = _connect()
+        try:
+            with conn:
+                _insert_attendance(conn, [{
+                    "emp_id": emp_id, "status": status, "timestamp": timestamp,
+                    "check_in_time": check_in_time, "notes": notes,
+                }])
+        finally:
+            conn.close()
+        # Fold the new row into today's summary right away
+        with _summary_lock:
+            _sqlite_daily_attendance(now.date())
+        return
+    
+    ensure_files()
     with open(ATTENDANCE_FILE, "a", newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow([emp_id, status, timestamp, check_in_time, notes])
+    with _index_lock:
+        _refresh_index()
+
+def _record_from_row(row):
+    return {
+        "emp_id": row.get("emp_id"),
+        "status": row.get("status"),
+        "timestamp": row.get("timestamp"),
+        "check_in_time": row.get("check_in_time") or None,
+        "notes": row.get("notes") or "",
+    }
+
+def _as_day(value):
+    """date for a date, datetime or ISO string (None stays None)."""
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+def _record_day(timestamp):
+    """Calendar day of an ISO timestamp, or None if it cannot be parsed."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).date()
+    except ValueError:
+        return None
+
+def _check_in_clock(value):
+    """Time of day of a check-in (ISO timestamp or e.g. '09:15 AM'), or None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).time()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(str(value).strip(), "%I:%M %p").time()
+    except ValueError:
+        return None
+
+class DailyAttendance:
+    """
+    Attendance of one day: each employee's latest record that day, plus the
+    status counts and late arrivals, kept in step as records are added.
+    Employee ids are upper-cased; anyone with a record (any status) is present.
+
+    An employee who checks in more than once is counted once, under their
+    latest status and check-in time, so the status counts add up to the
+    number present. (Views used to count every row of the day, so a WFO
+    check-in changed to WFH showed up under both.)
+    """
+
+    def __init__(self, day):
+        self.day = day
+        self.latest = {}
+        self.status_counts = Counter()
+        self.late = set()
+
+    def add(self, record):
+        emp_id = (record.get("emp_id") or "").upper()
+        if not emp_id:
+            return
+        previous = self.latest.get(emp_id)
+        if previous is not None:
+            self.status_counts[previous.get("status")] -= 1
+        self.latest[emp_id] = record
+        self.status_counts[record.get("status")] += 1
+        check_in = _check_in_clock(record.get("check_in_time"))
+        if check_in is not None and check_in > LATE_THRESHOLD:
+            self.late.add(emp_id)
+        else:
+            self.late.discard(emp_id)
+
+    @property
+    def present(self):
+        return set(self.latest)
+
+    def count(self, status):
+        """Employees whose latest status that day is ``status``."""
+        return self.status_counts.get(status, 0)
+
+    def with_status(self, status):
+        """Ids whose latest status that day is ``status``, in check-in order."""
+        return [emp_id for emp_id, record in self.latest.items() if record.get("status") == status]
+
+    def absent(self, employee_ids):
+        """The ids in ``employee_ids`` with no record that day."""
+        return [emp_id for emp_id in employee_ids if emp_id.upper() not in self.latest]
+
+    def copy(self):
+        summary = DailyAttendance(self.day)
+        summary.latest = {emp_id: dict(record) for emp_id, record in self.latest.items()}
+        summary.status_counts = Counter(self.status_counts)
+        summary.late = set(self.late)
+        return summary
+
+def _sqlite_daily_attendance(day):
+    """
+    Summary of ``day`` from the SQLite store, folding in only rows added since
+    it was last read. Call with ``_summary_lock`` held.
+    """
+    oldest = _oldest_indexed_day()
+    for stale in [key for key in _sqlite_summaries if key[1] < oldest]:
+        del _sqlite_summaries[stale]
+    key = (ATTENDANCE_DB, day)
+    last_id, summary = _sqlite_summaries.get(key, (0, DailyAttendance(day)))
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"SELECT id, {', '.join(ATTENDANCE_FIELDS)} FROM attendance WHERE date = ? AND id > ? ORDER BY id",
+            (day.isoformat(), last_id),
+        ).fetchall()
+    finally:
+        conn.close()
+    for row in rows:
+        summary.add(_record_from_row(dict(zip(ATTENDANCE_FIELDS, row[1:]))))
+        last_id = row[0]
+    if day >= oldest:
+        _sqlite_summaries[key] = (last_id, summary)
+    return summary
+
+def daily_attendance(day=None):
+    """
+    DailyAttendance for ``day`` (default today). Kept up to date by
+    append_attendance and by catching up on rows written elsewhere, so this
+    costs O(employees) rather than a pass over the whole history for the
+    indexed days (see INDEXED_DAYS); older days are summarised from a read of
+    that day. The result is a copy the caller may keep.
+    """
+    day = _as_day(day) or datetime.now().date()
+    if _use_sqlite():
+        with _summary_lock:
+            return _sqlite_daily_attendance(day).copy()
+    if day < _oldest_indexed_day():
+        summary = DailyAttendance(day)
+        for record in load_attendance_range(day, day):
+            summary.add(record)
+        return summary
+    with _index_lock:
+        _refresh_index()
+        summary = _index["summaries"].get(day)
+        return summary.copy() if summary else DailyAttendance(day)
+
+def _oldest_indexed_day():
+    return datetime.now().date() - timedelta(days=INDEXED_DAYS - 1)
+
+def _refresh_index():
+    """
+    Bring the index up to date with the attendance file. Rows are only ever
+    appended, so normally just the new tail is parsed. A new or replaced file
+    is indexed from the first row of the indexed window, found by scanning
+    backwards from the end. Days before the window are dropped (and skipped
+    while parsing). Call with ``_index_lock`` held.
+    """
+    ensure_files()
+    stat = os.stat(ATTENDANCE_FILE)
+    with open(ATTENDANCE_FILE, "rb") as f:
+        tail_start = max(0, _index["offset"] - _TAIL_CHECK_BYTES)
+        f.seek(tail_start)
+        unchanged = f.read(_index["offset"] - tail_start) == _index["tail"]
+        if (_index["file"] != ATTENDANCE_FILE or _index["inode"] != stat.st_ino
+                or stat.st_size < _index["offset"] or not unchanged):
+            _index.update(file=ATTENDANCE_FILE, inode=stat.st_ino, offset=0, tail=b"", header=None,
+                          by_day={}, summaries={})
+        oldest = _oldest_indexed_day()
+        for stale in [day for day in _index["by_day"] if day < oldest]:
+            del _index["by_day"][stale]
+            _index["summaries"].pop(stale, None)
+        if stat.st_size == _index["offset"]:
+            return
+        if _index["header"] is None:
+            f.seek(0)
+            header_line = f.readline()
+            if not header_line.endswith(b"\n"):
+                return
+            _index["header"] = next(csv.reader([header_line.decode("utf-8", errors="replace")]), None)
+            offset = _window_start(f, stat.st_size, len(header_line), oldest, _index["header"])
+            f.seek(max(0, offset - _TAIL_CHECK_BYTES))
+            _index["tail"] = f.read(offset - max(0, offset - _TAIL_CHECK_BYTES))
+            _index["offset"] = offset
+        f.seek(_index["offset"])
+        data = f.read()
+    # Leave a partly written last row for the next refresh
+    end = data.rfind(b"\n") + 1
+    if not end:
+        return
+    rows = csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace"), newline=""))
+    for values in rows:
+        record = _record_from_row(dict(zip(_index["header"], values)))
+        day = _record_day(record["timestamp"])
+        if day is not None and day >= oldest and record["emp_id"]:
+            # Later rows win, so each entry is the employee's latest record that day
+            _index["by_day"].setdefault(day, {})[record["emp_id"]] = record
+            _index["summaries"].setdefault(day, DailyAttendance(day)).add(record)
+    _index["offset"] += end
+    _index["tail"] = (_index["tail"] + data[:end])[-_TAIL_CHECK_BYTES:]
+
+def _window_start(f, size, first_row, oldest, header):
+    """
+    Offset of a row dated before ``oldest`` such that every later day follows
+    it (rows are appended in time order), or ``first_row`` when there is none.
+    Reads backwards block by block instead of parsing the whole file; only
+    lines that parse as a dated row are trusted as row starts, since a block
+    can begin inside a quoted multi-line field.
+    """
+    column = header.index("timestamp") if "timestamp" in header else 2
+    start = size
+    while start > first_row:
+        start = max(first_row, start - _SCAN_BLOCK_BYTES)
+        f.seek(start)
+        block = f.read(min(size, start + 2 * _SCAN_BLOCK_BYTES) - start)
+        line_start = 0
+        # The last piece is incomplete; the first is cut by the block boundary
+        # unless the block starts at the first row
+        for index, line in enumerate(block.split(b"\n")[:-1]):
+            position, line_start = line_start, line_start + len(line) + 1
+            if index == 0 and start != first_row:
+                continue
+            if position >= _SCAN_BLOCK_BYTES:
+                break
+            values = next(csv.reader([line.decode("utf-8", errors="replace")]), [])
+            day = _record_day(values[column]) if len(values) > column else None
+            if day is not None:
+                if day < oldest:
+                    return start + position
+                break
+    return first_row
+
+def latest_attendance(emp_id, day=None):
+    """
+    Most recent attendance record of an employee on ``day`` (default today),
+    or None if they have not checked in.
+    """
+    day = _as_day(day) or datetime.now().date()
+    if _use_sqlite():
+        records = _select_attendance(
+            "WHERE id = (SELECT MAX(id) FROM attendance WHERE emp_id = ? AND date = ?)",
+            (emp_id, day.isoformat()),
+        )
+        return records[0] if records else None
+    if day < _oldest_indexed_day():
+        records = load_attendance_range(day, day, emp_id)
+        return records[-1] if records else None
+    with _index_lock:
+        _refresh_index()
+        record = _index["by_day"].get(day, {}).get(emp_id)
+    return dict(record) if record else None
 
 def load_attendance():
+    if _use_sqlite():
+        return _select_attendance()
+    return _load_attendance_csv()
+
+def load_attendance_frame():
+    """
+    All attendance records as a DataFrame with the ``load_attendance`` fields
+    as columns, read column-wise (pandas CSV parser / one SQL query) instead
+    of a dict per row. Values are left as text; see ``with_employee_details``.
+    """
+    if _use_sqlite():
+        conn = _connect()
+        try:
+            df = pd.read_sql_query(f"SELECT {', '.join(ATTENDANCE_FIELDS)} FROM attendance ORDER BY id", conn)
+        finally:
+            conn.close()
+    else:
+        ensure_files()
+        df = pd.read_csv(ATTENDANCE_FILE, dtype=str, keep_default_na=False, on_bad_lines="skip")
+    df = df.reindex(columns=ATTENDANCE_FIELDS)
+    return df.assign(
+        check_in_time=df["check_in_time"].replace("", None),
+        notes=df["notes"].fillna(""),
+    )
+
+def parse_timestamps(values):
+    """
+    ISO timestamps to datetime64 in one vectorised pass; unparseable values
+    become NaT. Values with UTC offsets keep their wall-clock time.
+    """
+    try:
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    except ValueError:
+        # Mixed offsets cannot share one dtype; drop them like .date() of each value would
+        local = values.astype("string").str.replace(r"(Z|[+-]\d{2}:?\d{2})$", "", regex=True)
+        return pd.to_datetime(local, errors="coerce", format="ISO8601")
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        # One shared offset parses tz-aware; callers compare with naive timestamps
+        parsed = parsed.dt.tz_localize(None)
+    return parsed
+
+
+def with_employee_details(df, employees):
+    """
+    Attendance frame (see ``load_attendance_frame``) with upper-cased
+    ``emp_id``, ``timestamp`` parsed, a ``date`` column (midnight datetime64)
+    and name/department/role merged in from ``employees`` (emp_id -> info).
+    Employees missing from the directory keep their id as the name.
+    """
+    emp_id = df["emp_id"].fillna("").astype(str).str.upper()
+    timestamps = parse_timestamps(df["timestamp"])
+    df = df.assign(emp_id=emp_id, timestamp=timestamps, date=timestamps.dt.normalize())
+    details = pd.DataFrame.from_dict(employees or {}, orient="index").reindex(columns=["name", "department", "role"])
+    details.index = details.index.astype(str)
+    df = df.merge(details, how="left", left_on="emp_id", right_index=True)
+    return df.assign(
+        name=df["name"].fillna(df["emp_id"]),
+        department=df["department"].fillna(""),
+        role=df["role"].fillna(""),
+        status=df["status"].fillna("N/A"),
+    )[["emp_id", "name", "department", "role", "status", "check_in_time", "timestamp", "notes", "date"]]
+
+def load_attendance_range(date_from=None, date_to=None, emp_id=None):
+    """
+    Attendance records dated from ``date_from`` to ``date_to`` (both inclusive,
+    dates or ISO strings, either may be None), optionally for one employee,
+    oldest first.
+    """
+    date_from, date_to = _as_day(date_from), _as_day(date_to)
+    if _use_sqlite():
+        conditions, params = [], []
+        if date_from is not None:
+            conditions.append("date >= ?")
+            params.append(date_from.isoformat())
+        if date_to is not None:
+            conditions.append("date <= ?")
+            params.append(date_to.isoformat())
+        if emp_id is not None:
+            conditions.append("emp_id = ?")
+            params.append(emp_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return _select_attendance(where, params)
+    records = []
+    for record in _load_attendance_csv():
+        if emp_id is not None and record["emp_id"] != emp_id:
+            continue
+        if date_from is not None or date_to is not None:
+            day = _record_day(record["timestamp"])
+            if day is None or (date_from and day < date_from) or (date_to and day > date_to):
+                continue
+        records.append(record)
+    return records
+
+def _load_attendance_csv():
     ensure_files()
     records = []
     with open(ATTENDANCE_FILE, "r", encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             # Keep timestamp as ISO string; consumers can parse when needed
-            records.append({
-                "emp_id": row.get("emp_id"),
-                "status": row.get("status"),
-                "timestamp": row.get("timestamp"),
-                "check_in_time": row.get("check_in_time") or None,
-                "notes": row.get("notes") or "",
-            })
+            records.append(_record_from_row(row))
     return records
 
+# ==================== EMPLOYEES ====================
+
+def _file_signature(*paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def _directory_source():
+    if _use_sqlite():
+        # Writes land in the -wal file until a checkpoint moves them into the database
+        return SQLITE_BACKEND, (ATTENDANCE_DB, ATTENDANCE_DB + "-wal")
+    return CSV_BACKEND, (EMP_FILE,)
+
+def _index_directory(employees):
+    _directory.update(employees={}, by_email={}, by_name={}, by_department={})
+    for emp_id, info in employees.items():
+        _add_to_directory(emp_id, info)
+
+def _add_to_directory(emp_id, info):
+    _directory["employees"][emp_id] = info
+    email = str(info.get("email") or "").strip().lower()
+    if email:
+        _directory["by_email"].setdefault(email, emp_id)
+    name = str(info.get("name") or "").strip().lower()
+    if name:
+        _directory["by_name"].setdefault(name, []).append(emp_id)
+    department = str(info.get("department") or "").strip().lower()
+    if department:
+        _directory["by_department"].setdefault(department, []).append(emp_id)
+
+def _employee_directory(verify=False):
+    """
+    The cached directory, reloaded first if the store changed. The store is
+    only looked at every ``RECHECK_SECONDS`` unless ``verify`` is set.
+    Call with ``_directory_lock`` held.
+    """
+    now = time.monotonic()
+    source = _directory_source()
+    if _directory["source"] == source and not verify and now - _directory["checked_at"] < RECHECK_SECONDS:
+        return _directory
+    signature = _file_signature(*source[1])
+    if _directory["source"] != source or _directory["signature"] != signature:
+        backend = source[0]
+        _index_directory(_select_employees() if backend == SQLITE_BACKEND else _load_employees_json())
+        # A load that rewrote the file (demo ids stripped) is picked up on the next check
+        _directory.update(source=source, signature=signature)
+    _directory["checked_at"] = now
+    return _directory
+
+def _directory_written():
+    """Mark the directory as matching the store after this process wrote to it."""
+    _directory["signature"] = _file_signature(*_directory["source"][1])
+    _directory["checked_at"] = time.monotonic()
+
+def _matching(emp_ids):
+    return {emp_id: dict(_directory["employees"][emp_id]) for emp_id in emp_ids}
+
 def save_employees(employees_dict):
     # employees_dict expected to be a mapping emp_id -> info (including hashed password)
-    ensure_files()
-    with open(EMP_FILE, "w", encoding='utf-8') as f:
-        json.dump(employees_dict, f, default=str, indent=2)
+    with _directory_lock:
+        _employee_directory(verify=True)
+        if _use_sqlite():
+            _save_employees_sqlite(employees_dict)
+        else:
+            ensure_files()
+            with open(EMP_FILE, "w", encoding='utf-8') as f:
+                json.dump(employees_dict, f, default=str, indent=2)
+        # Cache what a reload would read back
+        employees = json.loads(json.dumps(employees_dict, default=str))
+        _index_directory({emp_id: info for emp_id, info in employees.items() if emp_id not in DEMO_IDS})
+        _directory_written()
 
 def load_employees():
+    """All accounts (emp_id -> info); a copy of the directory cache."""
+    with _directory_lock:
+        directory = _employee_directory()
+        return _matching(directory["employees"])
+
+def get_employee(emp_id):
+    """Account info for an employee id (any case), or None."""
+    with _directory_lock:
+        info = _employee_directory()["employees"].get(str(emp_id).upper())
+        return dict(info) if info else None
+
+def find_employee_by_email(email):
+    """(emp_id, info) of the account with this email (any case), or (None, None)."""
+    with _directory_lock:
+        emp_id = _employee_directory()["by_email"].get(str(email or "").strip().lower())
+        return (emp_id, dict(_directory["employees"][emp_id])) if emp_id else (None, None)
+
+def find_employees_by_name(name):
+    """Accounts (emp_id -> info) whose name matches, ignoring case and outer spaces."""
+    with _directory_lock:
+        return _matching(_employee_directory()["by_name"].get(str(name or "").strip().lower(), []))
+
+def find_employees_by_department(department):
+    """Accounts (emp_id -> info) in a department, ignoring case and outer spaces."""
+    with _directory_lock:
+        return _matching(_employee_directory()["by_department"].get(str(department or "").strip().lower(), []))
+
+def _load_employees_json():
     ensure_files()
     try:
         with open(EMP_FILE, "r", encoding='utf-8') as f:
@@ -92,8 +761,7 @@ def verify_login(emp_id, password):
     Verify employee login credentials.
     Returns (success: bool, name: str or None, role: str or None)
     """
-    employees = load_employees()
-    emp = employees.get(emp_id.upper())
+    emp = get_employee(emp_id)
     if emp:
         hashed_pw = hashlib.sha256(password.encode()).hexdigest()
         if emp.get("password") == hashed_pw:
@@ -102,47 +770,35 @@ def verify_login(emp_id, password):
 
 def check_employee_exists(emp_id):
     """Check if employee with given ID already exists"""
-    employees = load_employees()
-    return emp_id.upper() in employees
+    return get_employee(emp_id) is not None
 
 def check_already_checked_in_today(emp_id):
     """
     Check if an employee has already checked in today (same calendar day).
     Returns True if already checked in, False otherwise.
     """
-    records = load_attendance()
-    today = datetime.now().date()
-    
-    for record in records:
-        if record.get("emp_id") == emp_id:
-            # Parse the timestamp to get the date
-            try:
-                record_timestamp = record.get("timestamp")
-                if record_timestamp:
-                    # Handle both ISO format and other formats
-                    record_date = datetime.fromisoformat(record_timestamp.replace('Z', '+00:00')).date()
-                    if record_date == today:
-                        return True
-            except Exception:
-                pass
-    
-    return False
+    return latest_attendance(emp_id) is not None
 
 def create_employee(emp_id, password, name="", email="", department="", role=""):
     """
     Create a new employee account.
     Returns (success: bool, message: str)
     """
-    employees = load_employees()
+    with _directory_lock:
+        return _create_employee(emp_id, password, name, email, department, role)
+
+def _create_employee(emp_id, password, name, email, department, role):
     emp_id_upper = emp_id.upper()
+    # Checked against the store itself, in case another process just added it
+    directory = _employee_directory(verify=True)
     
-    if emp_id_upper in employees:
+    if emp_id_upper in directory["employees"]:
         return False, "Employee ID already exists"
     
     if not emp_id or not password or not name:
         return False, "Office ID, Password, and Name are required"
     
-    employees[emp_id_upper] = {
+    info = {
         "password": hashlib.sha256(password.encode()).hexdigest(),
         "name": name,
         "email": email,
@@ -151,7 +807,28 @@ def create_employee(emp_id, password, name="", email="", department="", role="")
     }
     
     try:
-        save_employees(employees)
+        if _use_sqlite():
+            # A single-row insert; the primary key rejects a concurrent duplicate
+            conn = _connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO employees (emp_id, name, email, department, role, password, info) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (emp_id_upper, *(info[field] for field in EMPLOYEE_FIELDS), json.dumps(info)),
+                    )
+            finally:
+                conn.close()
+        else:
+            employees = dict(directory["employees"])
+            employees[emp_id_upper] = info
+            ensure_files()
+            with open(EMP_FILE, "w", encoding='utf-8') as f:
+                json.dump(employees, f, default=str, indent=2)
+        _add_to_directory(emp_id_upper, info)
+        _directory_written()
         return True, "Account created successfully"
+    except sqlite3.IntegrityError:
+        return False, "Employee ID already exists"
     except Exception as e:
         return False, f"Failed to create account: {str(e)}"
@@ -0,0 +1,372 @@
+"""
+Performance benchmarks for the task tracker on synthetic data.
+
+Usage:
+    python benchmarks.py dashboard [--rows 10000 100000 1000000] [--employees 50]
+    python benchmarks.py memory [--rows 100000] [--employees 50]
+    python benchmarks.py scoring [--rows 100000] [--employees 50] [--repeat 5]
+    python benchmarks.py excel [--rows 100000] [--employees 50] [--repeat 3]
+    python benchmarks.py attendance [--rows 1000000] [--employees 500] [--repeat 3]
+
+Dashboard cases run in a fresh process so peak memory figures do not leak between
+cases. Peak memory is the growth of the process high-water mark (ru_maxrss)
+during the measured step, or the tracemalloc peak where ``resource`` is not
+available (Windows).
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from task_store import DATA_COLUMNS, DATA_SHEET_NAME
+
+STATUSES = ['Completed', 'In Progress', 'Pending', 'Blocked']
+PRIORITIES = ['Low', 'Medium', 'High', 'Critical']
+AVAILABILITY = ['Underutilized', 'Partially Busy', 'Fully Busy']
+WORK_MODES = ['WFO', 'WFH', 'Hybrid']
+
+
+def make_task_frame(rows: int, employees: int = 50, days: int = 365, seed: int = 0) -> pd.DataFrame:
+    """Synthetic task history shaped like the data sheet (DATA_COLUMNS, string dates)."""
+    rng = np.random.default_rng(seed)
+    start = date.today() - timedelta(days=days - 1)
+    date_pool = np.array([(start + timedelta(days=offset)).isoformat() for offset in range(days)])
+    emp_idx = rng.integers(0, employees, rows)
+    names = np.array([f"Employee {idx:03d}" for idx in range(employees)])
+    emp_ids = np.array([f"P-{idx:04d}" for idx in range(employees)])
+
+    return pd.DataFrame({
+        'Date': date_pool[rng.integers(0, days, rows)],
+        'Work Mode': np.array(WORK_MODES)[rng.integers(0, len(WORK_MODES), rows)],
+        'Emp Id': emp_ids[emp_idx],
+        'Name': names[emp_idx],
+        'Project Name': np.array([f"Project {idx}" for idx in range(20)])[rng.integers(0, 20, rows)],
+        'Task Title': np.char.add('Task ', rng.integers(0, 100000, rows).astype(str)),
+        'Task Assigned By': np.array(['Lead A', 'Lead B', 'Manager'])[rng.integers(0, 3, rows)],
+        'Task Priority': np.array(PRIORITIES)[rng.integers(0, len(PRIORITIES), rows)],
+        'Task Status': np.array(STATUSES)[rng.integers(0, len(STATUSES), rows)],
+        'Plan for next day': 'Continue',
+        'Support Request': np.where(rng.random(rows) < 0.1, 'Need review', None),
+        'Availability': np.array(AVAILABILITY)[rng.integers(0, len(AVAILABILITY), rows)],
+        'Effort (in hours)': rng.integers(1, 9, rows).astype(float),
+        'Employee Performance (%)': rng.uniform(0, 100, rows).round(2),
+    }, columns=DATA_COLUMNS)
+
+
+def _peak_kib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+
+def _measure(func, *args):
+    """Run func(*args); return (seconds, peak extra memory in MiB)."""
+    if resource is None:
+        import tracemalloc
+        tracemalloc.start()
+        started = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        return elapsed, peak
+    before = _peak_kib()
+    started = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - started
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB elsewhere
+    return elapsed, (_peak_kib() - before) / divisor
+
+
+# ==================== DASHBOARD ====================
+
+def _standard_build(excel_path, df):
+    from workbook_dashboard import update_dashboard_sheets
+
+    with pd.ExcelWriter(excel_path, engine='openpyxl', mode='w') as writer:
+        df.to_excel(writer, index=False, sheet_name=DATA_SHEET_NAME)
+    update_dashboard_sheets(excel_path, df)
+
+
+def _streaming_build(excel_path, df):
+    from workbook_dashboard import write_streaming_workbook
+
+    write_streaming_workbook(excel_path, df)
+
+
+def _dashboard_case(mode, rows, employees, queue):
+    df = make_task_frame(rows, employees)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_path = os.path.join(tmp_dir, 'task_tracker.xlsx')
+        builder = _streaming_build if mode == 'streaming' else _standard_build
+        elapsed, peak = _measure(builder, excel_path, df)
+        size_mib = os.path.getsize(excel_path) / (1024 * 1024)
+    queue.put((elapsed, peak, size_mib))
+
+
+def bench_dashboard(rows_list, employees):
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'rows':>10} {'mode':>10} {'seconds':>10} {'peak MiB':>10} {'file MiB':>10}")
+    for rows in rows_list:
+        for mode in ('standard', 'streaming'):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_dashboard_case, args=(mode, rows, employees, queue))
+            proc.start()
+            elapsed, peak, size_mib = queue.get()
+            proc.join()
+            print(f"{rows:>10} {mode:>10} {elapsed:>10.2f} {peak:>10.1f} {size_mib:>10.1f}", flush=True)
+
+
+# ==================== MEMORY ====================
+
+def bench_memory(rows, employees):
+    """Bytes of the loaded task frame before/after compact dtypes, per 100k rows."""
+    import json
+
+    import task_store
+
+    df = make_task_frame(rows, employees)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = os.path.join(tmp_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'task_store_backend': 'sqlite'}, f)
+        task_store.CONFIG_FILE = config_path
+        excel_path = os.path.join(tmp_dir, 'task_tracker.xlsx')
+        task_store.append_tasks(df.to_dict('records'), excel_path)
+
+        backend = task_store.get_backend(excel_path)
+        before = task_store.ensure_numeric_columns(backend.load())
+        after = task_store.compact_task_frame(before.copy())
+
+    scale = 100_000 / rows
+    before_bytes = before.memory_usage(deep=True)
+    after_bytes = after.memory_usage(deep=True)
+    print(f"Loaded task frame, {rows} rows ({employees} employees), bytes per 100k rows")
+    print(f"{'column':<28} {'dtype before':>14} {'dtype after':>14} {'before':>12} {'after':>12}")
+    for col in before.columns:
+        print(
+            f"{col:<28} {str(before[col].dtype):>14} {str(after[col].dtype):>14} "
+            f"{before_bytes[col] * scale:>12,.0f} {after_bytes[col] * scale:>12,.0f}"
+        )
+    total_before, total_after = before_bytes.sum() * scale, after_bytes.sum() * scale
+    print(f"{'TOTAL':<28} {'':>14} {'':>14} {total_before:>12,.0f} {total_after:>12,.0f}")
+    print(f"Reduction: {(1 - total_after / total_before) * 100:.1f}%")
+
+
+# ==================== SCORING ====================
+
+def _legacy_task_scores(df):
+    """Baseline: the per-row apply() of calculate_task_performance main.py used to run."""
+    from scoring import TASK_STATUS_MULTIPLIERS, priority_score, status_class
+
+    def score_row(row):
+        multiplier = TASK_STATUS_MULTIPLIERS[status_class(row.get('Task Status', ''))]
+        return round(priority_score(row.get('Task Priority', 'Medium')) * multiplier, 2)
+
+    return df.apply(score_row, axis=1)
+
+
+def _legacy_score_employee(emp_df):
+    """Baseline: the iterrows() loop calculate_performance_from_priority used to run."""
+    from scoring import EMPLOYEE_STATUS_MULTIPLIERS, priority_score, status_class
+
+    total_weighted_score = 0
+    total_possible_score = 0
+    for _, row in emp_df.iterrows():
+        weight = priority_score(row.get('Task Priority', 'Medium'))
+        total_weighted_score += weight * EMPLOYEE_STATUS_MULTIPLIERS[status_class(row.get('Task Status', ''))]
+        total_possible_score += weight
+    return round((total_weighted_score / total_possible_score) * 100, 2)
+
+
+def _best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_scoring(rows, employees, repeat):
+    """Per-call latency of row-by-row vs vectorised scoring."""
+    import scoring
+
+    df = make_task_frame(rows, employees)
+    cases = [
+        ('task scores, apply()', _legacy_task_scores, 1),
+        ('task scores, vectorised', scoring.task_scores, repeat),
+        ('one frame, iterrows()', _legacy_score_employee, 1),
+        ('one frame, vectorised', scoring.score_employee, repeat),
+        ('all employees, vectorised', scoring.score_employees, repeat),
+    ]
+    print(f"Scoring {rows} rows ({employees} employees), best of runs")
+    print(f"{'case':<28} {'ms/call':>12}")
+    for label, func, runs in cases:
+        print(f"{label:<28} {_best_of(runs, func, df) * 1000:>12.1f}", flush=True)
+
+    # What-if panel: feature matrix built once per store change, then re-scored per slider move
+    features = scoring.FeatureMatrix(df)
+    what_if = lambda: scoring.what_if_scores(features, [1, 2, 3, 5], scoring.EMPLOYEE_STATUS_MULTIPLIERS)
+    print(f"{'what-if feature matrix':<28} {_best_of(repeat, scoring.FeatureMatrix, df) * 1000:>12.1f}")
+    print(f"{'what-if re-score + rank':<28} {_best_of(repeat, what_if) * 1000:>12.1f}")
+
+
+# ==================== EXCEL READ ====================
+
+def bench_excel(rows, employees, repeat):
+    """Parse time of the task workbook (data sheet + dashboard sheets) per reader engine."""
+    import excel_reader
+    import task_store
+    from workbook_dashboard import write_streaming_workbook
+
+    df = make_task_frame(rows, employees)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_path = os.path.join(tmp_dir, 'task_tracker.xlsx')
+        write_streaming_workbook(excel_path, df)
+        size_mib = os.path.getsize(excel_path) / (1024 * 1024)
+        print(f"Workbook with {rows} rows ({employees} employee sheets), {size_mib:.1f} MiB, best of {repeat}")
+        print(f"{'reader':<40} {'seconds':>10}")
+        legacy = lambda: pd.read_excel(excel_path, engine='openpyxl')
+        print(f"{'openpyxl, first sheet, inferred dtypes':<40} {_best_of(repeat, legacy):>10.2f}", flush=True)
+        for engine in excel_reader.ENGINE_MODULES:
+            label = f"{engine}, Sheet1, usecols + dtypes"
+            if not excel_reader.engine_available(engine):
+                print(f"{label:<40} {'not installed':>10}")
+                continue
+            seconds = _best_of(repeat, task_store.read_data_sheet, excel_path, engine)
+            print(f"{label:<40} {seconds:>10.2f}", flush=True)
+
+
+# ==================== ATTENDANCE ====================
+
+def make_attendance_frame(rows: int, employees: int = 500, days: int = 365, seed: int = 0):
+    """Synthetic attendance rows in the attendance CSV layout, plus a matching employee directory."""
+    rng = np.random.default_rng(seed)
+    emp_ids = np.array([f"EMP{i:04d}" for i in range(employees)])
+    offsets = np.sort(rng.integers(0, days * 24 * 3600 * 10**6, rows)).astype('timedelta64[us]')
+    stamps = (np.datetime64('2025-01-01T00:00:00.000000') + offsets).astype(str)
+    df = pd.DataFrame({
+        'emp_id': rng.choice(emp_ids, rows),
+        'status': rng.choice(['WFO', 'WFH', 'On Leave'], rows, p=[0.5, 0.4, 0.1]),
+        'timestamp': stamps,
+        'check_in_time': stamps,
+        'notes': '',
+    })
+    directory = {
+        emp_id: {'name': f"Employee {i}", 'email': f"emp{i}@example.com",
+                 'department': f"Dept {i % 8}", 'role': 'Engineer', 'password': ''}
+        for i, emp_id in enumerate(emp_ids)
+    }
+    return df, directory
+
+
+def _legacy_attendance_frame(records, employees):
+    """Baseline: the per-record loop show_admin_attendance_dashboard used to run."""
+    from datetime import datetime
+
+    from dateutil import parser as _p
+
+    rows = []
+    for r in records:
+        emp = (r.get("emp_id") or "").upper()
+        meta = employees.get(emp, {})
+        ts = r.get("timestamp")
+        try:
+            ts_dt = datetime.fromisoformat(ts) if isinstance(ts, str) else ts
+        except Exception:
+            try:
+                ts_dt = _p.isoparse(ts)
+            except Exception:
+                ts_dt = None
+        rows.append({
+            "emp_id": emp,
+            "name": meta.get("name", emp),
+            "department": meta.get("department", ""),
+            "role": meta.get("role", ""),
+            "status": r.get("status", "N/A"),
+            "check_in_time": r.get("check_in_time", None),
+            "timestamp": ts_dt,
+            "notes": r.get("notes", "")
+        })
+    df = pd.DataFrame(rows)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    df["date"] = df["timestamp"].dt.date
+    return df
+
+
+def bench_attendance(rows, employees, repeat):
+    """Admin attendance dashboard frame (CSV read + timestamps + employee details)."""
+    import attendance_store
+
+    df, directory = make_attendance_frame(rows, employees)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Point the store at a scratch CSV (the default CSV backend, no config.json)
+        attendance_store.ATTENDANCE_FILE = os.path.join(tmp_dir, 'attendance_records.csv')
+        attendance_store.EMP_FILE = os.path.join(tmp_dir, 'employees.json')
+        attendance_store.CONFIG_FILE = os.path.join(tmp_dir, 'config.json')
+        df.to_csv(attendance_store.ATTENDANCE_FILE, index=False)
+
+        legacy = lambda: _legacy_attendance_frame(attendance_store.load_attendance(), directory)
+        columnar = lambda: attendance_store.with_employee_details(attendance_store.load_attendance_frame(), directory)
+        print(f"Admin attendance frame for {rows} rows ({employees} employees), best of runs")
+        print(f"{'case':<36} {'seconds':>10}")
+        before = _best_of(1, legacy)
+        print(f"{'row loop, fromisoformat per row':<36} {before:>10.2f}", flush=True)
+        after = _best_of(repeat, columnar)
+        print(f"{'columnar read, vectorised + merge':<36} {after:>10.2f}")
+        print(f"Speed-up: {before / after:.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Task tracker benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    dashboard = subparsers.add_parser('dashboard', help="Workbook dashboard build: standard vs streaming")
+    dashboard.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    dashboard.add_argument('--employees', type=int, default=50)
+
+    memory = subparsers.add_parser('memory', help="Task frame memory with and without compact dtypes")
+    memory.add_argument('--rows', type=int, default=100_000)
+    memory.add_argument('--employees', type=int, default=50)
+
+    scoring = subparsers.add_parser('scoring', help="Task scoring: row-by-row vs vectorised")
+    scoring.add_argument('--rows', type=int, default=100_000)
+    scoring.add_argument('--employees', type=int, default=50)
+    scoring.add_argument('--repeat', type=int, default=5)
+
+    excel = subparsers.add_parser('excel', help="Task workbook parse time per Excel reader engine")
+    excel.add_argument('--rows', type=int, default=100_000)
+    excel.add_argument('--employees', type=int, default=50)
+    excel.add_argument('--repeat', type=int, default=3)
+
+    attendance = subparsers.add_parser('attendance', help="Admin attendance frame: row loop vs columnar")
+    attendance.add_argument('--rows', type=int, default=1_000_000)
+    attendance.add_argument('--employees', type=int, default=500)
+    attendance.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.command == 'dashboard':
+        bench_dashboard(args.rows, args.employees)
+    elif args.command == 'memory':
+        bench_memory(args.rows, args.employees)
+    elif args.command == 'scoring':
+        bench_scoring(args.rows, args.employees, args.repeat)
+    elif args.command == 'excel':
+        bench_excel(args.rows, args.employees, args.repeat)
+    elif args.command == 'attendance':
+        bench_attendance(args.rows, args.employees, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
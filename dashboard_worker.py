@@ -0,0 +1,227 @@
+"""
+Background rebuilds of the task workbook and its dashboard sheets.
+
+Report submissions only append to the task store and then call
+``request_rebuild``; a daemon thread exports the workbook and updates the
+dashboard sheets off the request path, compacting recorded row edits into the
+store first once enough have accumulated. Bursts are coalesced: the worker waits
+until submissions have been quiet for ``DEBOUNCE_SECONDS`` (but never longer
+than ``MAX_DELAY_SECONDS`` after the first pending change) and then runs a
+single rebuild for all of them.
+
+The worker lives in an imported module rather than in ``main.py`` because
+Streamlit re-executes the app script on every interaction.
+"""
+
+import contextlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+import task_store
+from workbook_dashboard import update_dashboard_sheets, write_streaming_workbook
+
+DEBOUNCE_SECONDS = 10.0
+MAX_DELAY_SECONDS = 60.0
+# Recorded row edits are folded into the task store once this many are outstanding
+COMPACTION_MIN_EDITS = 50
+
+# config.json ``dashboard_build_mode``:
+# - 'incremental': patch the existing workbook, rebuilding only changed employees
+# - 'streaming': rewrite the whole workbook with write-only sheets (large histories)
+BUILD_MODES = ('incremental', 'streaming')
+DEFAULT_BUILD_MODE = 'incremental'
+
+
+def configured_build_mode():
+    mode = task_store.read_config_value('dashboard_build_mode', DEFAULT_BUILD_MODE)
+    if mode in BUILD_MODES:
+        return mode
+    logging.warning(f"Unknown dashboard_build_mode '{mode}', using '{DEFAULT_BUILD_MODE}'")
+    return DEFAULT_BUILD_MODE
+
+
+def build_workbook(excel_path, mode=None):
+    """Export the task history to the workbook and update its dashboard sheets.
+    Returns (exported row count, dashboard result).
+    """
+    if mode is None:
+        mode = configured_build_mode()
+    try:
+        task_store.compact_store(excel_path, min_edits=COMPACTION_MIN_EDITS)
+    except Exception as compact_error:
+        # Reads apply outstanding edits anyway; try again with the next build
+        logging.warning(f"Task store compaction failed for '{excel_path}': {compact_error}")
+    # The legacy Excel backend writes the same file, so keep its appends out meanwhile
+    write_lock = getattr(task_store.get_backend(excel_path), 'write_lock', None) or contextlib.nullcontext()
+    with write_lock:
+        if mode == 'streaming':
+            full_df = task_store.load_tasks(excel_path)
+            if full_df.empty:
+                # Nothing to stream; still write the (empty) data sheet
+                task_store.export_workbook(excel_path)
+                return 0, None
+            result = write_streaming_workbook(
+                excel_path, full_df, task_store.data_sheet_frame(excel_path),
+                store_state=task_store.workbook_store_state(excel_path)
+            )
+            if result is None:
+                raise RuntimeError(f"Streaming workbook build failed for '{excel_path}'")
+            return len(full_df), result
+
+        full_df = task_store.export_workbook(excel_path)
+        result = None
+        try:
+            result = update_dashboard_sheets(excel_path, full_df, incremental=True)
+        except Exception as dash_error:
+            logging.error(f"Failed to update dashboard sheets: {dash_error}")
+    return len(full_df), result
+
+
+class DashboardWorker:
+    """Coalescing rebuild worker for one workbook path."""
+
+    def __init__(self, excel_path, debounce_seconds=None, max_delay_seconds=None):
+        self.excel_path = excel_path
+        self.debounce_seconds = DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        self.max_delay_seconds = MAX_DELAY_SECONDS if max_delay_seconds is None else max_delay_seconds
+        self._condition = threading.Condition()
+        # Serialises background and on-demand builds of the same workbook
+        self._build_lock = threading.Lock()
+        self._thread = None
+        self.pending_changes = 0
+        self.first_pending_at = None
+        self.last_change_at = None
+        self.building = False
+        self.builds_completed = 0
+        self.last_build_at = None
+        self.last_build_seconds = None
+        self.last_build_rows = None
+        self.last_build_mode = None
+        self.last_error = None
+
+    def request_rebuild(self, changes=1):
+        """Record new task rows; the rebuild happens later on the worker thread."""
+        with self._condition:
+            now = time.monotonic()
+            if self.pending_changes == 0:
+                self.first_pending_at = now
+            self.pending_changes += changes
+            self.last_change_at = now
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"dashboard-worker:{os.path.basename(self.excel_path)}",
+                    daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def build_now(self):
+        """Rebuild synchronously (e.g. the Settings export button). Returns exported row count."""
+        with self._condition:
+            self.pending_changes = 0
+            self.first_pending_at = None
+        return self._build()
+
+    def status(self):
+        with self._condition:
+            return {
+                'pending_changes': self.pending_changes,
+                'building': self.building,
+                'builds_completed': self.builds_completed,
+                'last_build_at': self.last_build_at,
+                'last_build_seconds': self.last_build_seconds,
+                'last_build_rows': self.last_build_rows,
+                'last_build_mode': self.last_build_mode,
+                'last_error': self.last_error,
+            }
+
+    def wait_until_idle(self, timeout=None):
+        """Block until no changes are pending and no build is running. Returns True if idle."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.pending_changes or self.building:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _seconds_until_due(self, now):
+        quiet_due = self.last_change_at + self.debounce_seconds
+        latest_due = self.first_pending_at + self.max_delay_seconds
+        return min(quiet_due, latest_due) - now
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self.pending_changes == 0:
+                        self._condition.wait()
+                        continue
+                    wait_for = self._seconds_until_due(time.monotonic())
+                    if wait_for <= 0:
+                        break
+                    self._condition.wait(wait_for)
+                # Changes arriving from here on are picked up by the next build
+                self.pending_changes = 0
+                self.first_pending_at = None
+            try:
+                self._build()
+            except RuntimeError:
+                pass  # already logged and kept in last_error for the status panel
+
+    def _build(self):
+        with self._build_lock:
+            with self._condition:
+                self.building = True
+            started = time.monotonic()
+            exported_rows = None
+            try:
+                exported_rows, result = build_workbook(self.excel_path)
+                error = None
+            except Exception as build_error:
+                logging.error(f"Background workbook rebuild failed for '{self.excel_path}': {build_error}")
+                result = None
+                error = str(build_error)
+            with self._condition:
+                self.building = False
+                self.last_build_at = datetime.now()
+                self.last_build_seconds = round(time.monotonic() - started, 3)
+                self.last_error = error
+                if error is None:
+                    self.builds_completed += 1
+                    self.last_build_rows = exported_rows
+                    self.last_build_mode = result['mode'] if result else None
+                self._condition.notify_all()
+            if error is not None:
+                raise RuntimeError(error)
+            return exported_rows
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(excel_path=None):
+    """Return the process-wide worker for a workbook path."""
+    if excel_path is None:
+        excel_path = task_store.DEFAULT_EXCEL_PATH
+    key = os.path.abspath(excel_path)
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = DashboardWorker(excel_path)
+            _workers[key] = worker
+    return worker
+
+
+def request_rebuild(excel_path=None, changes=1):
+    get_worker(excel_path).request_rebuild(changes)
+
+
+def get_status(excel_path=None):
+    return get_worker(excel_path).status()
@@ -0,0 +1,89 @@
+"""
+Excel reader layer for the task workbook.
+
+``pd.read_excel(..., engine='openpyxl')`` is the slowest pure-Python path, and
+the task workbook also carries the dashboard sheets. Reads go through
+``read_sheet`` instead. It reads a single sheet, only the wanted columns and
+with explicit dtypes, using the fastest engine that is installed:
+
+- ``calamine`` (``pip install python-calamine``): Rust parser, several times faster
+- ``openpyxl``: always available, used as the fallback
+
+The engine is chosen with ``excel_reader_engine`` in ``config.json``
+(``auto``, ``calamine`` or ``openpyxl``; default ``auto``). If the chosen
+engine is missing or fails on a file, the read is retried with openpyxl.
+"""
+
+import importlib.util
+import logging
+
+import pandas as pd
+
+AUTO_ENGINE = 'auto'
+FALLBACK_ENGINE = 'openpyxl'
+# Preferred first; each engine with the module pandas needs for it
+ENGINE_MODULES = {
+    'calamine': 'python_calamine',
+    'openpyxl': 'openpyxl',
+}
+ENGINES = (AUTO_ENGINE,) + tuple(ENGINE_MODULES)
+
+
+def engine_available(engine) -> bool:
+    module = ENGINE_MODULES.get(engine)
+    return module is not None and importlib.util.find_spec(module) is not None
+
+
+def available_engines() -> list:
+    """Installed reader engines, fastest first."""
+    return [engine for engine in ENGINE_MODULES if engine_available(engine)]
+
+
+def resolve_engine(engine=None) -> str:
+    """Concrete engine for a configured name ('auto' picks the fastest installed one)."""
+    if engine in (None, AUTO_ENGINE):
+        installed = available_engines()
+        return installed[0] if installed else FALLBACK_ENGINE
+    if engine not in ENGINE_MODULES:
+        logging.warning(f"Unknown excel_reader_engine '{engine}', using '{AUTO_ENGINE}'")
+        return resolve_engine(AUTO_ENGINE)
+    if not engine_available(engine):
+        logging.warning(f"Excel reader engine '{engine}' is not installed, using '{FALLBACK_ENGINE}'")
+        return FALLBACK_ENGINE
+    return engine
+
+
+def _read(excel_path, engine, sheet_name, usecols, dtype) -> pd.DataFrame:
+    try:
+        return pd.read_excel(excel_path, sheet_name=sheet_name, engine=engine, usecols=usecols, dtype=dtype)
+    except ValueError as error:
+        # Workbooks written by other tools may name their only sheet differently
+        if sheet_name == 0 or 'not found' not in str(error).lower():
+            raise
+        return pd.read_excel(excel_path, sheet_name=0, engine=engine, usecols=usecols, dtype=dtype)
+
+
+def read_sheet(excel_path, sheet_name=0, usecols=None, dtype=None, engine=None) -> pd.DataFrame:
+    """
+    Read one sheet of a workbook.
+
+    ``usecols`` is a list of column names or a callable (name -> bool) and
+    ``dtype`` maps column names to dtypes; both are applied while parsing.
+    A missing ``sheet_name`` falls back to the first sheet.
+    """
+    engine = resolve_engine(engine)
+    if callable(usecols) or usecols is None:
+        columns = usecols
+    else:
+        wanted = set(usecols)
+        columns = lambda name: name in wanted  # noqa: E731 - missing columns are not an error
+    if dtype:
+        # pandas rejects dtypes for columns that usecols skipped or the sheet lacks
+        dtype = {col: col_dtype for col, col_dtype in dtype.items() if columns is None or columns(col)}
+    try:
+        return _read(excel_path, engine, sheet_name, columns, dtype)
+    except Exception as error:
+        if engine == FALLBACK_ENGINE:
+            raise
+        logging.warning(f"'{engine}' could not read '{excel_path}' ({error}); retrying with {FALLBACK_ENGINE}")
+        return _read(excel_path, FALLBACK_ENGINE, sheet_name, columns, dtype)
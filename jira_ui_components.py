@@ -18,6 +18,12 @@ try:
 except ImportError:
     JIRA_AVAILABLE = False
 
+# Task columns used to build Jira issues (only these are read for a sync)
+JIRA_SYNC_COLUMNS = [
+    'Date', 'Name', 'Project Name', 'Task Title', 'Task Assigned By',
+    'Task Priority', 'Plan for next day', 'Support Request'
+]
+
 
 def show_jira_settings_panel(config):
     """
@@ -229,7 +235,8 @@ def show_jira_sync_panel(config, excel_file_path=None, read_excel_data_func=None
     Args:
         config: Application configuration
         excel_file_path: Path to Excel file (if None, will prompt user)
-        read_excel_data_func: Function to read Excel data (if None, will use pandas)
+        read_excel_data_func: Function to read Excel data, called with date_from/date_to
+            (if None, the task store is read directly)
     """
     st.markdown("---")
     st.subheader("🔄 Jira Sync Operations")
@@ -272,26 +279,26 @@ def show_jira_sync_panel(config, excel_file_path=None, read_excel_data_func=None
         
         with st.spinner("Syncing tasks to Jira..."):
             try:
+                import task_store
                 # Read Excel data
                 if read_excel_data_func:
-                    df = read_excel_data_func(excel_file_path)
+                    df = read_excel_data_func(
+                        excel_file_path, date_from=start_date, date_to=end_date, columns=JIRA_SYNC_COLUMNS
+                    )
                 else:
-                    # Fallback to direct pandas read
-                    if not os.path.exists(excel_file_path):
-                        st.error(f"Excel file not found: {excel_file_path}")
-                        return
-                    df = pd.read_excel(excel_file_path, engine='openpyxl')
+                    # Fallback to reading the task store directly
+                    df = task_store.load_tasks(
+                        excel_file_path, date_from=start_date, date_to=end_date, columns=JIRA_SYNC_COLUMNS
+                    )
                 
                 if df is None or df.empty:
                     st.warning("No tasks found to sync")
                     return
                 
-                # Filter by date
-                df['Date'] = pd.to_datetime(df['Date'])
-                filtered_df = df[
-                    (df['Date'].dt.date >= start_date) &
-                    (df['Date'].dt.date <= end_date)
-                ]
+                # Filter by date (a no-op for frames the task store already limited)
+                filtered_df = task_store.filter_date_range(df, start_date, end_date)
+                if not task_store.is_normalised(filtered_df):
+                    filtered_df = filtered_df.assign(Date=task_store.task_dates(filtered_df))
                 
                 if filtered_df.empty:
                     st.info(f"No tasks found between {start_date} and {end_date}")
@@ -31,6 +31,13 @@ import sys
 # Add current directory to path for local imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import task_store
+from task_store import ensure_numeric_columns
+import dashboard_worker
+import excel_reader
+import scoring
+import submission_queue
+
 # Import Jira integration
 try:
     from jira_integration import JiraIntegration, quick_connect, create_task_issue
@@ -54,7 +61,7 @@ except ImportError:
     JIRA_UI_AVAILABLE = False
 
 try:
-    from attendance_store import append_attendance, check_already_checked_in_today
+    from attendance_store import append_attendance, check_already_checked_in_today, latest_attendance
 except ImportError:
     # Inline implementations as fallback
     def append_attendance(emp_id, status, notes="", client_time=None):
@@ -82,8 +89,8 @@ except ImportError:
         except Exception as e:
             raise Exception(f"Failed to save attendance: {str(e)}")
     
-    def check_already_checked_in_today(emp_id):
-        """Check if employee already checked in today"""
+    def latest_attendance(emp_id, day=None):
+        """Latest attendance record of an employee today, read from the end of the CSV"""
         try:
             import csv
             from datetime import datetime
@@ -92,25 +99,40 @@ except ImportError:
             attendance_file = os.path.join(base_dir, "attendance_records.csv")
             
             if not os.path.exists(attendance_file):
-                return False
+                return None
             
-            today = datetime.now().date()
+            day = (day or datetime.now().date()).isoformat()
             
-            with open(attendance_file, "r", encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row and row.get("emp_id") == emp_id:
-                        try:
-                            record_timestamp = row.get("timestamp", "")
-                            record_date = datetime.fromisoformat(record_timestamp.replace('Z', '+00:00')).date()
-                            if record_date == today:
-                                return True
-                        except:
-                            pass
+            # Rows are appended in time order, so read backwards block by block
+            # until the oldest row read is from an earlier day
+            with open(attendance_file, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                start = size
+                while True:
+                    start = max(0, start - 64 * 1024)
+                    f.seek(start)
+                    lines = f.read(size - start).decode('utf-8', errors='replace').splitlines(keepends=True)
+                    # The first line is the header or a row cut by the block boundary
+                    rows = [row for row in csv.reader(lines[1:]) if len(row) >= 3]
+                    if start == 0 or (rows and rows[0][2][:10] < day):
+                        break
             
-            return False
+            for row in reversed(rows):
+                if row[0] == emp_id and row[2][:10] == day:
+                    return {
+                        "emp_id": row[0],
+                        "status": row[1],
+                        "timestamp": row[2],
+                        "check_in_time": (row[3] if len(row) > 3 else "") or None,
+                        "notes": (row[4] if len(row) > 4 else "") or "",
+                    }
+            return None
         except Exception:
-            return False
+            return None
+    
+    def check_already_checked_in_today(emp_id):
+        """Check if employee already checked in today"""
+        return latest_attendance(emp_id) is not None
 
 # Import report import module for CSV/XLSX analysis
 try:
@@ -1176,522 +1198,10 @@ st.markdown("""
 EXCEL_FILE_PATH = r'D:\Employee Track Report\task_tracker.xlsx'
 CONFIG_FILE = 'config.json'
 
-DATA_COLUMNS = [
-    'Date',
-    'Work Mode',
-    'Emp Id',
-    'Name',
-    'Project Name',
-    'Task Title',
-    'Task Assigned By',
-    'Task Priority',
-    'Task Status',
-    'Plan for next day',
-    'Support Request',
-    'Availability',
-    'Effort (in hours)',
-    'Employee Performance (%)'
-]
-
-SUMMARY_SHEET_NAME = '📈 Employee Progress Dashboard'
-PERFORMANCE_SHEET_NAME = 'Employee Performance'
-WEEKLY_SHEET_NAME = '📊 Weekly Progress Dashboard'
-EMPLOYEE_SHEET_SUFFIX = ' Dashboard'
-
-
-# ==================== HELPERS ====================
-
-def sanitize_sheet_name(name: str) -> str:
-    """Return a workbook-safe base sheet name (<=31 chars, invalid chars removed)."""
-    import re
-
-    safe = re.sub(r'[\\/*?:\[\]]', '_', str(name)).strip()
-    if not safe:
-        safe = 'Unnamed'
-    return safe[:31]
-
-
-def build_employee_sheet_name(base_name: str, used_names: set[str]) -> str:
-    """Construct a unique sheet name for an employee while respecting Excel limits."""
-    suffix = EMPLOYEE_SHEET_SUFFIX
-    max_base_len = max(0, 31 - len(suffix))
-    trimmed_base = base_name[:max_base_len] if max_base_len else base_name[:31]
-    candidate = f"{trimmed_base}{suffix}"
-
-    counter = 2
-    while candidate in used_names:
-        extra = f" {counter}"
-        counter += 1
-        allowed_len = max(0, 31 - len(suffix) - len(extra))
-        trimmed_base = base_name[:allowed_len] if allowed_len else ''
-        fallback = trimmed_base if trimmed_base else 'Employee'
-        candidate = f"{fallback}{extra}{suffix}"
-
-    used_names.add(candidate)
-    return candidate
-
-
-def ensure_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Guarantee the performance and effort columns exist and are numeric."""
-    df = df.copy()
-    numeric_cols = ['Employee Performance (%)', 'Effort (in hours)']
-
-    for col in numeric_cols:
-        if col not in df.columns:
-            df[col] = 0.0
-        df[col] = (
-            pd.to_numeric(df[col], errors='coerce')
-            .fillna(0.0)
-            .astype(float)
-        )
-
-    return df
-
-
-# ==================== PERFORMANCE CALCULATION ====================
-
-def calculate_performance(tasks_list):
-    """
-    Calculate employee performance using formula:
-    Average % = (Sum of Task Priority / Total Effort in Hours) * 100
-
-    Priority weights: Low=1, Medium=2, High=3, Critical=4
-    """
-    if not tasks_list:
-        return 0.0
-
-    priority_weights = {
-        'Low': 1,
-        'Medium': 2,
-        'High': 3,
-        'Critical': 4
-    }
-
-    total_priority_weight = 0
-    total_effort = 0
-
-    for task in tasks_list:
-        priority = task.get('Task Priority', 'Low')
-        try:
-            effort = float(task.get('Effort (in hours)', 0))
-        except Exception:
-            effort = 0.0
-
-        weight = priority_weights.get(priority, 1)
-        total_priority_weight += weight
-        total_effort += effort
-
-    if total_effort == 0:
-        return 0.0
-
-    performance = (total_priority_weight / total_effort) * 100
-    # Cap at 100%
-    return min(round(performance, 2), 100.0)
-
-
-# ==================== EXCEL PERFORMANCE DASHBOARD ====================
-
-def update_dashboard_sheets(excel_path: str, full_df: pd.DataFrame) -> None:
-    """
-    Regenerate the performance-related dashboard sheets in the Excel workbook:
-
-    - SUMMARY_SHEET_NAME (overall summary per employee)
-    - PERFORMANCE_SHEET_NAME (ranked performance table)
-    - WEEKLY_SHEET_NAME (weekly metrics + per-employee weekly summary)
-    - Individual employee sheets: "<Employee Name> Dashboard"
-    """
-    if full_df is None or full_df.empty:
-        logging.info("Skipping dashboard sheet update because there is no data.")
-        return
-
-    if 'Name' not in full_df.columns:
-        logging.warning("Cannot build dashboard sheets because 'Name' column is missing.")
-        return
-
-    try:
-        full_df = ensure_numeric_columns(full_df)
-        if 'Date' in full_df.columns:
-            full_df['Date'] = pd.to_datetime(full_df['Date'], errors='coerce')
-    except Exception as parse_error:
-        logging.error(f"Failed to normalise data for dashboard sheets: {parse_error}")
-        return
-
-    try:
-        book = load_workbook(excel_path)
-    except Exception as workbook_error:
-        logging.error(f"Unable to open workbook '{excel_path}' to update dashboard sheets: {workbook_error}")
-        return
-
-    # 1. Clean up existing dashboard-related sheets
-    all_sheetnames = list(book.sheetnames)
-    for sheet_name in all_sheetnames:
-        if sheet_name == SUMMARY_SHEET_NAME:
-            del book[sheet_name]
-        elif sheet_name == PERFORMANCE_SHEET_NAME:
-            del book[sheet_name]
-        elif sheet_name == WEEKLY_SHEET_NAME:
-            del book[sheet_name]
-        elif sheet_name.endswith(EMPLOYEE_SHEET_SUFFIX) and sheet_name != SUMMARY_SHEET_NAME:
-            del book[sheet_name]
-
-    # 2. Build in-memory summary records (overall, all-time)
-    summary_records = []
-
-    unique_names = (
-        full_df['Name']
-        .dropna()
-        .astype(str)
-        .str.strip()
-    )
-    unique_names = [name for name in unique_names.unique() if name]
-
-    for name in unique_names:
-        emp_mask = full_df['Name'].astype(str).str.strip() == name
-        emp_data = full_df[emp_mask]
-
-        total_tasks = len(emp_data)
-
-        if 'Task Status' in emp_data.columns:
-            completed_tasks = int((emp_data['Task Status'] == 'Completed').sum())
-        else:
-            completed_tasks = 0
-
-        pending_tasks = max(total_tasks - completed_tasks, 0)
-        completion_rate = round((completed_tasks / total_tasks * 100) if total_tasks else 0.0, 2)
-        avg_perf = round(emp_data['Employee Performance (%)'].mean(), 2)
-
-        last_update = None
-        if 'Date' in emp_data.columns and not emp_data['Date'].dropna().empty:
-            last_update = emp_data['Date'].dropna().max()
-
-        summary_records.append({
-            'name': name,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks,
-            'completion_rate': completion_rate,
-            'avg_performance': avg_perf,
-            'last_update': last_update,
-            'mask': emp_mask,   # keep for building detail sheets
-        })
-
-    # Sort by average performance descending, then completion rate
-    summary_records.sort(
-        key=lambda record: (record['avg_performance'], record['completion_rate']),
-        reverse=True
-    )
-
-    # 3. SUMMARY SHEET (📈 Employee Progress Dashboard)
-    ws_summary = book.create_sheet(SUMMARY_SHEET_NAME)
-    summary_headers = [
-        'Employee Name',
-        'Total Tasks',
-        'Completed Tasks',
-        'Pending Tasks',
-        'Completion Rate (%)',
-        'Employee Performance (%)',
-        'Last Update',
-        'Individual Dashboard'
-    ]
-
-    for col_idx, header in enumerate(summary_headers, start=1):
-        ws_summary.cell(row=1, column=col_idx, value=header)
-
-    ws_summary.freeze_panes = "A2"
-
-    col_widths = [28, 14, 16, 14, 20, 20, 16, 24]
-    for idx, width in enumerate(col_widths, start=1):
-        column_letter = ws_summary.cell(row=1, column=idx).column_letter
-        ws_summary.column_dimensions[column_letter].width = width
-
-    used_sheet_names: set[str] = set(book.sheetnames)
-    data_start_row = 2
-
-    for offset, record in enumerate(summary_records):
-        row_idx = data_start_row + offset
-
-        ws_summary.cell(row=row_idx, column=1, value=record['name'])
-        ws_summary.cell(row=row_idx, column=2, value=record['total_tasks'])
-        ws_summary.cell(row=row_idx, column=3, value=record['completed_tasks'])
-        ws_summary.cell(row=row_idx, column=4, value=record['pending_tasks'])
-        ws_summary.cell(row=row_idx, column=5, value=record['completion_rate'])
-        ws_summary.cell(row=row_idx, column=6, value=record['avg_performance'])
-
-        last_update_value = ""
-        if record['last_update'] is not None and not pd.isna(record['last_update']):
-            if isinstance(record['last_update'], pd.Timestamp):
-                last_update_value = record['last_update'].date().isoformat()
-            else:
-                last_update_value = str(record['last_update'])
-
-        ws_summary.cell(row=row_idx, column=7, value=last_update_value)
-
-        # Build unique employee sheet name and hyperlink
-        base_name = sanitize_sheet_name(record['name'])
-        employee_sheet_name = build_employee_sheet_name(base_name, used_sheet_names)
-        hyperlink_formula = f'=HYPERLINK("#\'{employee_sheet_name}\'!A1", "View Dashboard")'
-        ws_summary.cell(row=row_idx, column=8).value = hyperlink_formula
-
-        # 4. INDIVIDUAL EMPLOYEE SHEET ("<Name> Dashboard")
-        ws_emp = book.create_sheet(employee_sheet_name)
-        ws_emp.freeze_panes = "A8"
-
-        ws_emp.cell(row=1, column=1, value="Employee Dashboard")
-        ws_emp.cell(row=1, column=1).font = Font(bold=True, size=14)
-
-        ws_emp.cell(row=2, column=1, value="Employee Name")
-        ws_emp.cell(row=2, column=2, value=record['name'])
-
-        ws_emp.cell(row=3, column=1, value="Total Tasks")
-        ws_emp.cell(row=3, column=2, value=record['total_tasks'])
-
-        ws_emp.cell(row=4, column=1, value="Completed Tasks")
-        ws_emp.cell(row=4, column=2, value=record['completed_tasks'])
-
-        ws_emp.cell(row=5, column=1, value="Pending Tasks")
-        ws_emp.cell(row=5, column=2, value=record['pending_tasks'])
-
-        ws_emp.cell(row=6, column=1, value="Completion Rate (%)")
-        ws_emp.cell(row=6, column=2, value=record['completion_rate'])
-
-        ws_emp.cell(row=7, column=1, value="Avg Performance (%)")
-        ws_emp.cell(row=7, column=2, value=record['avg_performance'])
-
-        ws_emp.cell(row=2, column=4, value="Last Update")
-        ws_emp.cell(row=2, column=5, value=last_update_value)
-
-        ws_emp.cell(row=3, column=4, value="Back to Dashboard")
-        ws_emp.cell(row=3, column=5).value = (
-            f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A1", "View All Employees")'
-        )
-
-        ws_emp.cell(row=9, column=1, value="Task Details")
-        header_row = 10
-        detail_start_row = header_row + 1
-
-        emp_details = full_df[record['mask']].copy()
-        emp_details = (
-            emp_details.sort_values(by='Date')
-            if 'Date' in emp_details.columns else emp_details
-        )
-
-        # Header row
-        for col_idx, col_name in enumerate(DATA_COLUMNS, start=1):
-            ws_emp.cell(row=header_row, column=col_idx, value=col_name)
-
-        # Detail rows
-        for row_offset, (_, detail_row) in enumerate(emp_details.iterrows()):
-            excel_row_idx = detail_start_row + row_offset
-            for col_idx, col_name in enumerate(DATA_COLUMNS, start=1):
-                cell_value = detail_row.get(col_name)
-                if pd.isna(cell_value):
-                    cell_value = ""
-                elif isinstance(cell_value, pd.Timestamp):
-                    cell_value = cell_value.date()
-                ws_emp.cell(row=excel_row_idx, column=col_idx, value=cell_value)
-
-        # Column widths
-        for col_idx in range(1, len(DATA_COLUMNS) + 1):
-            column_letter = ws_emp.cell(row=header_row, column=col_idx).column_letter
-            ws_emp.column_dimensions[column_letter].width = 18
-
-    if summary_records:
-        ws_summary.auto_filter.ref = f"A1:H{data_start_row + len(summary_records) - 1}"
-
-        # 5. PERFORMANCE SHEET ("Employee Performance")
-        ws_perf = book.create_sheet(PERFORMANCE_SHEET_NAME)
-
-        perf_headers = [
-            'Rank',
-            'Employee Name',
-            'Total Tasks',
-            'Completed Tasks',
-            'Completion Rate (%)',
-            'Employee Performance (%)',
-            'Last Update',
-            'Dashboard Link'
-        ]
-        perf_col_widths = [8, 28, 14, 16, 20, 20, 16, 24]
-
-        for col_idx, header in enumerate(perf_headers, start=1):
-            ws_perf.cell(row=1, column=col_idx, value=header)
-            column_letter = ws_perf.cell(row=1, column=col_idx).column_letter
-            width = perf_col_widths[col_idx - 1] if col_idx - 1 < len(perf_col_widths) else 18
-            ws_perf.column_dimensions[column_letter].width = width
-
-        ws_perf.freeze_panes = "A2"
-
-        for rank, record in enumerate(summary_records, start=1):
-            row_idx = rank + 1
-            ws_perf.cell(row=row_idx, column=1, value=rank)
-            ws_perf.cell(row=row_idx, column=2, value=record['name'])
-            ws_perf.cell(row=row_idx, column=3, value=record['total_tasks'])
-            ws_perf.cell(row=row_idx, column=4, value=record['completed_tasks'])
-            ws_perf.cell(row=row_idx, column=5, value=record['completion_rate'])
-            ws_perf.cell(row=row_idx, column=6, value=record['avg_performance'])
-
-            last_update_value = ws_summary.cell(data_start_row + rank - 1, column=7).value
-            ws_perf.cell(row=row_idx, column=7, value=last_update_value)
-            ws_perf.cell(row=row_idx, column=8).value = (
-                f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A{data_start_row + rank - 1}", '
-                f'"Open Dashboard")'
-            )
-
-        ws_perf.auto_filter.ref = f"A1:H{len(summary_records) + 1}"
-
-    # 6. WEEKLY PROGRESS DASHBOARD ("📊 Weekly Progress Dashboard")
-    #    - last 7 days inclusive (today - 6 days ... today)
-    today = datetime.now().date()
-    week_start = today - timedelta(days=6)
-
-    weekly_df = full_df[
-        (full_df['Date'].dt.date >= week_start) &
-        (full_df['Date'].dt.date <= today)
-    ].copy()
-
-    weekly_summary_records = []
-
-    for record in summary_records:
-        name = record['name']
-        emp_weekly_mask = weekly_df['Name'].astype(str).str.strip() == name
-        emp_weekly = weekly_df[emp_weekly_mask]
-
-        total_tasks_week = len(emp_weekly)
-
-        if 'Task Status' in emp_weekly.columns:
-            completed_week = int((emp_weekly['Task Status'] == 'Completed').sum())
-        else:
-            completed_week = 0
-
-        pending_week = max(total_tasks_week - completed_week, 0)
-        completion_rate_week = round((completed_week / total_tasks_week * 100) if total_tasks_week else 0.0, 2)
-        avg_perf_week = round(emp_weekly['Employee Performance (%)'].mean(), 2)
-        total_effort_week = round(emp_weekly['Effort (in hours)'].sum(), 1)
-
-        workload_status = 'Unknown'
-        if 'Availability' in emp_weekly.columns and not emp_weekly.empty:
-            avail_counts = emp_weekly['Availability'].value_counts()
-            if not avail_counts.empty:
-                workload_status = avail_counts.index[0]  # Most common availability
-
-        weekly_summary_records.append({
-            'name': name,
-            'total_tasks': total_tasks_week,
-            'completed_tasks': completed_week,
-            'pending_tasks': pending_week,
-            'completion_rate': completion_rate_week,
-            'avg_performance': avg_perf_week,
-            'total_effort': total_effort_week,
-            'workload_status': workload_status
-        })
-
-    weekly_summary_records.sort(key=lambda record: record['avg_performance'], reverse=True)
-
-    overall_total_tasks = len(weekly_df)
-    overall_completed = (
-        int((weekly_df['Task Status'] == 'Completed').sum())
-        if 'Task Status' in weekly_df.columns else 0
-    )
-    overall_completion = round((overall_completed / overall_total_tasks * 100) if overall_total_tasks else 0.0, 2)
-    overall_avg_perf = round(weekly_df['Employee Performance (%)'].mean(), 2)
-    overall_total_effort = round(weekly_df['Effort (in hours)'].sum(), 1)
-
-    ws_weekly = book.create_sheet(WEEKLY_SHEET_NAME)
-    ws_weekly.freeze_panes = "A7"
-
-    # Title
-    ws_weekly.merge_cells('A1:I1')
-    ws_weekly.cell(row=1, column=1).value = (
-        f"📊 Weekly Progress Dashboard - Week of "
-        f"{week_start.strftime('%Y-%m-%d')} to {today.strftime('%Y-%m-%d')}"
-    )
-    ws_weekly.cell(row=1, column=1).font = Font(bold=True, size=14)
-
-    # Back to Summary Link
-    ws_weekly.cell(row=2, column=1, value="Back to Overall Dashboard")
-    ws_weekly.cell(row=2, column=2).value = (
-        f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A1", "View All-Time Summary")'
-    )
-
-    # Overall Metrics Section
-    ws_weekly.cell(row=3, column=1, value="Overall Weekly Metrics")
-    ws_weekly.cell(row=3, column=1).font = Font(bold=True)
-    ws_weekly.merge_cells('A3:B3')
-
-    metrics_start_row = 4
-    overall_metrics = [
-        ('Total Tasks', overall_total_tasks),
-        ('Completed Tasks', overall_completed),
-        ('Overall Completion Rate (%)', overall_completion),
-        ('Average Performance (%)', overall_avg_perf),
-        ('Total Effort (Hours)', overall_total_effort)
-    ]
-
-    for idx, (label, value) in enumerate(overall_metrics):
-        row = metrics_start_row + idx
-        ws_weekly.cell(row=row, column=1, value=label)
-        ws_weekly.cell(row=row, column=2, value=value)
-
-    # Weekly Table Headers
-    table_start_row = metrics_start_row + len(overall_metrics) + 1
-    weekly_headers = [
-        'Employee Name',
-        'Total Tasks (Week)',
-        'Completed',
-        'Pending',
-        'Completion Rate (%)',
-        'Avg Performance (%)',
-        'Total Effort (hrs)',
-        'Workload Status',
-        'Individual Dashboard'
-    ]
-
-    for col_idx, header in enumerate(weekly_headers, start=1):
-        cell = ws_weekly.cell(row=table_start_row, column=col_idx, value=header)
-        cell.font = Font(bold=True)
-
-    weekly_col_widths = [28, 18, 14, 14, 20, 20, 16, 16, 24]
-    for idx, width in enumerate(weekly_col_widths, start=1):
-        column_letter = ws_weekly.cell(row=table_start_row, column=idx).column_letter
-        ws_weekly.column_dimensions[column_letter].width = width
-
-    # Populate weekly table
-    for offset, record in enumerate(weekly_summary_records):
-        row_idx = table_start_row + 1 + offset
-
-        ws_weekly.cell(row=row_idx, column=1, value=record['name'])
-        ws_weekly.cell(row=row_idx, column=2, value=record['total_tasks'])
-        ws_weekly.cell(row=row_idx, column=3, value=record['completed_tasks'])
-        ws_weekly.cell(row=row_idx, column=4, value=record['pending_tasks'])
-        ws_weekly.cell(row=row_idx, column=5, value=record['completion_rate'])
-        ws_weekly.cell(row=row_idx, column=6, value=record['avg_performance'])
-        ws_weekly.cell(row=row_idx, column=7, value=record['total_effort'])
-        ws_weekly.cell(row=row_idx, column=8, value=record['workload_status'])
-
-        base_name = sanitize_sheet_name(record['name'])
-        employee_sheet_name = build_employee_sheet_name(base_name, used_sheet_names)
-        hyperlink_formula = f'=HYPERLINK("#\'{employee_sheet_name}\'!A1", "View Dashboard")'
-        ws_weekly.cell(row=row_idx, column=9).value = hyperlink_formula
-
-    if weekly_summary_records:
-        last_row = table_start_row + len(weekly_summary_records)
-        ws_weekly.auto_filter.ref = f"A{table_start_row}:I{last_row}"
-
-    # Save workbook
-    try:
-        book.save(excel_path)
-    except Exception as save_error:
-        logging.error(f"Failed to save workbook with updated dashboard sheets: {save_error}")
-
-
+DATA_COLUMNS = task_store.DATA_COLUMNS
 
 
 # Helper Functions
-def get_dataframe_hash(df):
-    """Create hash of dataframe for caching purposes"""
-    import hashlib
-    return hashlib.md5(pd.util.hash_pandas_object(df).values).hexdigest()
-
 def load_config():
     """Load configuration from file"""
     if Path(CONFIG_FILE).exists():
@@ -1709,183 +1219,92 @@ def save_config(config):
     """Save configuration to file"""
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, f, indent=4)
-def read_excel_data(excel_path=None):
-    """Read data from local Excel file"""
+def read_excel_data(excel_path=None, date_from=None, date_to=None, columns=None, emp_ids=None):
+    """Read task data through the configured task store
+    date_from/date_to (inclusive) limit the read to that date range; columns and
+    emp_ids limit it to those columns/employees (see task_store.load_tasks).
+    """
     if excel_path is None:
         excel_path = EXCEL_FILE_PATH
    
     try:
-        if not os.path.exists(excel_path):
-            # Create empty Excel file with headers if it doesn't exist
-            df = pd.DataFrame(columns=DATA_COLUMNS)
-            df.to_excel(excel_path, index=False, engine='openpyxl')
-            return df
-       
-        # Read Excel file
-        df = pd.read_excel(excel_path, engine='openpyxl')
+        # Shared, process-wide cached frame (read-only view, typed at load)
+        df = task_store.load_tasks(
+            excel_path, date_from=date_from, date_to=date_to, columns=columns, emp_ids=emp_ids
+        )
        
-        # Handle empty file
+        # Handle empty store
         if df.empty:
             return pd.DataFrame()
        
-        # Ensure 'Employee Performance (%)' column exists
-        return ensure_numeric_columns(df)
+        return df
    
     except Exception as error:
-        st.error(f"Error reading Excel file: {error}")
+        st.error(f"Error reading task data: {error}")
         return None
 def append_to_excel(data_list, excel_path=None):
-    """Append data to local Excel file with retry logic for concurrent access
+    """Append data to the task store through the single-writer submission queue
+    Concurrent sessions are group-committed by one writer thread; this call waits
+    for its own acknowledgement. The Excel workbook and its dashboard sheets are
+    rebuilt afterwards by the background dashboard worker.
     Args:
         data_list: List of dictionaries, each representing a row to append
     """
     if excel_path is None:
         excel_path = EXCEL_FILE_PATH
    
-    max_retries = 3
-    retry_delay = 0.5
-   
-    for attempt in range(max_retries):
+    try:
+        submission = submission_queue.submit(data_list, excel_path)
         try:
-            # Check if file exists and is accessible
-            if os.path.exists(excel_path):
-                # Try to check if file is locked by attempting to open it
-                try:
-                    # Try to read the file first to check if it's locked
-                    existing_df = pd.read_excel(excel_path, engine='openpyxl')
-                    # Remove any completely empty rows
-                    existing_df = existing_df.dropna(how='all')
-                except PermissionError as pe:
-                    if attempt < max_retries - 1:
-                        logging.warning(f"Permission error on attempt {attempt + 1}, retrying...")
-                        time.sleep(retry_delay * (attempt + 1))
-                        continue
-                    else:
-                        st.error(f"❌ Permission Error: Excel file is locked or inaccessible.")
-                        st.error(f"📁 File path: {excel_path}")
-                        st.error(f"💡 Please ensure:")
-                        st.error(f" 1. The Excel file is not open in Excel or another program")
-                        st.error(f" 2. You have write permissions to the file")
-                        st.error(f" 3. No other process is using the file")
-                        st.error(f" Error details: {str(pe)}")
-                        return False
-                except Exception as e:
-                    # If file is corrupted or empty, start fresh
-                    logging.warning(f"Error reading file, starting fresh: {e}")
-                    existing_df = pd.DataFrame()
-            else:
-                existing_df = pd.DataFrame()
-           
-            # Create new rows DataFrame
-            new_rows = pd.DataFrame(data_list)
-           
-            # Define column order
-            columns = DATA_COLUMNS
-           
-            # Combine with existing data
-            if existing_df.empty:
-                for col in columns:
-                    if col not in new_rows.columns:
-                        new_rows[col] = 0.0 if col == 'Employee Performance (%)' else ''
-                combined_df = new_rows[columns]
-            else:
-                # Ensure column order matches
-                # Add missing columns if any
-                for col in columns:
-                    if col not in existing_df.columns:
-                        existing_df[col] = 0.0 if col == 'Employee Performance (%)' else ''
-                    if col not in new_rows.columns:
-                        new_rows[col] = 0.0 if col == 'Employee Performance (%)' else ''
-               
-                # Reorder columns
-                existing_df = existing_df[columns]
-                new_rows = new_rows[columns]
-               
-                combined_df = pd.concat([existing_df, new_rows], ignore_index=True)
-           
-            # Ensure all columns are in the right order
-            if not existing_df.empty:
-                combined_df = combined_df[columns]
-            combined_df = ensure_numeric_columns(combined_df)
-           
-            # Write to Excel
-            try:
-                with pd.ExcelWriter(excel_path, engine='openpyxl', mode='w') as writer:
-                    combined_df.to_excel(writer, index=False, sheet_name='Sheet1')
-            except PermissionError as pe:
-                if attempt < max_retries - 1:
-                    logging.warning(f"Permission error writing file on attempt {attempt + 1}, retrying...")
-                    time.sleep(retry_delay * (attempt + 1))
-                    continue
-                else:
-                    st.error(f"❌ Permission Error: Cannot write to Excel file.")
-                    st.error(f"📁 File path: {excel_path}")
-                    st.error(f"💡 Please ensure:")
-                    st.error(f" 1. The Excel file is not open in Excel or another program")
-                    st.error(f" 2. You have write permissions to the file and directory")
-                    st.error(f" 3. No other process is using the file")
-                    st.error(f" Error details: {str(pe)}")
-                    return False
-            except Exception as write_error:
-                if attempt < max_retries - 1:
-                    logging.warning(f"Write error on attempt {attempt + 1}, retrying...")
-                    time.sleep(retry_delay * (attempt + 1))
-                    continue
-                else:
-                    st.error(f"❌ Error writing to Excel file: {str(write_error)}")
-                    st.error(f"📁 File path: {excel_path}")
-                    st.error(f"💡 Error type: {type(write_error).__name__}")
-                    return False
-            # Update dashboard sheets after successful main sheet write
-            try:
-                update_dashboard_sheets(excel_path, combined_df)
-            except Exception as dash_error:
-                logging.error(f"Failed to update dashboard sheets: {dash_error}")
-                # Continue without failing the main append
-           
-            return True
-       
-        except PermissionError as pe:
-            # File might be locked by another process
-            if attempt < max_retries - 1:
-                logging.warning(f"Permission error on attempt {attempt + 1}, retrying...")
-                time.sleep(retry_delay * (attempt + 1))
-                continue
-            else:
-                st.error(f"❌ Permission Error: Excel file is locked or inaccessible.")
-                st.error(f"📁 File path: {excel_path}")
-                st.error(f"💡 Please ensure:")
-                st.error(f" 1. The Excel file is not open in Excel or another program")
-                st.error(f" 2. You have write permissions to the file")
-                st.error(f" 3. No other process is using the file")
-                st.error(f" Error details: {str(pe)}")
-                return False
-       
-        except Exception as error:
-            if attempt < max_retries - 1:
-                logging.warning(f"Error on attempt {attempt + 1}, retrying... Error: {str(error)}")
-                time.sleep(retry_delay * (attempt + 1))
-                continue
-            else:
-                st.error(f"❌ Error appending to Excel file")
-                st.error(f"📁 File path: {excel_path}")
-                st.error(f"🔍 Error type: {type(error).__name__}")
-                st.error(f"📝 Error message: {str(error)}")
-                st.error(f"💡 Please check the file path and permissions.")
+            submission.wait()
+        except TimeoutError:
+            # Only report a failure if the report can no longer be written later,
+            # otherwise resubmitting it would store it twice
+            if submission_queue.cancel(submission, excel_path):
+                st.error("❌ The task store did not respond in time. Your report was not saved, please submit it again.")
                 return False
+            st.warning("⏳ Your report is still being saved. Please do not submit it again.")
+            return True
+        return True
    
-    return False
+    except PermissionError as pe:
+        # File might be locked by another process
+        st.error(f"❌ Permission Error: Task store is locked or inaccessible.")
+        st.error(f"📁 File path: {excel_path}")
+        st.error(f"💡 Please ensure:")
+        st.error(f" 1. The Excel file is not open in Excel or another program")
+        st.error(f" 2. You have write permissions to the file and directory")
+        st.error(f" 3. No other process is using the file")
+        st.error(f" Error details: {str(pe)}")
+        return False
+   
+    except Exception as error:
+        st.error(f"❌ Error saving report to task store")
+        st.error(f"📁 File path: {excel_path}")
+        st.error(f"🔍 Error type: {type(error).__name__}")
+        st.error(f"📝 Error message: {str(error)}")
+        st.error(f"💡 Please check the file path and permissions.")
+        return False
+def export_task_workbook(excel_path=None):
+    """Export the stored task history to the Excel workbook and rebuild its dashboard sheets.
+    Returns the number of exported rows.
+    """
+    if excel_path is None:
+        excel_path = EXCEL_FILE_PATH
+    return dashboard_worker.get_worker(excel_path).build_now()
 def get_missing_reporters(df, today):
-    """Get list of employees who haven't reported today - FIXED VERSION"""
-    if df is None or df.empty:
+    """Get list of employees who haven't reported today - FIXED VERSION
+    df only needs today's rows; an empty frame means nobody has reported yet.
+    """
+    if df is None:
         return []
     
     today_str = today.strftime('%Y-%m-%d')
     
-    # Load all employees from employees.json (excluding admins)
+    # Load all employees from the employee directory (excluding admins)
     try:
-        with open('employees.json', 'r') as f:
-            employees_data = json.load(f)
+        import attendance_store
+        employees_data = attendance_store.load_employees()
         
         all_employees = {}
         for emp_id, emp_info in employees_data.items():
@@ -1905,13 +1324,9 @@ def get_missing_reporters(df, today):
     # Get list of employees who submitted today
     submitted_emails = set()
     
-    if 'Date' in df.columns:
-        df_copy = df.copy()
-        df_copy['Date'] = pd.to_datetime(df_copy['Date'], errors='coerce')
-        df_copy = df_copy.dropna(subset=['Date'])
-        df_copy['Date_str'] = df_copy['Date'].dt.strftime('%Y-%m-%d')
-        
-        today_submissions = df_copy[df_copy['Date_str'] == today_str]
+    if 'Date' in df.columns and not df.empty:
+        date_str = task_store.task_dates(df).dt.strftime('%Y-%m-%d')
+        today_submissions = df[date_str == today_str]
         
         # Match by Employee ID (Excel column is 'Emp Id' with space)
         if 'Emp Id' in today_submissions.columns:
@@ -1926,11 +1341,31 @@ def get_missing_reporters(df, today):
     
     return missing
 #Dashboard Functions
-def show_metrics(df):
-    """Display key metrics"""
+def show_metrics(df, rollup=None):
+    """Display key metrics
+    With a daily rollup (task_store.load_daily_rollup) the numbers are summed
+    from it instead of being counted over the raw rows.
+    """
+    today = datetime.now().date()
+    if rollup is not None:
+        total_submissions = int(rollup['Tasks'].sum())
+        today_count = int(rollup.loc[rollup['Date'] == str(today), 'Tasks'].sum())
+        unique_employees = rollup.loc[rollup['Name'] != '', 'Name'].nunique()
+        completed_tasks = int(rollup['Completed'].sum())
+    else:
+        has_rows = df is not None and not df.empty
+        total_submissions = len(df) if has_rows else 0
+        today_count = 0
+        if has_rows and 'Date' in df.columns:
+            today_count = len(df[df['Date'] == str(today)])
+        unique_employees = 0
+        if has_rows and 'Name' in df.columns:
+            unique_employees = df['Name'].nunique()
+        completed_tasks = 0
+        if has_rows and 'Task Status' in df.columns:
+            completed_tasks = len(df[df['Task Status'] == 'Completed'])
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_submissions = len(df) if df is not None and not df.empty else 0
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{total_submissions}</div>
@@ -1938,10 +1373,6 @@ def show_metrics(df):
         </div>
         """, unsafe_allow_html=True)
     with col2:
-        today = datetime.now().date()
-        today_count = 0
-        if df is not None and not df.empty and 'Date' in df.columns:
-            today_count = len(df[df['Date'] == str(today)])
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{today_count}</div>
@@ -1949,9 +1380,6 @@ def show_metrics(df):
         </div>
         """, unsafe_allow_html=True)
     with col3:
-        unique_employees = 0
-        if df is not None and not df.empty and 'Name' in df.columns:
-            unique_employees = df['Name'].nunique()
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{unique_employees}</div>
@@ -1959,17 +1387,17 @@ def show_metrics(df):
         </div>
         """, unsafe_allow_html=True)
     with col4:
-        completed_tasks = 0
-        if df is not None and not df.empty and 'Task Status' in df.columns:
-            completed_tasks = len(df[df['Task Status'] == 'Completed'])
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{completed_tasks}</div>
             <div class="metric-label">Completed Tasks</div>
         </div>
         """, unsafe_allow_html=True)
-def show_filters(df):
-    """Display filter options"""
+def show_filters(df, excel_path=None):
+    """Display filter options
+    With excel_path the selected date range is read from the task store
+    instead of being filtered out of the full frame.
+    """
     if df is None or df.empty:
         return df
     st.markdown('<div class="filter-container">', unsafe_allow_html=True)
@@ -2011,25 +1439,50 @@ def show_filters(df):
     with col6:
         end_date = st.date_input("End Date", datetime.now().date())
     st.markdown('</div>', unsafe_allow_html=True)
+    # Remembered so the dashboards below can read the matching daily rollup
+    st.session_state.dashboard_filters = {
+        'employee': selected_employee,
+        'project': selected_project,
+        'status': selected_status,
+        'priority': selected_priority,
+        'start_date': start_date,
+        'end_date': end_date,
+    }
     # Apply filters
-    filtered_df = df.copy()
-    if 'Date' in filtered_df.columns:
-        filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], errors='coerce')
-        filtered_df = filtered_df[
-            (filtered_df['Date'].dt.date >= start_date) &
-            (filtered_df['Date'].dt.date <= end_date)
-        ]
-    if selected_employee != 'All' and 'Name' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['Name'] == selected_employee]
-    if selected_project != 'All' and 'Project Name' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['Project Name'] == selected_project]
-    if selected_status != 'All' and 'Task Status' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['Task Status'] == selected_status]
-    if selected_priority != 'All' and 'Task Priority' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['Task Priority'] == selected_priority]
-    return filtered_df
-def show_charts(df):
-    """Display analytics charts"""
+    range_df = read_excel_data(excel_path, date_from=start_date, date_to=end_date) if excel_path else None
+    if range_df is not None:
+        filtered_df = range_df
+    else:
+        filtered_df = task_store.filter_date_range(df, start_date, end_date)
+    if 'Date' in filtered_df.columns and not task_store.is_normalised(filtered_df):
+        filtered_df = filtered_df.assign(Date=task_store.task_dates(filtered_df))
+    # One combined mask, so the rows are taken once instead of once per filter
+    selections = {
+        'Name': selected_employee,
+        'Project Name': selected_project,
+        'Task Status': selected_status,
+        'Task Priority': selected_priority,
+    }
+    return task_store.select_rows(filtered_df, selections)
+def rollup_for_filters(excel_path, filters):
+    """Daily rollup matching the show_filters selection
+    Returns None when the selection filters on columns the rollup does not
+    carry (project, status, priority); callers then aggregate the raw rows.
+    """
+    if not filters or any(filters.get(key, 'All') != 'All' for key in ('project', 'status', 'priority')):
+        return None
+    try:
+        rollup = task_store.load_daily_rollup(excel_path, filters['start_date'], filters['end_date'])
+    except Exception as error:
+        logging.warning(f"Could not read daily rollup, using raw rows: {error}")
+        return None
+    if filters['employee'] != 'All':
+        rollup = rollup[rollup['Name'] == filters['employee']]
+    return rollup
+def show_charts(df, rollup=None):
+    """Display analytics charts
+    The submission trend is read from the daily rollup when one is given.
+    """
     if df is None or df.empty:
         st.info("No data available for charts")
         return
@@ -2037,7 +1490,7 @@ def show_charts(df):
     with col1:
         st.subheader("📈 Task Status Distribution")
         if 'Task Status' in df.columns:
-            status_counts = df['Task Status'].value_counts()
+            status_counts = df['Task Status'].value_counts().loc[lambda counts: counts > 0]
             fig = px.pie(
                 values=status_counts.values,
                 names=status_counts.index,
@@ -2047,7 +1500,7 @@ def show_charts(df):
     with col2:
         st.subheader("⚡ Priority Distribution")
         if 'Task Priority' in df.columns:
-            priority_counts = df['Task Priority'].value_counts()
+            priority_counts = df['Task Priority'].value_counts().loc[lambda counts: counts > 0]
             fig = px.bar(
                 x=priority_counts.index,
                 y=priority_counts.values,
@@ -2063,9 +1516,15 @@ def show_charts(df):
             st.plotly_chart(fig, use_container_width=True)
     # Weekly trend
     st.subheader("📊 Weekly Submission Trend")
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        daily_counts = df.groupby(df['Date'].dt.date).size().reset_index(name='count')
+    if rollup is not None:
+        trend_dates = pd.to_datetime(rollup['Date'], errors='coerce').dt.date
+        daily_counts = rollup.groupby(trend_dates)['Tasks'].sum().reset_index(name='count')
+    elif 'Date' in df.columns:
+        dates = task_store.task_dates(df)
+        daily_counts = df.groupby(dates.dt.date.rename('Date')).size().reset_index(name='count')
+    else:
+        daily_counts = None
+    if daily_counts is not None:
         fig = px.line(
             daily_counts,
             x='Date',
@@ -2100,123 +1559,57 @@ def format_availability_for_csv(availability):
     except Exception:
         return "⚪ Unknown"
 
-def calculate_task_performance(row):
-    """
-    Calculate performance for a single task based on Priority and Status.
-    Returns a percentage value (0-100).
-    """
-    # Priority-based base scores
-    priority_scores = {
-        'Critical': 100,
-        'High': 75,
-        'Medium': 50,
-        'Low': 25
-    }
-    
-    # Get priority (case-insensitive)
-    priority = str(row.get('Task Priority', 'Medium')).strip().title()
-    base_score = priority_scores.get(priority, 50)
-    
-    # Get status (case-insensitive)
-    status = str(row.get('Task Status', '')).lower().strip()
-    
-    # Status multipliers
-    if any(keyword in status for keyword in ['complet', 'done', 'finish', 'closed']):
-        multiplier = 1.0  # 100% of base score
-    elif any(keyword in status for keyword in ['progress', 'ongoing', 'working', 'active', 'started']):
-        multiplier = 0.65  # 65% of base score
-    else:
-        multiplier = 0.30  # 30% of base score (assigned but not started)
-    
-    return round(base_score * multiplier, 2)
-
-
 def calculate_performance_from_priority(emp_df):
     """
     Calculate performance metrics based on Task Priority and Status.
     Priority weights: Critical=100, High=75, Medium=50, Low=25
     Completed tasks get full weight, in-progress get 50%, pending get workload score
+    Vectorised in scoring.score_employee.
     """
     if emp_df.empty:
         return 0.0, 0.0
     
-    # Priority-based scoring
-    priority_weights = {
-        'Critical': 100,
-        'High': 75,
-        'Medium': 50,
-        'Low': 25
-    }
-    
-    total_weighted_score = 0
-    total_possible_score = 0
-    task_count_by_status = {'completed': 0, 'in_progress': 0, 'pending': 0}
-    
-    for _, row in emp_df.iterrows():
-        # Get priority weight (case-insensitive matching)
-        priority = str(row.get('Task Priority', 'Medium')).strip().title()
-        weight = priority_weights.get(priority, 50)  # Default to Medium if unknown
-        
-        # Get status with flexible matching (case-insensitive)
-        status = str(row.get('Task Status', '')).lower().strip()
-        
-        # More flexible status detection
-        if any(keyword in status for keyword in ['complet', 'done', 'finish', 'closed']):
-            multiplier = 1.0  # Full credit
-            task_count_by_status['completed'] += 1
-        elif any(keyword in status for keyword in ['progress', 'ongoing', 'working', 'active', 'started']):
-            multiplier = 0.5  # Half credit
-            task_count_by_status['in_progress'] += 1
-        else:
-            # For pending tasks, give some base credit based on priority
-            # This shows workload/task importance even if not started
-            multiplier = 0.3  # 30% base credit for assigned work
-            task_count_by_status['pending'] += 1
-        
-        total_weighted_score += weight * multiplier
-        total_possible_score += weight
-    
-    # Calculate percentage
-    if total_possible_score > 0:
-        avg_performance = round((total_weighted_score / total_possible_score) * 100, 2)
-    else:
-        avg_performance = 0.0
-    
-    # If no tasks are completed or in progress, show workload-based score
-    if task_count_by_status['completed'] == 0 and task_count_by_status['in_progress'] == 0:
-        # Show 30-40% to indicate task assignment without actual progress
-        avg_performance = max(avg_performance, 30.0)  # Minimum 30% for having tasks assigned
+    result = scoring.score_employee(emp_df)
+    avg_performance = result['avg_performance']
     
     # Latest performance is the same as average for priority-based calc
     latest_perf = avg_performance
     
     # Debug info (optional - can be shown to user)
-    st.caption(f"📊 Status breakdown: {task_count_by_status['completed']} completed, {task_count_by_status['in_progress']} in progress, {task_count_by_status['pending']} pending")
+    st.caption(f"📊 Status breakdown: {result['completed']} completed, {result['in_progress']} in progress, {result['pending']} pending")
     
     return avg_performance, latest_perf
 
-def show_employee_dashboard(df):
-    """Interactive dashboard for selected employee using performance metrics."""
+def show_employee_dashboard(df, rollup=None, data_key=None):
+    """Interactive dashboard for selected employee using performance metrics.
+    The performance overview is read from the daily rollup when one is given.
+    data_key identifies the frame's contents (data version + filters) for caching.
+    """
     if df is None or df.empty or 'Name' not in df.columns:
         st.info("No employee data available for detailed view.")
         return
-    df = ensure_numeric_columns(df)
-    df = df.copy()
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    if not task_store.is_normalised(df):
+        df = ensure_numeric_columns(df)
+        if 'Date' in df.columns:
+            df['Date'] = task_store.task_dates(df)
+    
+    def unique_employees(names):
+        unique_names = pd.Series(names).dropna().unique()
+        return sorted([str(name).strip() for name in unique_names if str(name).strip()])
     
     # Cached employee list generation for performance
+    # (_names is not hashed by Streamlit; data_key stands for its contents)
     @st.cache_data(ttl=3600)
-    def get_unique_employees(df_hash, name_series_values):
+    def get_unique_employees(data_key, _names):
         """Cache employee list - expensive for large datasets"""
-        unique_names = pd.Series(name_series_values).dropna().unique()
-        return sorted([str(name).strip() for name in unique_names if str(name).strip()])
+        return unique_employees(_names)
     
     # Optimized employee list loading
     if 'Name' in df.columns:
-        # Use cached function for performance
-        df_hash = get_dataframe_hash(df[['Name']])
-        employees = get_unique_employees(df_hash, df['Name'].values.tolist())
+        if data_key is not None:
+            employees = get_unique_employees(data_key, df['Name'])
+        else:
+            employees = unique_employees(df['Name'])
     else:
         employees = []
 
@@ -2230,20 +1623,31 @@ def show_employee_dashboard(df):
     with st.expander("📊 Show Performance Overview Chart", expanded=False):
         # Per-employee average performance chart
         try:
-            perf_summary = (
-                df.groupby('Name')['Employee Performance (%)']
-                .mean()
-                .reset_index(name='AvgPerformance')
-            )
+            if rollup is not None:
+                per_employee = (
+                    rollup[rollup['Name'] != '']
+                    .groupby('Name')[['Performance Sum', 'Tasks']]
+                    .sum()
+                )
+                perf_summary = (
+                    (per_employee['Performance Sum'] / per_employee['Tasks'])
+                    .reset_index(name='AvgPerformance')
+                )
+            else:
+                perf_summary = (
+                    df.groupby('Name', observed=True)['Employee Performance (%)']
+                    .mean()
+                    .reset_index(name='AvgPerformance')
+                )
             # latest availability per employee
             latest_avails = {}
             # Optimize availability lookup
             if 'Availability' in df.columns:
                 # Get last non-null availability for each employee
                 avail_df = df.sort_values('Date') if 'Date' in df.columns else df
-                latest_avails = avail_df.groupby('Name')['Availability'].last().to_dict()
+                latest_avails = avail_df.groupby('Name', observed=True)['Availability'].last().to_dict()
             
-            perf_summary['StatusCategory'] = perf_summary['Name'].map(latest_avails).fillna('Unknown')
+            perf_summary['StatusCategory'] = perf_summary['Name'].astype(object).map(latest_avails).fillna('Unknown')
             
             color_map = {
                 'Underutilized': '#10b981',
@@ -2276,13 +1680,12 @@ def show_employee_dashboard(df):
             buf = io.BytesIO()
             with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
                 for name in employees:
-                    emp_rows = df[df['Name'] == name].copy()
+                    emp_rows = df[df['Name'] == name]
                     if 'Date' in emp_rows.columns:
-                        emp_rows['Date'] = emp_rows['Date'].astype(str)
+                        emp_rows = emp_rows.assign(Date=emp_rows['Date'].astype(str))
                     # Ensure Availability is formatted in exported CSVs
                     if 'Availability' in emp_rows.columns:
-                        emp_rows_export = emp_rows.copy()
-                        emp_rows_export['Availability'] = emp_rows_export['Availability'].apply(format_availability_for_csv)
+                        emp_rows_export = emp_rows.assign(Availability=emp_rows['Availability'].apply(format_availability_for_csv))
                     else:
                         emp_rows_export = emp_rows
                     csv_bytes = emp_rows_export.to_csv(index=False).encode('utf-8-sig')
@@ -2305,7 +1708,7 @@ def show_employee_dashboard(df):
         return
     
     # Case-insensitive employee filtering to handle any name format variations
-    emp_df = df[df['Name'].str.strip().str.lower() == selected_employee.strip().lower()].copy()
+    emp_df = df[df['Name'].str.strip().str.lower() == selected_employee.strip().lower()]
     if emp_df.empty:
         st.warning(f"No records found for '{selected_employee}' in the selected date range. Try adjusting the filters or date range.")
         return
@@ -2392,14 +1795,13 @@ def show_employee_dashboard(df):
     col_export_individual = st.columns([5, 1])
     with col_export_individual[1]:
         # Prepare export data
-        export_df = emp_df.copy()
+        export_df = emp_df
         if 'Date' in export_df.columns:
-            export_df['Date'] = export_df['Date'].astype(str)
+            export_df = export_df.assign(Date=export_df['Date'].astype(str))
         export_df = export_df.sort_values('Date', ascending=False) if 'Date' in export_df.columns else export_df
         # Format Availability for CSV export
         if 'Availability' in export_df.columns:
-            export_df = export_df.copy()
-            export_df['Availability'] = export_df['Availability'].apply(format_availability_for_csv)
+            export_df = export_df.assign(Availability=export_df['Availability'].apply(format_availability_for_csv))
         csv_bytes = export_df.to_csv(index=False).encode('utf-8-sig')
         st.download_button(
             label=f"📥 Export",
@@ -2413,9 +1815,7 @@ def show_employee_dashboard(df):
 
         # Excel export with real cell fills based on Availability/Status
         try:
-            export_df_xlsx = emp_df.copy()
-            if 'Date' in export_df_xlsx.columns:
-                export_df_xlsx['Date'] = export_df_xlsx['Date'].astype(str)
+            export_df_xlsx = task_store.export_frame(emp_df)
             
             # Skip Excel export if no data
             if export_df_xlsx.empty:
@@ -2514,7 +1914,7 @@ def show_employee_dashboard(df):
     breakdown_col1, breakdown_col2 = st.columns(2)
     with breakdown_col1:
         if 'Task Status' in emp_df.columns:
-            status_counts = emp_df['Task Status'].value_counts()
+            status_counts = emp_df['Task Status'].value_counts().loc[lambda counts: counts > 0]
             if not status_counts.empty:
                 status_fig = px.pie(
                     values=status_counts.values,
@@ -2528,7 +1928,7 @@ def show_employee_dashboard(df):
             st.info("Task status column not available.")
     with breakdown_col2:
         if 'Task Priority' in emp_df.columns:
-            priority_counts = emp_df['Task Priority'].value_counts()
+            priority_counts = emp_df['Task Priority'].value_counts().loc[lambda counts: counts > 0]
             if not priority_counts.empty:
                 priority_fig = px.bar(
                     x=priority_counts.index,
@@ -2554,11 +1954,11 @@ def show_employee_dashboard(df):
     
     if available_cols:
         # Create display dataframe
-        display_df_emp = emp_df[available_cols].copy()
+        display_df_emp = emp_df[available_cols]
         
         # Format Date column if present
         if 'Date' in display_df_emp.columns:
-            display_df_emp['Date'] = display_df_emp['Date'].dt.strftime('%Y-%m-%d').fillna('N/A')
+            display_df_emp = display_df_emp.assign(Date=display_df_emp['Date'].dt.strftime('%Y-%m-%d').fillna('N/A'))
         
         st.dataframe(display_df_emp, use_container_width=True, height=320)
         
@@ -2588,13 +1988,12 @@ def show_data_table(df):
     with col2:
         rows_to_show = st.number_input("Rows", min_value=10, max_value=1000, value=50, step=10)
     
-    # Apply search first
-    display_df = df.copy()
+    # Filters narrow one row mask over the shared frame; rows are taken once at the end
+    mask = pd.Series(True, index=df.index)
     if search:
-        mask = display_df.astype(str).apply(
+        mask = df.astype(str).apply(
             lambda x: x.str.contains(search, case=False, na=False)
         ).any(axis=1)
-        display_df = display_df[mask]
     
     # Column Filters Section
     st.markdown("### 🔍 Column Filters")
@@ -2603,7 +2002,7 @@ def show_data_table(df):
     # Create expandable filters section
     with st.expander("📊 Show/Hide Column Filters", expanded=False):
         # Get all columns
-        columns = display_df.columns.tolist()
+        columns = df.columns.tolist()
         
         # Create filters in a grid layout (3 columns per row)
         num_cols = 3
@@ -2612,7 +2011,7 @@ def show_data_table(df):
             for j, col_name in enumerate(columns[i:i+num_cols]):
                 with cols[j]:
                     # Get unique values for this column (including blanks/NaN)
-                    unique_vals = display_df[col_name].dropna().astype(str).unique().tolist()
+                    unique_vals = df[col_name][mask].dropna().astype(str).unique().tolist()
                     unique_vals = sorted([v for v in unique_vals if v.strip() != ''])
                     
                     # Add "All" option at the beginning
@@ -2628,7 +2027,8 @@ def show_data_table(df):
                     
                     # Apply filter if not "All"
                     if selected != "All":
-                        display_df = display_df[display_df[col_name].astype(str) == selected]
+                        mask &= df[col_name].astype(str) == selected
+    display_df = df if mask.all() else df[mask]
     
     # Show filter results count
     if len(display_df) < len(df):
@@ -2655,9 +2055,9 @@ def show_data_table(df):
     # Download button
     if not display_df.empty:
         # CSV: keep emoji labels for readability
-        df_export_csv = display_df.copy()
+        df_export_csv = display_df
         if 'Availability' in df_export_csv.columns:
-            df_export_csv['Availability'] = df_export_csv['Availability'].apply(format_availability_for_csv)
+            df_export_csv = df_export_csv.assign(Availability=df_export_csv['Availability'].apply(format_availability_for_csv))
         csv_bytes = df_export_csv.to_csv(index=False).encode('utf-8-sig')
         st.download_button(
             label="📥 Download Data as CSV",
@@ -2667,7 +2067,7 @@ def show_data_table(df):
         )
 
         # Excel: apply real cell fills based on Availability/Status values
-        df_export_xlsx = display_df.copy()
+        df_export_xlsx = task_store.export_frame(display_df)
         status_col_name = None
         for candidate in ['Availability', 'Status']:
             if candidate in df_export_xlsx.columns:
@@ -2846,25 +2246,9 @@ def show_settings():
                 # Check 4: Try to write to the file (test write)
                 st.write("**4. Testing file write access...**")
                 try:
-                    # Save original data first
-                    original_df = df.copy() if df is not None and not df.empty else None
-                   
-                    # Try to open the file in write mode to check if it's locked
-                    # We'll write the original data back, so this is safe
-                    if original_df is not None:
-                        with pd.ExcelWriter(excel_path, engine='openpyxl', mode='w') as writer:
-                            original_df.to_excel(writer, index=False, sheet_name='Sheet1')
-                        st.success("✅ File write test successful! (Original data preserved)")
-                    else:
-                        # If file is empty, create a test write
-                        test_data = pd.DataFrame([{'Test': 'test'}])
-                        with pd.ExcelWriter(excel_path, engine='openpyxl', mode='w') as writer:
-                            test_data.to_excel(writer, index=False, sheet_name='Sheet1')
-                        # Remove test data
-                        empty_df = pd.DataFrame()
-                        with pd.ExcelWriter(excel_path, engine='openpyxl', mode='w') as writer:
-                            empty_df.to_excel(writer, index=False, sheet_name='Sheet1')
-                        st.success("✅ File write test successful!")
+                    # Opens the file for writing (fails if it is locked) without rewriting it
+                    task_store.check_write_access(excel_path)
+                    st.success("✅ File write test successful! (File left unchanged)")
                 except PermissionError as pe:
                     st.error(f"❌ **Permission Error**: Cannot write to file")
                     st.error(f" Error: {str(pe)}")
@@ -2957,26 +2341,13 @@ def show_submit_report():
     # Get work mode - try session state first, then fetch from attendance
     work_mode = st.session_state.get("work_mode", "")
     if not work_mode:
-        # Fetch from attendance records for today
+        # Fetch the most recent check-in for this employee today
         try:
-            from attendance_store import load_attendance
-            records = load_attendance()
-            today = datetime.now().date()
-            
-            # Find the most recent check-in for this employee today
-            for record in reversed(records):  # Start from most recent
-                if record.get("emp_id") == st.session_state.get("emp_id", ""):
-                    try:
-                        record_timestamp = record.get("timestamp")
-                        if record_timestamp:
-                            record_date = datetime.fromisoformat(record_timestamp.replace('Z', '+00:00')).date()
-                            if record_date == today:
-                                work_mode = record.get("status", "")
-                                # Store in session for consistency
-                                st.session_state.work_mode = work_mode
-                                break
-                    except:
-                        pass
+            record = latest_attendance(st.session_state.get("emp_id", ""))
+            if record:
+                work_mode = record.get("status", "")
+                # Store in session for consistency
+                st.session_state.work_mode = work_mode
         except Exception:
             pass
     
@@ -3143,11 +2514,12 @@ def show_submit_report():
                         # 'Employee Performance (%)' calculated below
                     })
            
-            # Calculate overall performance for the day using the new priority/effort formula
+            # Score the tasks with the active formula version (priority/effort by default)
             if task_data_list:
-                performance = calculate_performance(task_data_list)
-                for row in task_data_list:
+                score_version = scoring.get_formula().name
+                for row, performance in zip(task_data_list, scoring.score_rows(task_data_list, score_version)):
                     row['Employee Performance (%)'] = performance
+                    row[task_store.score_column(score_version)] = performance
             if invalid_tasks:
                 st.session_state.submitting_report = False  # Clear flag on validation error
                 st.error(f"❌ Please fill in all required fields for task(s): {', '.join(map(str, invalid_tasks))}")
@@ -3536,63 +2908,30 @@ def show_admin_attendance_dashboard():
     """
     #st.subheader("📊 Staff Attendance Dashboard")
 
-    from attendance_store import load_attendance, load_employees
+    from attendance_store import load_attendance_frame, load_employees, daily_attendance, with_employee_details
 
-    records = load_attendance()
+    records = load_attendance_frame()
     employees = load_employees()
+    today_summary = daily_attendance()
 
-    if not records:
+    if records.empty:
         st.info("No attendance records found.")
         return
 
-    # Build DataFrame
-    rows = []
-    for r in records:
-        emp = (r.get("emp_id") or "").upper()
-        meta = employees.get(emp, {}) if isinstance(employees, dict) else {}
-        ts = r.get("timestamp")
-        # Normalize timestamp into datetime where possible
-        try:
-            ts_dt = datetime.fromisoformat(ts) if isinstance(ts, str) else ts
-        except Exception:
-            try:
-                from dateutil import parser as _p
-                ts_dt = _p.isoparse(ts)
-            except Exception:
-                ts_dt = None
-        rows.append({
-            "emp_id": emp,
-            "name": meta.get("name", emp),
-            "department": meta.get("department", ""),
-            "role": meta.get("role", ""),
-            "status": r.get("status", "N/A"),
-            "check_in_time": r.get("check_in_time", None),
-            "timestamp": ts_dt,
-            "notes": r.get("notes", "")
-        })
-
-    df = pd.DataFrame(rows)
-    # Ensure timestamp is datetime
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-        df["date"] = df["timestamp"].dt.date
+    # Columnar frame: one vectorised timestamp parse and a merge with the directory
+    df = with_employee_details(records, employees)
 
-    # Top-level metrics for selected period
+    # Top-level metrics for today, from the precomputed daily summary
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        today = datetime.now().date()
-        today_df = df[df["date"] == today] if "date" in df.columns else pd.DataFrame()
-        total_checked_in = len(today_df["emp_id"].unique())
-        st.metric("Checked-in Today", total_checked_in)
+        st.metric("Checked-in Today", len(today_summary.latest))
     with col2:
-        wfo = int((today_df["status"] == "WFO").sum())
-        st.metric("In Office (WFO)", wfo)
+        st.metric("In Office (WFO)", today_summary.count("WFO"))
     with col3:
-        wfh = int((today_df["status"] == "WFH").sum())
-        st.metric("Remote (WFH)", wfh)
+        st.metric("Remote (WFH)", today_summary.count("WFH"))
     with col4:
-        leave = int((today_df["status"] == "On Leave").sum())
-        st.metric("On Leave", leave)
+        st.metric("On Leave", today_summary.count("On Leave"))
+    st.caption("Employees who checked in more than once today are counted once, under their latest status.")
 
     st.markdown("---")
 
@@ -3601,11 +2940,20 @@ def show_admin_attendance_dashboard():
         "Checked-in Today", "In Office", "Remote", "On Leave"
     ])
 
-    # Prepare today's lists
-    checked_df = today_df.copy() if not today_df.empty else pd.DataFrame()
-    # ensure timestamp string for display
-    if not checked_df.empty and "timestamp" in checked_df.columns:
-        checked_df["timestamp"] = checked_df["timestamp"].astype(str)
+    # Prepare today's lists (each employee's latest record today)
+    checked_df = pd.DataFrame([
+        {
+            "emp_id": emp,
+            "name": employees.get(emp, {}).get("name", emp),
+            "department": employees.get(emp, {}).get("department", ""),
+            "role": employees.get(emp, {}).get("role", ""),
+            "status": r.get("status", "N/A"),
+            "check_in_time": r.get("check_in_time", None),
+            "timestamp": str(r.get("timestamp") or ""),
+            "notes": r.get("notes", "")
+        }
+        for emp, r in today_summary.latest.items()
+    ])
 
     with tab_checked:
         st.markdown('<div style="background:#1e90ff;padding:8px;border-radius:6px;color:white;font-weight:600;">Checked-in Today</div>', unsafe_allow_html=True)
@@ -3664,13 +3012,11 @@ def show_admin_attendance_dashboard():
         emp_select = st.selectbox("Employee", ["All"] + sorted(df["name"].dropna().unique().tolist()))
 
     # Apply date range filter
-    mask = pd.Series([True] * len(df))
-    if "date" in df.columns:
-        mask = mask & (df["date"] >= start_date) & (df["date"] <= end_date)
+    mask = (df["date"] >= pd.Timestamp(start_date)) & (df["date"] <= pd.Timestamp(end_date))
     if emp_select != "All":
         mask = mask & (df["name"] == emp_select)
 
-    df_period = df[mask].copy()
+    df_period = df[mask]
 
     if df_period.empty:
         st.info("No attendance data for the selected filters.")
@@ -3763,40 +3109,45 @@ def show_admin_employees():
                 st.error("Please fill in all required fields (ID, Name, Password)")
 
 def show_admin_performance():
-    """Admin view of employee performance analytics"""
+    """Admin view of employee performance analytics
+    Reads the daily (date, employee) rollup, so the cost scales with
+    employees x days rather than with the number of task rows.
+    """
     st.subheader("📈 Performance Analytics")
     
     excel_path = EXCEL_FILE_PATH
-    df = read_excel_data(excel_path)
+    try:
+        rollup = task_store.load_daily_rollup(excel_path)
+    except Exception as error:
+        st.error(f"Error reading task data: {error}")
+        return
     
-    if df is None or df.empty:
+    if rollup.empty:
         st.info("No performance data available yet.")
         return
     
-    df = ensure_numeric_columns(df)
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    total_tasks = int(rollup['Tasks'].sum())
+    named = rollup[rollup['Name'] != '']
     
     # Overall metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Submissions", len(df))
+        st.metric("Total Submissions", total_tasks)
     with col2:
-        completed = int((df.get('Task Status') == 'Completed').sum()) if 'Task Status' in df.columns else 0
-        st.metric("Completed Tasks", completed)
+        st.metric("Completed Tasks", int(rollup['Completed'].sum()))
     with col3:
-        unique_employees = df['Name'].nunique() if 'Name' in df.columns else 0
-        st.metric("Active Employees", unique_employees)
+        st.metric("Active Employees", named['Name'].nunique())
     with col4:
-        avg_perf = round(df['Employee Performance (%)'].mean(), 2) if 'Employee Performance (%)' in df.columns else 0
+        avg_perf = round(rollup['Performance Sum'].sum() / total_tasks, 2) if total_tasks else 0
         st.metric("Avg Performance", f"{avg_perf}%")
     
     st.markdown("---")
     
     # Performance by employee
-    if 'Name' in df.columns and 'Employee Performance (%)' in df.columns:
+    if not named.empty:
         st.markdown("**Performance by Employee**")
-        perf_by_emp = df.groupby('Name')['Employee Performance (%)'].mean().sort_values(ascending=False)
+        per_employee = named.groupby('Name')[['Performance Sum', 'Tasks']].sum()
+        perf_by_emp = (per_employee['Performance Sum'] / per_employee['Tasks']).sort_values(ascending=False)
         
         fig = px.bar(
             x=perf_by_emp.index,
@@ -3830,6 +3181,35 @@ def show_admin_settings():
             help="Time to send daily reminders"
         )
         
+        current_build_mode = config.get('dashboard_build_mode', dashboard_worker.DEFAULT_BUILD_MODE)
+        dashboard_build_mode = st.selectbox(
+            "Dashboard Build Mode",
+            dashboard_worker.BUILD_MODES,
+            index=dashboard_worker.BUILD_MODES.index(current_build_mode)
+            if current_build_mode in dashboard_worker.BUILD_MODES else 0,
+            help="'incremental' patches only changed employee sheets; "
+                 "'streaming' rewrites the whole workbook with low memory use (large histories)"
+        )
+        
+        current_reader = config.get('excel_reader_engine', excel_reader.AUTO_ENGINE)
+        reader_engine = st.selectbox(
+            "Excel Reader Engine",
+            excel_reader.ENGINES,
+            index=excel_reader.ENGINES.index(current_reader) if current_reader in excel_reader.ENGINES else 0,
+            help=f"'auto' uses the fastest installed engine (installed: {', '.join(excel_reader.available_engines())}); "
+                 "missing engines fall back to openpyxl"
+        )
+        
+        score_versions = sorted(scoring.FORMULAS)
+        current_score_version = config.get('score_version', task_store.DEFAULT_SCORE_VERSION)
+        score_version = st.selectbox(
+            "Performance Formula",
+            score_versions,
+            index=score_versions.index(current_score_version) if current_score_version in score_versions else 0,
+            format_func=lambda name: f"{name} - {scoring.FORMULAS[name].description}",
+            help="Formula used to score new reports. Recompute scores below to apply it to the history."
+        )
+        
         st.markdown("**Email Configuration**")
         admin_email = st.text_input(
             "Admin Email",
@@ -3847,6 +3227,9 @@ def show_admin_settings():
         if st.form_submit_button("Save Settings", use_container_width=True):
             config['excel_file_path'] = excel_path
             config['reminder_time'] = reminder_time.strftime('%H:%M')
+            config['dashboard_build_mode'] = dashboard_build_mode
+            config['score_version'] = score_version
+            config['excel_reader_engine'] = reader_engine
             config['admin_email'] = admin_email
             config['employee_emails'] = [
                 email.strip() for email in employee_emails_text.split('\n') if email.strip()
@@ -3854,6 +3237,62 @@ def show_admin_settings():
             save_config(config)
             st.success("✅ Settings saved successfully!")
 
+    st.markdown("---")
+    st.markdown("**Performance Scores**")
+    active_version = scoring.get_formula().name
+    st.caption(
+        f"Dashboards show precomputed '{active_version}' scores. "
+        "Recompute after changing the formula to re-score the full history."
+    )
+    if st.button("🔁 Recompute Scores", key="recompute_scores_btn"):
+        with st.spinner(f"Re-scoring task history with '{active_version}'..."):
+            try:
+                scored = scoring.recompute_scores(config.get('excel_file_path', EXCEL_FILE_PATH), active_version)
+                st.success(f"✅ Recomputed '{active_version}' scores for {scored} task rows")
+            except Exception as error:
+                st.error(f"❌ Failed to recompute scores: {error}")
+
+    st.markdown("---")
+    st.markdown("**Task Workbook Export**")
+    st.caption(
+        f"Reports are stored in the '{task_store.configured_backend_name()}' task store. "
+        "The Excel workbook and its dashboard sheets are rebuilt in the background "
+        "shortly after new reports arrive; export forces a rebuild now."
+    )
+    export_path = config.get('excel_file_path', EXCEL_FILE_PATH)
+    worker_status = dashboard_worker.get_status(export_path)
+    status_col1, status_col2, status_col3 = st.columns(3)
+    with status_col1:
+        last_build_at = worker_status['last_build_at']
+        st.metric(
+            "Last Dashboard Build",
+            last_build_at.strftime('%Y-%m-%d %H:%M:%S') if last_build_at else "Not yet"
+        )
+    with status_col2:
+        st.metric("Pending Changes", worker_status['pending_changes'])
+    with status_col3:
+        if worker_status['building']:
+            st.metric("Worker", "Building...")
+        else:
+            st.metric("Builds Since Restart", worker_status['builds_completed'])
+    if worker_status['last_build_seconds'] is not None:
+        st.caption(
+            f"Last build took {worker_status['last_build_seconds']}s "
+            f"({worker_status['last_build_mode'] or 'skipped'}, {worker_status['last_build_rows'] or 0} records)"
+        )
+    if worker_status['last_error']:
+        st.warning(f"⚠️ Last background rebuild failed: {worker_status['last_error']}")
+    cache = task_store.cache_stats()
+    st.caption(f"Task data cache: {cache['hits']} hits / {cache['misses']} misses")
+
+    if st.button("📤 Export Excel Workbook", use_container_width=True):
+        with st.spinner("Exporting workbook..."):
+            try:
+                exported_rows = export_task_workbook(export_path)
+                st.success(f"✅ Exported {exported_rows} records to `{export_path}`")
+            except Exception as e:
+                st.error(f"❌ Workbook export failed: {str(e)}")
+
     if JIRA_UI_AVAILABLE:
         st.markdown("---")
         # Get updated config from settings panel
@@ -3872,16 +3311,87 @@ def render_full_performance_dashboard():
     if df.empty:
         st.info("📋 No data available yet. Start submitting reports to see data here.")
         return
-    show_metrics(df)
+    # Headline numbers and chart aggregates come from the daily rollup
+    try:
+        full_rollup = task_store.load_daily_rollup(excel_path)
+    except Exception as error:
+        logging.warning(f"Could not read daily rollup, using raw rows: {error}")
+        full_rollup = None
+    show_metrics(df, rollup=full_rollup)
     st.markdown("---")
     # Move Recent Submissions above Filters
     show_data_table(df)
     st.markdown("---")
-    filtered_df = show_filters(df)
+    filtered_df = show_filters(df, excel_path)
+    filtered_rollup = rollup_for_filters(excel_path, st.session_state.get('dashboard_filters'))
     st.markdown("---")
-    show_charts(filtered_df)
+    show_charts(filtered_df, rollup=filtered_rollup)
     st.markdown("---")
-    show_employee_dashboard(filtered_df if filtered_df is not None and not filtered_df.empty else df)
+    # Derived caches key on the store's data version plus the filter selection
+    version = task_store.data_version(excel_path)
+    if filtered_df is not None and not filtered_df.empty:
+        filters = st.session_state.get('dashboard_filters', {})
+        data_key = ('store', excel_path, version) + tuple(sorted((key, str(value)) for key, value in filters.items()))
+        show_employee_dashboard(filtered_df, rollup=filtered_rollup, data_key=data_key)
+    else:
+        show_employee_dashboard(df, rollup=full_rollup, data_key=('store', excel_path, version))
+    st.markdown("---")
+    show_what_if_panel(excel_path)
+
+def show_what_if_panel(excel_path):
+    """What-if scoring: re-rank employees with adjusted priority weights and status credit
+    Backed by the cached per-employee feature matrix (scoring.feature_matrix), so
+    every slider change is a single matrix-vector product over the full history.
+    """
+    with st.expander("🧪 What-if Scoring", expanded=False):
+        st.caption("Try different priority weights and status credit to see how scores and rankings change.")
+        try:
+            features = scoring.feature_matrix(excel_path)
+        except Exception as error:
+            st.error(f"❌ Could not load task history for what-if scoring: {error}")
+            return
+        if len(features.employees) == 0:
+            st.info("No employee data available yet.")
+            return
+        
+        st.markdown("**Priority Weights**")
+        weight_cols = st.columns(len(scoring.PRIORITY_LEVELS))
+        priority_weights = []
+        for col, level in zip(weight_cols, scoring.PRIORITY_LEVELS):
+            with col:
+                priority_weights.append(st.slider(
+                    level, min_value=0.0, max_value=10.0, step=0.5,
+                    value=float(scoring.SUBMISSION_PRIORITY_WEIGHTS[level]),
+                    key=f"what_if_weight_{level}"
+                ))
+        
+        st.markdown("**Status Credit**")
+        status_cols = st.columns(len(scoring.STATUS_CLASS_NAMES))
+        status_multipliers = []
+        for col, status_name, default in zip(status_cols, scoring.STATUS_CLASS_NAMES, scoring.EMPLOYEE_STATUS_MULTIPLIERS):
+            with col:
+                status_multipliers.append(st.slider(
+                    status_name.replace('_', ' ').title(), min_value=0.0, max_value=1.0, step=0.05,
+                    value=float(default), key=f"what_if_status_{status_name}"
+                ))
+        
+        rank_by = st.radio(
+            "Rank by", ['Weighted Credit (%)', 'Priority per Hour (%)'],
+            horizontal=True, key="what_if_rank_by"
+        )
+        
+        started = time.perf_counter()
+        baseline = (
+            [scoring.SUBMISSION_PRIORITY_WEIGHTS[level] for level in scoring.PRIORITY_LEVELS],
+            scoring.EMPLOYEE_STATUS_MULTIPLIERS
+        )
+        results = scoring.what_if_scores(features, priority_weights, status_multipliers, rank_by, baseline)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        st.dataframe(results, use_container_width=True, hide_index=True, height=400)
+        st.caption(
+            f"Re-scored {len(results)} employees over {int(features.tasks.sum())} tasks in {elapsed_ms:.1f} ms"
+        )
 
 def _build_work_context():
     config = load_config()
@@ -3905,32 +3415,11 @@ def _build_work_context():
         ]
     try:
         import attendance_store
-        records = attendance_store.load_attendance()
-        today = datetime.now().date()
-        present = 0
-        wfo_c = 0
-        wfh_c = 0
-        leave_c = 0
-        seen = set()
-        for r in records:
-            ts = r.get('timestamp')
-            try:
-                ts_dt = datetime.fromisoformat(ts) if isinstance(ts, str) else ts
-            except Exception:
-                ts_dt = None
-            if ts_dt and ts_dt.date() == today:
-                emp = (r.get('emp_id') or '').upper()
-                if emp:
-                    if emp not in seen:
-                        present += 1
-                        seen.add(emp)
-                    stt = r.get('status')
-                    if stt == 'WFO':
-                        wfo_c += 1
-                    elif stt == 'WFH':
-                        wfh_c += 1
-                    elif stt == 'On Leave':
-                        leave_c += 1
+        today = attendance_store.daily_attendance()
+        present = len(today.latest)
+        wfo_c = today.count('WFO')
+        wfh_c = today.count('WFH')
+        leave_c = today.count('On Leave')
         lines.append(f"Today's check-ins: {present}, WFO={wfo_c}, WFH={wfh_c}, Leave={leave_c}")
         total_emps = len(attendance_store.load_employees() or {})
         ratio = round((present/total_emps*100) if total_emps else 0, 1)
@@ -4264,6 +3753,10 @@ def show_import_reports():
     # Initialize session state for imported data
     if 'imported_data' not in st.session_state:
         st.session_state.imported_data = None
+    # Renewed whenever the imported data changes; keys the caches below
+    if 'import_version' not in st.session_state:
+        st.session_state.import_version = task_store.next_import_version()
+        st.session_state.import_file_id = None
     
     # Header with Refresh button
     col_header1, col_header2 = st.columns([4, 1])
@@ -4272,6 +3765,8 @@ def show_import_reports():
     with col_header2:
         if st.button("🔄 Refresh", use_container_width=True, help="Clear all imported data"):
             st.session_state.imported_data = None
+            st.session_state.import_version = task_store.next_import_version()
+            st.session_state.import_file_id = None
             st.success("✅ Import data cleared!")
             st.rerun()
     
@@ -4331,11 +3826,15 @@ def show_import_reports():
         
         # Store in session state
         st.session_state.imported_data = df
+        upload_id = getattr(uploaded_file, 'file_id', None) or (file_name, len(file_bytes))
+        if upload_id != st.session_state.import_file_id:
+            st.session_state.import_file_id = upload_id
+            st.session_state.import_version = task_store.next_import_version()
         
         # Calculate Employee Performance (%) if missing
         if 'Employee Performance (%)' not in df.columns or df['Employee Performance (%)'].isna().all():
             st.info("📊 Calculating Employee Performance (%) based on Task Priority and Status...")
-            df['Employee Performance (%)'] = df.apply(calculate_task_performance, axis=1)
+            df['Employee Performance (%)'] = scoring.task_scores(df)
             st.session_state.imported_data = df
         
         st.success(f"✅ Successfully loaded **{len(df)} records** from {uploaded_file.name}")
@@ -4371,12 +3870,12 @@ def show_import_reports():
             rows_to_show = st.number_input("Rows", min_value=10, max_value=1000, value=50, step=10, key="import_rows")
         
         # Apply search
-        display_df = df.copy()
+        display_df = df
         if search:
-            mask = display_df.astype(str).apply(
+            mask = df.astype(str).apply(
                 lambda x: x.str.contains(search, case=False, na=False)
             ).any(axis=1)
-            display_df = display_df[mask]
+            display_df = df[mask]
         
         # Show results count
         if len(display_df) < len(df):
@@ -4406,26 +3905,25 @@ def show_import_reports():
         st.markdown("---")
         
         # Employee Performance Explorer - now with full unfiltered data
-        show_employee_dashboard(df)
+        show_employee_dashboard(df, data_key=('import', st.session_state.import_version))
         
         st.markdown("---")
         
         # ADDITIONAL: Resource Utilization Summary from import logic
         st.markdown("### 💼 Resource Utilization Summary")
         
-        # Cached resource metrics calculation
+        # Cached resource metrics calculation, keyed by the import version
         @st.cache_data(ttl=1800)
-        def calculate_resource_metrics_cached(df_hash, df_json):
+        def calculate_resource_metrics_cached(import_version, _df):
             """Cache expensive resource calculations"""
-            df_temp = pd.read_json(df_json)
-            overall_metrics = calculate_overall_metrics(df_temp)
-            resource_metrics = calculate_resource_utilization(df_temp)
+            overall_metrics = calculate_overall_metrics(_df)
+            resource_metrics = calculate_resource_utilization(_df)
             return overall_metrics, resource_metrics
         
         try:
-            df_hash = get_dataframe_hash(df)
-            df_json = df.to_json()
-            overall_metrics, resource_metrics = calculate_resource_metrics_cached(df_hash, df_json)
+            overall_metrics, resource_metrics = calculate_resource_metrics_cached(
+                st.session_state.import_version, df
+            )
             
             col1, col2, col3 = st.columns(3)
             
@@ -4597,29 +4095,28 @@ To enable automated reminders:
         st.subheader("🧪 Test Reminder")
         if st.button("Check Missing Reports Today"):
             with st.spinner("Checking..."):
-                df = read_excel_data(excel_path)
+                today = datetime.now()
+                df = read_excel_data(excel_path, date_from=today, date_to=today, columns=['Date', 'Emp Id'])
                 if df is not None:
-                    missing_emails = get_missing_reporters(df, datetime.now())
+                    missing_emails = get_missing_reporters(df, today)
                     
                     if missing_emails:
-                        # Load full employee details from employees.json
+                        # Look up full employee details by email
                         try:
-                            with open('employees.json', 'r') as f:
-                                employees_data = json.load(f)
+                            import attendance_store
                             
                             # Build detailed list
                             missing_details = []
                             for email in missing_emails:
-                                for emp_id, emp_info in employees_data.items():
-                                    if emp_info.get('email', '').lower() == email.lower():
-                                        missing_details.append({
-                                            'Employee ID': emp_id,
-                                            'Name': emp_info.get('name', ''),
-                                            'Email': emp_info.get('email', ''),
-                                            'Department': emp_info.get('department', ''),
-                                            'Role': emp_info.get('role', '')
-                                        })
-                                        break
+                                emp_id, emp_info = attendance_store.find_employee_by_email(email)
+                                if emp_id:
+                                    missing_details.append({
+                                        'Employee ID': emp_id,
+                                        'Name': emp_info.get('name', ''),
+                                        'Email': emp_info.get('email', ''),
+                                        'Department': emp_info.get('department', ''),
+                                        'Role': emp_info.get('role', '')
+                                    })
                             
                             if missing_details:
                                 st.warning(f"📋 {len(missing_details)} employees haven't reported today:")
@@ -4688,6 +4185,8 @@ To enable automated reminders:
 # Main App
 def main():
     """Main application"""
+    # Replay reports a crashed process logged but never saved (once per process)
+    submission_queue.recover(load_config().get('excel_file_path', EXCEL_FILE_PATH))
     # Initialize session state for login
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
@@ -11,6 +11,8 @@ import pandas as pd
 import os
 import requests
 
+import task_store
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +30,8 @@ WHATSAPP_CONFIG_FILE = 'whatsapp_config.json'
 TELEGRAM_CONFIG_FILE = 'telegram_config.json'
 TEAMS_CONFIG_FILE = 'teams_config.json'
 EXCEL_FILE_PATH = r'D:\Employee Track Report\task_tracker.xlsx'
+# All get_missing_reporters needs from the task store
+REPORT_CHECK_COLUMNS = ['Date', 'Emp Id', 'Name']
 
 # ==================== Configuration Management ====================
 
@@ -116,44 +120,45 @@ def save_telegram_config(config):
 
 # ==================== Excel File Functions ====================
 
-def read_excel_data(excel_path=None):
-    """Read data from local Excel file"""
+def read_excel_data(excel_path=None, date_from=None, date_to=None, columns=None):
+    """Read task data through the configured task store (optionally only a date range / some columns)"""
     if excel_path is None:
         config = load_config()
         excel_path = config.get('excel_file_path', EXCEL_FILE_PATH)
     
     try:
-        if not os.path.exists(excel_path):
+        if task_store.configured_backend_name() == 'excel' and not os.path.exists(excel_path):
+            # Not "nobody reported": the caller must not remind everyone
             logging.warning(f"Excel file not found at {excel_path}")
-            return pd.DataFrame()
+            return None
         
-        # Read Excel file
-        df = pd.read_excel(excel_path, engine='openpyxl')
+        df = task_store.load_tasks(excel_path, date_from=date_from, date_to=date_to, columns=columns)
         
-        # Handle empty file
+        # Handle empty store
         if df.empty:
             return pd.DataFrame()
         
         return df
     
     except Exception as error:
-        logging.error(f"Error reading Excel file: {error}")
+        logging.error(f"Error reading task data: {error}")
         return None
 
 def get_missing_reporters(df, today):
-    """Get list of employees who haven't reported today"""
-    if df is None or df.empty:
+    """Get list of employees who haven't reported today (df only needs today's rows)"""
+    if df is None:
         logging.warning("No data available")
         return []
 
     today_str = today.strftime('%Y-%m-%d')
 
     # Filter today's submissions (create a copy to avoid modifying original)
-    if 'Date' in df.columns:
-        # Convert Date column to string for comparison
-        df_copy = df.copy()
-        df_copy['Date'] = pd.to_datetime(df_copy['Date']).dt.strftime('%Y-%m-%d')
-        today_submissions = df_copy[df_copy['Date'] == today_str]
+    if df.empty:
+        submitted_employees = []
+    elif 'Date' in df.columns:
+        # Task store frames carry datetimes already; compare as 'YYYY-MM-DD'
+        date_str = task_store.task_dates(df).dt.strftime('%Y-%m-%d')
+        today_submissions = df[date_str == today_str]
         submitted_employees = today_submissions['Name'].unique().tolist() if 'Name' in today_submissions.columns else []
     else:
         logging.warning("Date column not found in data")
@@ -376,7 +381,8 @@ def check_and_send_reminders():
     
     # Read data from Excel file
     logging.info(f"Reading Excel data from {excel_path}...")
-    df = read_excel_data(excel_path)
+    # Only who reported today matters here
+    df = read_excel_data(excel_path, date_from=today, date_to=today, columns=REPORT_CHECK_COLUMNS)
     
     if df is None:
         logging.error("Failed to read Excel data")
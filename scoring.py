@@ -0,0 +1,500 @@
+"""
+Task scoring engine: named, versioned performance formulas.
+
+The app used to carry three separate formulas: ``calculate_performance``
+(priority weight / effort, stored at submit time), ``calculate_task_performance``
+(priority x status, for imported reports) and ``calculate_performance_from_priority``
+(priority-weighted status credit per employee). They are all defined here.
+
+Per-row formulas are registered under a version name in ``FORMULAS``. The
+active version (``score_version`` in config.json) scores new submissions, and
+``recompute_scores`` re-scores the whole stored history in parallel chunks
+whenever weights change, writing a ``Score [<version>]`` column to the task
+store. Dashboards read those stored scores through
+``task_store.load_tasks``/``load_daily_rollup`` instead of recomputing them.
+
+Everything is vectorised. Keyword matching runs once per distinct
+priority/status value (``pd.factorize`` codes) and scores are gathered with
+array lookups. The numbers match the former row-by-row code exactly:
+rounding uses Python's ``round`` on each distinct value, and sums use
+sequential ``cumsum`` so floating point accumulates in row order.
+
+Usage:
+    python scoring.py list
+    python scoring.py recompute [--version submission_v1] [--workers 4] [excel_path]
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import task_store
+
+# Base score per priority; unknown priorities score as Medium
+PRIORITY_SCORES = {
+    'Critical': 100,
+    'High': 75,
+    'Medium': 50,
+    'Low': 25
+}
+DEFAULT_PRIORITY = 'Medium'
+
+# Priority weights of the submit-time priority/effort formula
+SUBMISSION_PRIORITY_WEIGHTS = {
+    'Low': 1,
+    'Medium': 2,
+    'High': 3,
+    'Critical': 4
+}
+
+COMPLETED_KEYWORDS = ('complet', 'done', 'finish', 'closed')
+IN_PROGRESS_KEYWORDS = ('progress', 'ongoing', 'working', 'active', 'started')
+
+# Status classes (index into the multiplier tuples below)
+COMPLETED, IN_PROGRESS, PENDING = 0, 1, 2
+STATUS_CLASS_NAMES = ('completed', 'in_progress', 'pending')
+
+# Multipliers per status class for a single task score (import reports)
+TASK_STATUS_MULTIPLIERS = (1.0, 0.65, 0.30)
+# Multipliers per status class for an employee's priority-weighted score
+EMPLOYEE_STATUS_MULTIPLIERS = (1.0, 0.5, 0.3)
+
+# Employees with nothing completed or in progress still score this much
+MIN_ASSIGNED_SCORE = 30.0
+
+# Histories smaller than this are recomputed in-process
+MIN_PARALLEL_ROWS = 50_000
+
+
+def priority_score(priority) -> int:
+    """Base score of one Task Priority value (case-insensitive)."""
+    return PRIORITY_SCORES.get(str(priority).strip().title(), PRIORITY_SCORES[DEFAULT_PRIORITY])
+
+
+def status_class(status) -> int:
+    """COMPLETED, IN_PROGRESS or PENDING for one Task Status value (keyword match)."""
+    status = str(status).lower().strip()
+    if any(keyword in status for keyword in COMPLETED_KEYWORDS):
+        return COMPLETED
+    if any(keyword in status for keyword in IN_PROGRESS_KEYWORDS):
+        return IN_PROGRESS
+    return PENDING
+
+
+def _column(df: pd.DataFrame, column, default) -> pd.Series:
+    """df[column], or a constant column like ``row.get(column, default)`` would give."""
+    if column in df.columns:
+        return df[column]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _map_distinct(values: pd.Series, func, dtype=np.int64) -> np.ndarray:
+    """Apply a scalar function once per distinct value and broadcast it back."""
+    codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=True)
+    mapped = np.array([func(value) for value in uniques] + [func(np.nan)], dtype=dtype)
+    # code -1 (missing) picks the trailing entry, like str(nan) did row by row
+    return mapped[codes]
+
+
+def priority_scores(df: pd.DataFrame, scores=None, default=DEFAULT_PRIORITY) -> np.ndarray:
+    """Base score per row from the Task Priority column (title-cased lookup)."""
+    if scores is None:
+        return _map_distinct(_column(df, 'Task Priority', DEFAULT_PRIORITY), priority_score)
+    fallback = scores.get(default, 0)
+    return _map_distinct(
+        _column(df, 'Task Priority', DEFAULT_PRIORITY),
+        lambda priority: scores.get(str(priority).strip().title(), fallback),
+        dtype=np.float64
+    )
+
+
+def status_classes(df: pd.DataFrame) -> np.ndarray:
+    """Status class per row from the Task Status column."""
+    return _map_distinct(_column(df, 'Task Status', ''), status_class)
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    """Left-to-right float sum (np.sum is pairwise and can differ in the last bit)."""
+    return float(np.cumsum(values)[-1]) if len(values) else 0.0
+
+
+# ==================== FORMULAS ====================
+
+class ScoringFormula:
+    """A named per-row performance formula. ``score(df)`` returns one score per row."""
+
+    name = None
+    description = ''
+    # Rows sharing these column values must be scored together (recompute chunks)
+    group_columns = ()
+    # The stored history must have these columns to be re-scored (recompute_scores)
+    recompute_columns = ()
+
+    def score(self, df: pd.DataFrame) -> np.ndarray:
+        raise NotImplementedError
+
+
+class TaskStatusFormula(ScoringFormula):
+    """Per task: priority base score x status multiplier, rounded to 2 decimals."""
+
+    def __init__(self, name, priority_scores=None, status_multipliers=TASK_STATUS_MULTIPLIERS,
+                 description=''):
+        self.name = name
+        self.priority_scores = dict(PRIORITY_SCORES if priority_scores is None else priority_scores)
+        self.status_multipliers = tuple(status_multipliers)
+        self.description = description
+
+    def score(self, df: pd.DataFrame) -> np.ndarray:
+        if df.empty:
+            return np.zeros(0)
+        bases = priority_scores(df, self.priority_scores)
+        classes = status_classes(df)
+        base_values, base_index = np.unique(bases, return_inverse=True)
+        # round() per (base, class) pair, exactly as the scalar version rounds
+        table = np.array([
+            [round(base * multiplier, 2) for multiplier in self.status_multipliers]
+            for base in base_values.tolist()
+        ])
+        return table[base_index, classes]
+
+
+class SubmissionEffortFormula(ScoringFormula):
+    """
+    Per submission: (sum of priority weights / total effort hours) x 100,
+    capped at 100. Every task of the submission gets the same score.
+    """
+
+    # A submission is one employee's report for one day (and one stored submission)
+    group_columns = ('Date', 'Emp Id', 'Name')
+    # Without the submission key a whole day of reports would be scored as one submission
+    recompute_columns = ('Submission Id',)
+
+    def __init__(self, name, priority_weights=None, default_weight=1, cap=100.0, description=''):
+        self.name = name
+        self.priority_weights = dict(SUBMISSION_PRIORITY_WEIGHTS if priority_weights is None else priority_weights)
+        self.default_weight = default_weight
+        self.cap = cap
+        self.description = description
+
+    def score(self, df: pd.DataFrame) -> np.ndarray:
+        if df.empty:
+            return np.zeros(0)
+        weights = _map_distinct(
+            _column(df, 'Task Priority', 'Low'),
+            lambda priority: self.priority_weights.get(priority, self.default_weight),
+            dtype=np.float64
+        )
+        efforts = pd.to_numeric(_column(df, 'Effort (in hours)', 0), errors='coerce').fillna(0.0)
+        efforts = efforts.astype('float64').to_numpy()
+
+        keys = [col for col in self.group_columns + ('Submission Id',) if col in df.columns]
+        if keys:
+            group_ids = df.groupby(keys, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+        else:
+            group_ids = np.zeros(len(df), dtype=np.int64)
+        # Sequential per-group sums, so totals accumulate in submission order
+        by_group = pd.DataFrame({'group': group_ids, 'weight': weights, 'effort': efforts})
+        running = by_group.groupby('group', sort=True)[['weight', 'effort']].cumsum()
+        totals = running.groupby(group_ids).last()
+
+        group_scores = np.array([
+            0.0 if effort == 0 else min(round((weight / effort) * 100, 2), self.cap)
+            for weight, effort in zip(totals['weight'].tolist(), totals['effort'].tolist())
+        ])
+        return group_scores[np.searchsorted(totals.index.to_numpy(), group_ids)]
+
+
+FORMULAS = {}
+
+
+def register_formula(formula: ScoringFormula) -> ScoringFormula:
+    """Make a formula available under its version name (overwrites an existing one)."""
+    task_store.score_column(formula.name)  # validates the version name
+    FORMULAS[formula.name] = formula
+    return formula
+
+
+register_formula(SubmissionEffortFormula(
+    task_store.DEFAULT_SCORE_VERSION,
+    description="Priority weight (Low=1 .. Critical=4) per effort hour, per daily submission"
+))
+register_formula(TaskStatusFormula(
+    'task_status_v1',
+    description="Priority base score (Low=25 .. Critical=100) x status credit, per task"
+))
+
+
+def get_formula(version=None) -> ScoringFormula:
+    """Registered formula for a version name; the configured one by default."""
+    if version is None:
+        version = task_store.configured_score_version()
+        if version not in FORMULAS:
+            logging.warning(f"Unknown score_version '{version}', using '{task_store.DEFAULT_SCORE_VERSION}'")
+            version = task_store.DEFAULT_SCORE_VERSION
+    try:
+        return FORMULAS[version]
+    except KeyError:
+        raise ValueError(f"Unknown score version '{version}'. Known: {', '.join(sorted(FORMULAS))}") from None
+
+
+def score_rows(rows, version=None) -> list:
+    """Scores for a list of submitted task rows (dicts keyed by DATA_COLUMNS)."""
+    if not rows:
+        return []
+    return get_formula(version).score(pd.DataFrame(rows)).tolist()
+
+
+def task_scores(df: pd.DataFrame) -> np.ndarray:
+    """
+    Per-task performance (0-100): priority base score x status multiplier,
+    rounded to 2 decimals (the former per-row calculate_task_performance).
+    """
+    return FORMULAS['task_status_v1'].score(df)
+
+
+# ==================== EMPLOYEE SCORES ====================
+
+def score_employee(emp_df: pd.DataFrame) -> dict:
+    """
+    Priority-weighted performance of one employee's tasks.
+
+    Returns {'avg_performance', 'completed', 'in_progress', 'pending'}; the
+    score is (sum of weight x status multiplier) / (sum of weights) x 100,
+    with a floor of MIN_ASSIGNED_SCORE when nothing has started.
+    """
+    if emp_df.empty:
+        return {'avg_performance': 0.0, 'completed': 0, 'in_progress': 0, 'pending': 0}
+    weights = priority_scores(emp_df)
+    classes = status_classes(emp_df)
+    multipliers = np.array(EMPLOYEE_STATUS_MULTIPLIERS)[classes]
+
+    total_weighted_score = _sequential_sum(weights * multipliers)
+    total_possible_score = int(weights.sum())
+    counts = np.bincount(classes, minlength=len(STATUS_CLASS_NAMES))
+    return _employee_result(total_weighted_score, total_possible_score, counts)
+
+
+def score_employees(df: pd.DataFrame, by='Name') -> pd.DataFrame:
+    """
+    score_employee for every group of ``by`` at once.
+
+    Returns one row per employee (index ``by``) with avg_performance and the
+    completed / in_progress / pending task counts.
+    """
+    columns = ['avg_performance'] + list(STATUS_CLASS_NAMES)
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    weights = priority_scores(df)
+    classes = status_classes(df)
+    frame = pd.DataFrame({
+        'key': df[by].to_numpy(),
+        'weighted': weights * np.array(EMPLOYEE_STATUS_MULTIPLIERS)[classes],
+        'weight': weights,
+        'status': classes,
+    })
+    grouped = frame.groupby('key', sort=True, dropna=True)
+    # cumsum keeps the per-employee row order of the sums
+    weighted_totals = frame['weighted'].groupby(frame['key'], dropna=True).cumsum().groupby(frame['key']).last()
+    possible_totals = grouped['weight'].sum()
+    counts = pd.crosstab(frame['key'], frame['status']).reindex(columns=range(len(STATUS_CLASS_NAMES)), fill_value=0)
+
+    records = {
+        key: _employee_result(weighted_totals[key], int(possible_totals[key]), counts.loc[key].to_numpy())
+        for key in possible_totals.index
+    }
+    result = pd.DataFrame.from_dict(records, orient='index', columns=columns)
+    result.index.name = by
+    return result
+
+
+def _employee_result(total_weighted_score, total_possible_score, counts) -> dict:
+    if total_possible_score > 0:
+        avg_performance = round((total_weighted_score / total_possible_score) * 100, 2)
+    else:
+        avg_performance = 0.0
+    if counts[COMPLETED] == 0 and counts[IN_PROGRESS] == 0:
+        avg_performance = max(avg_performance, MIN_ASSIGNED_SCORE)
+    return {
+        'avg_performance': avg_performance,
+        **{name: int(counts[idx]) for idx, name in enumerate(STATUS_CLASS_NAMES)},
+    }
+
+
+# ==================== WHAT-IF ====================
+
+PRIORITY_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+
+_feature_cache = {}
+_feature_cache_lock = threading.Lock()
+
+
+class FeatureMatrix:
+    """
+    Per-employee task counts by (priority level, status class) plus effort
+    totals, so any set of weights re-scores every employee with one
+    matrix-vector product instead of a pass over the task rows.
+
+    Priorities are matched case-insensitively; unknown ones count as Medium.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        names = _column(df, 'Name', np.nan).astype(object)
+        named = names.notna().to_numpy()
+        employee_codes, self.employees = pd.factorize(names[named], sort=True)
+        level_index = {level: idx for idx, level in enumerate(PRIORITY_LEVELS)}
+        priority_codes = _map_distinct(
+            _column(df, 'Task Priority', DEFAULT_PRIORITY),
+            lambda priority: level_index.get(str(priority).strip().title(), level_index[DEFAULT_PRIORITY])
+        )[named]
+        classes = status_classes(df)[named]
+
+        cells = len(PRIORITY_LEVELS) * len(STATUS_CLASS_NAMES)
+        flat = employee_codes * cells + priority_codes * len(STATUS_CLASS_NAMES) + classes
+        # (employees, priority levels x status classes)
+        self.counts = np.bincount(flat, minlength=len(self.employees) * cells).reshape(len(self.employees), cells)
+        self.priority_counts = self.counts.reshape(len(self.employees), len(PRIORITY_LEVELS), -1).sum(axis=2)
+        efforts = pd.to_numeric(_column(df, 'Effort (in hours)', 0), errors='coerce').fillna(0.0).to_numpy()
+        self.effort = np.bincount(employee_codes, weights=efforts[named], minlength=len(self.employees))
+        self.tasks = self.priority_counts.sum(axis=1)
+
+    def score(self, priority_weights, status_multipliers) -> pd.DataFrame:
+        """
+        Per-employee scores for the given weights (in PRIORITY_LEVELS order) and
+        status multipliers (completed, in progress, pending):
+
+        - 'Weighted Credit (%)': sum(weight x multiplier) / sum(weight) x 100
+        - 'Priority per Hour (%)': sum(weight) / effort hours x 100
+        """
+        weights = np.asarray(priority_weights, dtype=np.float64)
+        cell_values = np.outer(weights, np.asarray(status_multipliers, dtype=np.float64)).ravel()
+        earned = self.counts @ cell_values
+        possible = self.priority_counts @ weights
+        with np.errstate(divide='ignore', invalid='ignore'):
+            credit = np.where(possible > 0, earned / possible * 100, 0.0)
+            per_hour = np.where(self.effort > 0, possible / self.effort * 100, 0.0)
+        return pd.DataFrame({
+            'Name': self.employees,
+            'Tasks': self.tasks,
+            'Weighted Credit (%)': credit.round(2),
+            'Priority per Hour (%)': per_hour.round(2),
+        })
+
+
+def feature_matrix(excel_path=None) -> FeatureMatrix:
+    """Process-wide FeatureMatrix of the stored history, rebuilt when the store changes."""
+    backend = task_store.get_backend(excel_path)
+    key = (backend.name, os.path.abspath(backend.excel_path))
+    signature = backend.signature()
+    with _feature_cache_lock:
+        cached = _feature_cache.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+    features = FeatureMatrix(task_store.load_tasks(backend.excel_path))
+    with _feature_cache_lock:
+        _feature_cache[key] = (signature, features)
+    return features
+
+
+def what_if_scores(features: FeatureMatrix, priority_weights, status_multipliers,
+                   rank_by='Weighted Credit (%)', baseline=None) -> pd.DataFrame:
+    """
+    Re-score and rank every employee. With ``baseline`` (weights, multipliers)
+    the result also shows the baseline score and how each rank moved.
+    """
+    scores = features.score(priority_weights, status_multipliers)
+    scores['Rank'] = scores[rank_by].rank(ascending=False, method='min').astype(int)
+    if baseline is not None:
+        base = features.score(*baseline)
+        base_rank = base[rank_by].rank(ascending=False, method='min').astype(int)
+        scores.insert(2, f"Current {rank_by}", base[rank_by])
+        scores['Rank Change'] = base_rank - scores['Rank']
+    return scores.sort_values(['Rank', 'Name']).reset_index(drop=True)
+
+
+# ==================== RECOMPUTE ====================
+
+def _score_chunk(formula, chunk: pd.DataFrame):
+    """Process pool task: (row ids, scores) of one chunk."""
+    return chunk['Row Id'].to_numpy(), formula.score(chunk)
+
+
+def _chunks(df: pd.DataFrame, formula: ScoringFormula, chunk_count: int) -> list:
+    """Split rows into chunks that never separate rows the formula scores together."""
+    if chunk_count <= 1:
+        return [df]
+    keys = [col for col in formula.group_columns if col in df.columns]
+    if keys:
+        group_ids = df.groupby(keys, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+    else:
+        group_ids = np.arange(len(df))
+    chunk_ids = group_ids % chunk_count
+    return [df[chunk_ids == chunk_id] for chunk_id in range(chunk_count) if (chunk_ids == chunk_id).any()]
+
+
+def recompute_scores(excel_path=None, version=None, workers=None) -> int:
+    """
+    Re-score the whole stored history with a formula version and write its
+    ``Score [<version>]`` column. Returns the number of rows scored.
+
+    Large histories are split into chunks scored by a process pool. Raises
+    ValueError when the store lacks columns the formula needs to re-score rows
+    (the Excel backend keeps no 'Submission Id' for per-submission formulas).
+    Rows without them (imported from the legacy workbook) are not re-scored
+    and keep showing their stored score.
+    """
+    formula = get_formula(version)
+    backend = task_store.get_backend(excel_path)
+    df = backend.load_scoring_frame()
+    missing = [col for col in formula.recompute_columns if col not in df.columns]
+    if missing:
+        raise ValueError(
+            f"The '{backend.name}' task store does not record {', '.join(missing)}, "
+            f"so '{formula.name}' scores cannot be recomputed from it"
+        )
+    unkeyed = df[list(formula.recompute_columns)].isna().any(axis=1).to_numpy()
+    if unkeyed.any():
+        # A blank score falls back to the stored one (apply_active_scores)
+        backend.write_scores(formula.name, df['Row Id'].to_numpy()[unkeyed], np.full(unkeyed.sum(), np.nan))
+        df = df[~unkeyed].reset_index(drop=True)
+    if df.empty:
+        return 0
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(df) < MIN_PARALLEL_ROWS:
+        row_ids, scores = _score_chunk(formula, df)
+    else:
+        chunks = _chunks(df, formula, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_chunk, [formula] * len(chunks), chunks))
+        row_ids = np.concatenate([ids for ids, _ in results])
+        scores = np.concatenate([chunk_scores for _, chunk_scores in results])
+    written = backend.write_scores(formula.name, row_ids, scores)
+    logging.info(f"Recomputed '{formula.name}' scores for {written} task rows")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Task scoring formulas")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="List the registered formula versions")
+    recompute = subparsers.add_parser('recompute', help="Re-score the stored history with a formula version")
+    recompute.add_argument('excel_path', nargs='?', default=None)
+    recompute.add_argument('--version', default=None, help="Formula version (default: config score_version)")
+    recompute.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        active = task_store.configured_score_version()
+        for name, formula in sorted(FORMULAS.items()):
+            marker = '*' if name == active else ' '
+            print(f"{marker} {name:<20} {formula.description}")
+    else:
+        count = recompute_scores(args.excel_path, args.version, args.workers)
+        print(f"Scored {count} rows with '{get_formula(args.version).name}'")
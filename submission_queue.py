@@ -0,0 +1,260 @@
+"""
+Single-writer group-commit queue for task report submissions.
+
+Concurrent Streamlit sessions used to race on the task store and retry with
+sleeps when they collided. Instead, sessions now enqueue their rows here and
+one writer thread per store flushes everything that arrived during the last
+``FLUSH_INTERVAL_MS`` in a single ``task_store.append_tasks`` call. Each caller
+waits on its own ``Submission`` acknowledgement, so a burst of reports costs
+one write (one SQLite transaction, or one workbook rewrite with the Excel
+backend) instead of one per report.
+
+Before a submission is queued it is appended to the store's write-ahead log
+(see write_ahead_log), so a report survives the process dying before its batch
+is committed: the queue created for a store at startup replays what the store
+has not applied yet, from its own log and from the logs of writer processes
+that died.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import dashboard_worker
+import task_store
+import write_ahead_log
+
+FLUSH_INTERVAL_MS = 50
+MAX_BATCH_ROWS = 5000
+ACK_TIMEOUT_SECONDS = 60
+
+
+def submission_ids(wal_slot, entries):
+    """Per-row submission keys of log entries [(seq, rows)]: one key per entry."""
+    return [f"{wal_slot}:{seq}" for seq, rows in entries for _ in rows]
+
+
+class Submission:
+    """Acknowledgement handle for one enqueued list of task rows."""
+
+    def __init__(self, rows, wal_seq=None):
+        self.rows = list(rows)
+        self.wal_seq = wal_seq
+        self.enqueued_at = time.monotonic()
+        self.batch_size = None
+        self.error = None
+        self._done = threading.Event()
+
+    def _resolve(self, batch_size, error=None):
+        self.batch_size = batch_size
+        self.error = error
+        self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=ACK_TIMEOUT_SECONDS):
+        """Block until the rows are written. Returns the number of rows stored.
+
+        Raises the writer's exception if the batch failed, or TimeoutError.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Submission was not written within {timeout} seconds")
+        if self.error is not None:
+            raise self.error
+        return len(self.rows)
+
+
+class SubmissionQueue:
+    """Group-commit writer for one task store (workbook path)."""
+
+    def __init__(self, excel_path, flush_interval_ms=None, max_batch_rows=None):
+        self.excel_path = excel_path
+        self.flush_interval = (FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms) / 1000.0
+        self.max_batch_rows = MAX_BATCH_ROWS if max_batch_rows is None else max_batch_rows
+        self._condition = threading.Condition()
+        self._pending = []
+        self._pending_rows = 0
+        self._thread = None
+        self.batches_written = 0
+        self.submissions_written = 0
+        # This process's own log; other processes sharing the store use theirs
+        self.wal = write_ahead_log.WriteAheadLog.claim(excel_path)
+        # Logged entries from an earlier process that the store has not applied;
+        # they go into the next commit until one succeeds
+        self._replay = []
+        self.replayed_rows = 0
+        self._recover()
+
+    def _recover(self):
+        for orphan in write_ahead_log.WriteAheadLog.orphans(self.excel_path):
+            try:
+                self._replay_orphan(orphan)
+            except Exception as error:
+                logging.error(f"Could not replay write-ahead log '{orphan.path}', retrying at next startup: {error}")
+            finally:
+                orphan.release()
+
+        pending = self.wal.pending()
+        if not pending:
+            return
+        try:
+            applied_seq = task_store.applied_wal_seq(self.excel_path, self.wal.slot)
+            self._replay = [(seq, rows) for seq, rows in pending if seq > applied_seq]
+            self.wal.discard(up_to=applied_seq)
+        except Exception as error:
+            logging.error(f"Could not check the task store for unapplied submissions: {error}")
+            self._replay = pending
+        if not self._replay:
+            return
+        row_count = sum(len(entry_rows) for _, entry_rows in self._replay)
+        logging.warning(f"Replaying {len(self._replay)} logged submission(s) ({row_count} rows) into the task store")
+        try:
+            self._commit([])
+        except Exception as error:
+            logging.error(f"Replay failed, retrying with the next batch: {error}")
+
+    def _replay_orphan(self, orphan):
+        """Store what a writer process that is gone logged but never committed, then delete its log."""
+        applied_seq = task_store.applied_wal_seq(self.excel_path, orphan.slot)
+        entries = orphan.pending(applied_seq)
+        if entries:
+            rows = [row for _, entry_rows in entries for row in entry_rows]
+            logging.warning(
+                f"Replaying {len(entries)} logged submission(s) ({len(rows)} rows) from '{orphan.path}'"
+            )
+            task_store.append_tasks(
+                rows, self.excel_path, wal_seq=entries[-1][0], wal_slot=orphan.slot,
+                submission_ids=submission_ids(orphan.slot, entries)
+            )
+            self.replayed_rows += len(rows)
+            dashboard_worker.request_rebuild(self.excel_path, len(rows))
+            applied_seq = entries[-1][0]
+        orphan.discard(up_to=applied_seq)
+
+    def _commit(self, entries):
+        """
+        Append the rows of log ``entries`` [(seq, rows)] (plus any pending replay),
+        each entry as its own submission, and drop the applied log entries.
+        """
+        replay_rows = [row for _, entry_rows in self._replay for row in entry_rows]
+        entries = self._replay + entries
+        wal_seq = max(seq for seq, _ in entries)
+        task_store.append_tasks(
+            [row for _, entry_rows in entries for row in entry_rows], self.excel_path,
+            wal_seq=wal_seq, wal_slot=self.wal.slot, submission_ids=submission_ids(self.wal.slot, entries)
+        )
+        self.replayed_rows += len(replay_rows)
+        self._replay = []
+        try:
+            self.wal.discard(up_to=wal_seq)
+        except Exception as error:
+            # The store already recorded wal_seq, so these entries are never replayed twice
+            logging.warning(f"Could not trim the write-ahead log: {error}")
+        if replay_rows:
+            dashboard_worker.request_rebuild(self.excel_path, len(replay_rows))
+
+    def submit(self, rows) -> Submission:
+        """Log the rows durably, then queue them for the next group commit."""
+        with self._condition:
+            # Logged under the queue lock so log order matches commit order
+            submission = Submission(rows, self.wal.append(list(rows)))
+            self._pending.append(submission)
+            self._pending_rows += len(submission.rows)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"submission-writer:{os.path.basename(self.excel_path)}",
+                    daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+        return submission
+
+    def cancel(self, submission) -> bool:
+        """
+        Withdraw a submission the writer has not picked up yet, so it is never
+        stored (e.g. after its acknowledgement timed out). Returns False if it
+        is already being written or done; it will then be stored as usual.
+        """
+        with self._condition:
+            if submission not in self._pending:
+                return False
+            self._pending.remove(submission)
+            self._pending_rows -= len(submission.rows)
+            self.wal.discard(seqs=[submission.wal_seq])
+        submission._resolve(0, RuntimeError("Submission was cancelled before it was written"))
+        return True
+
+    def _take_batch(self):
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            # Give concurrent sessions one flush interval to join this batch
+            deadline = time.monotonic() + self.flush_interval
+            while self._pending_rows < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch, self._pending = self._pending, []
+            self._pending_rows = 0
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            rows = [row for submission in batch for row in submission.rows]
+            try:
+                self._commit([(submission.wal_seq, submission.rows) for submission in batch])
+            except Exception as error:
+                logging.error(f"Failed to write {len(batch)} submission(s) to the task store: {error}")
+                # The sessions are told their report was not saved, so it must not be replayed later
+                try:
+                    self.wal.discard(seqs=[submission.wal_seq for submission in batch])
+                except Exception as discard_error:
+                    logging.error(f"Could not remove failed submissions from the write-ahead log: {discard_error}")
+                for submission in batch:
+                    submission._resolve(len(batch), error)
+                continue
+
+            with self._condition:
+                self.batches_written += 1
+                self.submissions_written += len(batch)
+            for submission in batch:
+                submission._resolve(len(batch))
+            dashboard_worker.request_rebuild(self.excel_path, len(rows))
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(excel_path=None):
+    """Return the process-wide submission queue for a workbook path."""
+    if excel_path is None:
+        excel_path = task_store.DEFAULT_EXCEL_PATH
+    key = os.path.abspath(excel_path)
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = SubmissionQueue(excel_path)
+            _queues[key] = queue
+    return queue
+
+
+def recover(excel_path=None):
+    """Replay unapplied logged submissions of a store (done once, when its queue is created)."""
+    return get_queue(excel_path)
+
+
+def submit(rows, excel_path=None) -> Submission:
+    """Enqueue task rows for the next group commit and return the acknowledgement."""
+    return get_queue(excel_path).submit(rows)
+
+
+def cancel(submission, excel_path=None) -> bool:
+    """Withdraw a not yet written submission (see SubmissionQueue.cancel)."""
+    return get_queue(excel_path).cancel(submission)
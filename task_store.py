@@ -0,0 +1,1549 @@
+"""
+Task report storage for the Employee Progress Tracker.
+
+Every submission used to read the whole ``task_tracker.xlsx``, concatenate the
+new rows and rewrite the workbook, so each report cost O(total history).
+This module puts a pluggable backend behind the task data instead:
+
+- ``sqlite`` (default): an append-only table in ``task_tracker.db`` next to the
+  workbook. A submission is a single INSERT of the rows it adds.
+- ``excel``: the legacy behaviour, the whole history lives in ``Sheet1``.
+
+With the SQLite backend ``task_tracker.xlsx`` is an export generated on demand
+by ``export_workbook``. The backend is chosen with the ``task_store_backend``
+key in ``config.json``.
+
+The SQLite store also keeps a ``daily_rollup`` table of per-day, per-employee
+totals, updated in the same transaction as each append, for the dashboards
+(``load_daily_rollup``).
+
+Stored rows are never rewritten by a request: ``update_tasks``/``delete_tasks``
+append patches and tombstones to ``task_edits``, which reads apply on the fly,
+and ``compact_store`` folds them into the table in the background.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+import excel_reader
+
+# Cached frames are shared by every reader (see load_tasks). With Copy-on-Write a
+# write to a handed-out frame copies only the columns it touches and never
+# reaches the cache; pandas >= 3 always behaves this way.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+CONFIG_FILE = 'config.json'
+DEFAULT_EXCEL_PATH = r'D:\Employee Track Report\task_tracker.xlsx'
+DEFAULT_BACKEND = 'sqlite'
+DATA_SHEET_NAME = 'Sheet1'
+
+DATA_COLUMNS = [
+    'Date',
+    'Work Mode',
+    'Emp Id',
+    'Name',
+    'Project Name',
+    'Task Title',
+    'Task Assigned By',
+    'Task Priority',
+    'Task Status',
+    'Plan for next day',
+    'Support Request',
+    'Availability',
+    'Effort (in hours)',
+    'Employee Performance (%)'
+]
+
+NUMERIC_COLUMNS = ['Effort (in hours)', 'Employee Performance (%)']
+# Read from the workbook as text (numbers typed into them stay e.g. '1024', not 1024)
+TEXT_COLUMNS = [col for col in DATA_COLUMNS if col not in NUMERIC_COLUMNS and col != 'Date']
+EXCEL_READER_KEY = 'excel_reader_engine'
+
+# Low-cardinality text columns kept as pandas categoricals in loaded frames
+CATEGORY_COLUMNS = [
+    'Name',
+    'Project Name',
+    'Task Status',
+    'Task Priority',
+    'Availability',
+    'Work Mode',
+    'Task Assigned By'
+]
+COMPACT_FLOAT_DTYPE = 'float32'
+# Set in DataFrame.attrs by normalise_task_frame; survives copies, slices and filters
+NORMALISED_ATTR = 'task_store_normalised'
+
+# Workbook column -> SQLite column
+SQL_COLUMNS = {
+    'Date': 'date',
+    'Work Mode': 'work_mode',
+    'Emp Id': 'emp_id',
+    'Name': 'name',
+    'Project Name': 'project_name',
+    'Task Title': 'task_title',
+    'Task Assigned By': 'task_assigned_by',
+    'Task Priority': 'task_priority',
+    'Task Status': 'task_status',
+    'Plan for next day': 'plan_for_next_day',
+    'Support Request': 'support_request',
+    'Availability': 'availability',
+    'Effort (in hours)': 'effort_hours',
+    'Employee Performance (%)': 'performance_pct',
+}
+
+# Versioned per-row scores written by the recompute job (scoring.recompute_scores)
+# are stored as extra 'Score [<version>]' columns. The active version
+# (config.json ``score_version``) is what 'Employee Performance (%)' shows.
+SCORE_VERSION_KEY = 'score_version'
+DEFAULT_SCORE_VERSION = 'submission_v1'
+SCORE_VERSION_PATTERN = re.compile(r'^[a-z][a-z0-9_]*$')
+
+# Sequence number of the last write-ahead log entry a store has applied, kept
+# per log (see write_ahead_log: one log per writer process, numbered from 0);
+# the Excel backend keeps them in this hidden sheet
+WAL_SEQ_KEY = 'wal_seq'
+STORE_STATE_SHEET_NAME = '_store_state'
+
+# Edits recorded against stored rows (see SQLiteTaskBackend.update/delete)
+UPDATE_OP = 'update'
+DELETE_OP = 'delete'
+
+# Materialised per-day, per-employee totals (load_daily_rollup)
+ROLLUP_COLUMNS = ['Date', 'Name', 'Tasks', 'Completed', 'Effort', 'Performance Sum', 'Avg Performance']
+COMPLETED_STATUS = 'Completed'
+
+
+def default_row_value(column):
+    """Value used for a column a submitted row does not provide."""
+    return 0.0 if column == 'Employee Performance (%)' else ''
+
+
+def ensure_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Guarantee the performance and effort columns exist and are numeric.
+
+    Frames from load_tasks already are; they are returned as they are, without a copy.
+    """
+    if is_normalised(df) and all(col in df.columns for col in NUMERIC_COLUMNS):
+        return df
+    df = df.copy()
+    numeric_cols = ['Employee Performance (%)', 'Effort (in hours)']
+
+    for col in numeric_cols:
+        if col not in df.columns:
+            df[col] = 0.0
+        if pd.api.types.is_float_dtype(df[col]):
+            # Keep compact float32 columns as they are
+            df[col] = df[col].fillna(0.0)
+            continue
+        df[col] = (
+            pd.to_numeric(df[col], errors='coerce')
+            .fillna(0.0)
+            .astype(float)
+        )
+
+    return df
+
+
+def compact_task_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Categoricals for CATEGORY_COLUMNS and float32 effort/performance (in place)."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(COMPACT_FLOAT_DTYPE)
+    return df
+
+
+def normalise_task_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the typed DATA_COLUMNS schema once (in place) and flag the frame:
+
+    - 'Date' as datetime64 (NaT where unparseable)
+    - effort/performance as float32, missing values as 0
+    - CATEGORY_COLUMNS as categoricals
+
+    Readers of a flagged frame (see is_normalised) skip their own conversions.
+    """
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = parse_dates(df['Date'])
+    for col in NUMERIC_COLUMNS:
+        if col not in df.columns:
+            continue  # projected away (load_tasks(columns=...))
+        if not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        df[col] = df[col].fillna(0.0)
+    compact_task_frame(df)
+    df.attrs[NORMALISED_ATTR] = True
+    return df
+
+
+def is_normalised(df) -> bool:
+    """True for frames that went through normalise_task_frame (and slices of them)."""
+    return df is not None and bool(df.attrs.get(NORMALISED_ATTR))
+
+
+def task_dates(df: pd.DataFrame) -> pd.Series:
+    """The 'Date' column as datetimes, parsed only when the frame is not typed yet."""
+    dates = df['Date']
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return parse_dates(dates)
+
+
+def wal_seq_key(wal_slot=0) -> str:
+    """Store state key of the applied entry of write-ahead log ``wal_slot``."""
+    return f"{WAL_SEQ_KEY}.{wal_slot}" if wal_slot else WAL_SEQ_KEY
+
+
+def export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    A loaded frame in the shape the workbook stores: float64 numbers (widen_numeric)
+    and 'Date' as 'YYYY-MM-DD' text. Always a new frame the caller may modify.
+    """
+    df = widen_numeric(df)
+    if 'Date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Date']):
+        return df.assign(Date=df['Date'].dt.strftime('%Y-%m-%d').fillna(''))
+    return df.copy(deep=False)
+
+
+def select_rows(df: pd.DataFrame, selections: dict) -> pd.DataFrame:
+    """
+    Rows whose columns equal the selected values ({column: value}); 'All' and
+    columns the frame lacks select everything.
+
+    The conditions are combined into one mask, so matching rows are taken once;
+    the frame itself comes back (no copy) when nothing is filtered.
+    """
+    mask = None
+    for col, value in selections.items():
+        if value == 'All' or col not in df.columns:
+            continue
+        condition = df[col] == value
+        mask = condition if mask is None else mask & condition
+    if mask is None:
+        return df
+    return df[mask]
+
+
+def score_column(version) -> str:
+    """Frame/workbook column holding the scores of a formula version."""
+    if not SCORE_VERSION_PATTERN.match(str(version)):
+        raise ValueError(f"Invalid score version '{version}' (use lowercase letters, digits and _)")
+    return f"Score [{version}]"
+
+
+def score_version_of(column):
+    """Version name of a 'Score [<version>]' column, else None."""
+    match = re.fullmatch(r'Score \[([a-z][a-z0-9_]*)\]', str(column))
+    return match.group(1) if match else None
+
+
+def apply_active_scores(df: pd.DataFrame, version) -> pd.DataFrame:
+    """Show the precomputed scores of ``version`` as 'Employee Performance (%)' (in place)."""
+    column = score_column(version)
+    if column in df.columns:
+        scores = pd.to_numeric(df[column], errors='coerce')
+        stored = pd.to_numeric(df['Employee Performance (%)'], errors='coerce')
+        # Rows the recompute job has not reached yet keep their submitted score
+        df['Employee Performance (%)'] = scores.fillna(stored)
+    return df
+
+
+def read_data_sheet(excel_path, engine=None, columns=None) -> pd.DataFrame:
+    """
+    The task rows of a workbook: only the data sheet and its known columns
+    (DATA_COLUMNS and score columns, or just ``columns``), text columns as
+    strings, read with the configured engine by default (see excel_reader).
+    """
+    if engine is None:
+        engine = read_config_value(EXCEL_READER_KEY, excel_reader.AUTO_ENGINE)
+    wanted = DATA_COLUMNS if columns is None else columns
+    # Scores only matter when the performance column is read
+    with_scores = 'Employee Performance (%)' in wanted
+    df = excel_reader.read_sheet(
+        excel_path,
+        sheet_name=DATA_SHEET_NAME,
+        usecols=lambda col: col in wanted or (with_scores and score_version_of(col) is not None),
+        dtype={col: str for col in TEXT_COLUMNS},
+        engine=engine
+    )
+    return df.dropna(how='all')
+
+
+def fsync_directory(directory):
+    """Persist a rename in ``directory`` (not supported on Windows, where it is skipped)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_file(path, copy_existing=False):
+    """
+    Yield a temporary path next to ``path``; once the block completes the file
+    is fsync'd and renamed over ``path`` in one step, so a crash never leaves a
+    truncated file behind. ``copy_existing`` starts from a copy of the current
+    file (for edits such as replacing one sheet).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', suffix=Path(path).suffix, dir=directory)
+    os.close(fd)
+    try:
+        if copy_existing and os.path.exists(path):
+            shutil.copyfile(path, temp_path)
+        yield temp_path
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(directory)
+
+
+def widen_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    float32 columns back to float64 before values are written to files.
+
+    float32 cannot hold values such as 75.33 exactly; rounding to 4 decimals
+    restores the stored value (scores and hours never carry more decimals).
+    """
+    float32_cols = [col for col in df.columns if df[col].dtype == 'float32']
+    if not float32_cols:
+        return df
+    df = df.copy()
+    for col in float32_cols:
+        df[col] = df[col].astype('float64').round(4)
+    return df
+
+
+# ==================== BACKENDS ====================
+
+class ExcelTaskBackend:
+    """Legacy backend: the full history is kept in the workbook's first sheet."""
+
+    name = 'excel'
+
+    def __init__(self, excel_path):
+        self.excel_path = excel_path
+        # Held by anything rewriting the workbook in this process (appends, dashboard rebuilds)
+        self.write_lock = threading.RLock()
+
+    def load(self, date_from=None, date_to=None, columns=None, emp_ids=None, names=None) -> pd.DataFrame:
+        if not os.path.exists(self.excel_path):
+            # Create empty Excel file with headers if it doesn't exist
+            df = pd.DataFrame(columns=DATA_COLUMNS)
+            self._write(df)
+            return df
+        df = read_data_sheet(self.excel_path, columns=query_columns(columns, emp_ids, names, date_from, date_to))
+        # A single sheet has no partitions to prune: read the columns, then filter rows
+        return filter_tasks(df, date_from, date_to, emp_ids, names)
+
+    def append(self, rows, wal_seq=None, wal_slot=0, submission_ids=None) -> int:
+        # The sheet has no submission key column (see scoring.recompute_scores)
+        with self.write_lock:
+            return self._append(rows, wal_seq, wal_slot)
+
+    def _write(self, df, state=None):
+        """
+        Replace the workbook with ``df`` as its data sheet (temp file + rename).
+        ``state`` ({key: value}) is stored in the hidden state sheet as part of
+        the same file.
+        """
+        with atomic_file(self.excel_path) as temp_path:
+            with pd.ExcelWriter(temp_path, engine='openpyxl', mode='w') as writer:
+                df.to_excel(writer, index=False, sheet_name=DATA_SHEET_NAME)
+                if state:
+                    state_df = pd.DataFrame({'key': list(state), 'value': [str(value) for value in state.values()]})
+                    state_df.to_excel(writer, index=False, sheet_name=STORE_STATE_SHEET_NAME)
+                    writer.book[STORE_STATE_SHEET_NAME].sheet_state = 'hidden'
+
+    def store_state(self) -> dict:
+        """Values of the hidden state sheet ({key: value text}, empty if none)."""
+        if not os.path.exists(self.excel_path):
+            return {}
+        try:
+            book = load_workbook(self.excel_path, read_only=True)
+        except Exception as error:
+            logging.warning(f"Could not read store state from '{self.excel_path}': {error}")
+            return {}
+        try:
+            if STORE_STATE_SHEET_NAME not in book.sheetnames:
+                return {}
+            return {
+                key: str(value)
+                for key, value in book[STORE_STATE_SHEET_NAME].iter_rows(min_row=2, max_col=2, values_only=True)
+                if key is not None
+            }
+        finally:
+            book.close()
+
+    def applied_wal_seq(self, wal_slot=0) -> int:
+        """Last entry of write-ahead log ``wal_slot`` written into the workbook (0 if unknown)."""
+        return int(self.store_state().get(wal_seq_key(wal_slot), 0))
+
+    def _append(self, rows, wal_seq=None, wal_slot=0) -> int:
+        if os.path.exists(self.excel_path):
+            existing_df = read_data_sheet(self.excel_path)
+        else:
+            existing_df = pd.DataFrame()
+
+        new_rows = pd.DataFrame(rows)
+        for col in DATA_COLUMNS:
+            if col not in new_rows.columns:
+                new_rows[col] = default_row_value(col)
+            if not existing_df.empty and col not in existing_df.columns:
+                existing_df[col] = default_row_value(col)
+        # Versioned score columns travel along; rows without one stay blank
+        score_cols = sorted(
+            {col for col in list(existing_df.columns) + list(new_rows.columns) if score_version_of(col)}
+        )
+        columns = DATA_COLUMNS + score_cols
+
+        if existing_df.empty:
+            combined_df = new_rows.reindex(columns=columns)
+        else:
+            combined_df = pd.concat(
+                [existing_df.reindex(columns=columns), new_rows.reindex(columns=columns)], ignore_index=True
+            )
+
+        state = self.store_state()
+        if wal_seq is not None:
+            state[wal_seq_key(wal_slot)] = wal_seq
+        self._write(combined_df, state)
+        return len(new_rows)
+
+    def count(self) -> int:
+        return len(self.load())
+
+    def load_scoring_frame(self) -> pd.DataFrame:
+        """All rows with a 'Row Id' (position in the sheet) for write_scores."""
+        df = self.load()
+        df.insert(0, 'Row Id', df.index)
+        return df.reset_index(drop=True)
+
+    def write_scores(self, version, row_ids, scores) -> int:
+        column = score_column(version)
+        with self.write_lock:
+            df = read_data_sheet(self.excel_path)
+            df[column] = pd.Series(scores, index=row_ids, dtype='float64')
+            self._write(df, self.store_state())
+        return len(row_ids)
+
+    def update(self, changes) -> int:
+        """Patch rows {row id: {column: value}}; the workbook has no edit log, so it is rewritten."""
+        with self.write_lock:
+            df = read_data_sheet(self.excel_path)
+            patched = [row_id for row_id in changes if row_id in df.index]
+            for row_id in patched:
+                for col, value in changes[row_id].items():
+                    if col not in DATA_COLUMNS:
+                        raise ValueError(f"Cannot edit unknown column: {col}")
+                    df.loc[row_id, col] = value
+            if patched:
+                self._write(df, self.store_state())
+        return len(patched)
+
+    def delete(self, row_ids) -> int:
+        with self.write_lock:
+            df = read_data_sheet(self.excel_path)
+            deleted = [row_id for row_id in row_ids if row_id in df.index]
+            if deleted:
+                self._write(df.drop(index=deleted), self.store_state())
+        return len(deleted)
+
+    def pending_edits(self) -> int:
+        return 0
+
+    def compact(self) -> int:
+        """Edits are applied immediately, so there is nothing to fold."""
+        return 0
+
+    def signature(self):
+        """Changes whenever the stored data may have changed (used as cache key)."""
+        return file_signature(self.excel_path)
+
+    def data_version(self) -> int:
+        """Every write rewrites the workbook, so its mtime (ns) serves as the version."""
+        signature = self.signature()
+        return signature[0] if signature else 0
+
+
+class SQLiteTaskBackend:
+    """Append-only task log in SQLite; appends cost O(rows added)."""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path, excel_path=None):
+        self.db_path = db_path
+        self.excel_path = excel_path
+        self._init_lock = threading.Lock()
+        self._initialised = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialised:
+            with self._init_lock:
+                if not self._initialised:
+                    self._initialise(conn)
+                    self._initialised = True
+        return conn
+
+    def _initialise(self, conn):
+        column_defs = ', '.join(
+            f"{sql_col} REAL" if col in NUMERIC_COLUMNS else f"{sql_col} TEXT"
+            for col, sql_col in SQL_COLUMNS.items()
+        )
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                f"{column_defs}, "
+                "submitted_at TEXT, submission_id TEXT)"
+            )
+            # Rows stored before submissions were keyed keep a NULL submission_id
+            if 'submission_id' not in {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}:
+                conn.execute("ALTER TABLE tasks ADD COLUMN submission_id TEXT")
+            conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+            # Edits are appended here and applied on read until compact() folds them in
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_edits ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, task_id INTEGER NOT NULL, "
+                "op TEXT NOT NULL, changes TEXT, created_at TEXT)"
+            )
+            # Date ranges are read as index range scans (the date "partitions")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_date ON tasks (date)")
+            # Serves load_tasks(emp_ids=...) (matches the expression in _predicates)
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_emp_id ON tasks (UPPER(TRIM(emp_id)))")
+            # Kept up to date by _insert; missing dates/names are stored as ''
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_rollup ("
+                "date TEXT NOT NULL, name TEXT NOT NULL, "
+                "task_count INTEGER NOT NULL, completed_count INTEGER NOT NULL, "
+                "effort_sum REAL NOT NULL, perf_sum REAL NOT NULL, "
+                "PRIMARY KEY (date, name))"
+            )
+        self._seed_from_workbook(conn)
+        normalised = self._normalise_dates(conn)
+        if normalised or self._rollup_version(conn) != configured_score_version():
+            self._rebuild_rollup(conn)
+
+    def _seed_from_workbook(self, conn):
+        """One-shot import of the rows already kept in the legacy workbook."""
+        seeded = conn.execute("SELECT value FROM store_meta WHERE key = 'seeded_from_excel'").fetchone()
+        if seeded or not self.excel_path or not os.path.exists(self.excel_path):
+            return
+        try:
+            existing_df = read_data_sheet(self.excel_path)
+        except Exception as error:
+            logging.warning(f"Could not import existing workbook '{self.excel_path}' into task store: {error}")
+            return
+        rows = existing_df.to_dict('records')
+        with conn:
+            # Which rows were reported together is not known for the workbook's rows
+            self._insert(conn, rows, submission_ids=[None] * len(rows))
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('seeded_from_excel', ?)",
+                (datetime.now().isoformat(),)
+            )
+        logging.info(f"Imported {len(rows)} rows from '{self.excel_path}' into '{self.db_path}'")
+
+    def _normalise_dates(self, conn):
+        """Rewrite dates not stored as YYYY-MM-DD so range reads can compare them as text."""
+        rows = conn.execute(
+            "SELECT id, date FROM tasks WHERE date IS NOT NULL "
+            "AND date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+        ).fetchall()
+        updates = [
+            (iso_date, row_id) for row_id, raw in rows
+            if (iso_date := to_iso_date(raw)) is not None and iso_date != raw
+        ]
+        if updates:
+            with conn:
+                conn.executemany("UPDATE tasks SET date = ? WHERE id = ?", updates)
+                self._bump_data_version(conn)
+            logging.info(f"Normalised {len(updates)} task dates in '{self.db_path}'")
+        return len(updates)
+
+    @staticmethod
+    def _score_sql_column(version):
+        score_column(version)  # validates the name
+        return f"score_{version}"
+
+    @staticmethod
+    def _score_sql_columns(conn):
+        """{version: SQLite column} of the score columns present in the tasks table."""
+        return {
+            row[1][len('score_'):]: row[1]
+            for row in conn.execute("PRAGMA table_info(tasks)")
+            if row[1].startswith('score_')
+        }
+
+    def _ensure_score_column(self, conn, version):
+        sql_col = self._score_sql_column(version)
+        if version not in self._score_sql_columns(conn):
+            conn.execute(f"ALTER TABLE tasks ADD COLUMN {sql_col} REAL")
+        return sql_col
+
+    @staticmethod
+    def _rollup_version(conn):
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'daily_rollup_version'").fetchone()
+        return row[0] if row else None
+
+    def _rebuild_rollup(self, conn, version=None):
+        """
+        Recompute daily_rollup from every stored task: stores created before the
+        rollup existed, and whenever the active score version changes.
+        """
+        if version is None:
+            version = configured_score_version()
+        performance = 'performance_pct'
+        if version in self._score_sql_columns(conn):
+            performance = f"COALESCE({self._score_sql_column(version)}, performance_pct)"
+        with conn:
+            self._fold_edits(conn)
+            conn.execute("DELETE FROM daily_rollup")
+            conn.execute(
+                "INSERT INTO daily_rollup (date, name, task_count, completed_count, effort_sum, perf_sum) "
+                "SELECT COALESCE(date, ''), COALESCE(name, ''), COUNT(*), "
+                "SUM(CASE WHEN task_status = ? THEN 1 ELSE 0 END), "
+                f"SUM(COALESCE(effort_hours, 0)), SUM(COALESCE({performance}, 0)) "
+                "FROM tasks GROUP BY 1, 2",
+                (COMPLETED_STATUS,)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('daily_rollup_version', ?)",
+                (version,)
+            )
+
+    @staticmethod
+    def _to_sql_value(column, value):
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        if column in NUMERIC_COLUMNS:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        if column == 'Date':
+            return to_iso_date(value) or str(value)
+        if isinstance(value, (datetime, pd.Timestamp)):
+            return value.strftime('%Y-%m-%d')
+        text = str(value)
+        # Blank cells read back from a workbook as missing; keep the same semantics
+        return text if text != '' else None
+
+    def _insert(self, conn, rows, submission_ids=None):
+        """
+        Insert task rows. ``submission_ids`` gives each row the key of the
+        submission it belongs to (see append_tasks); by default the rows are
+        one new submission.
+        """
+        submitted_at = datetime.now().isoformat()
+        if submission_ids is None:
+            submission_ids = [uuid.uuid4().hex] * len(rows)
+        # Rows may carry precomputed 'Score [<version>]' values
+        score_versions = sorted({version for row in rows for col in row if (version := score_version_of(col))})
+        score_sql_cols = [self._ensure_score_column(conn, version) for version in score_versions]
+        placeholders = ', '.join('?' for _ in range(len(SQL_COLUMNS) + len(score_sql_cols) + 2))
+        sql_cols = ', '.join(list(SQL_COLUMNS.values()) + score_sql_cols + ['submitted_at', 'submission_id'])
+        values = [
+            tuple(
+                self._to_sql_value(col, row.get(col, default_row_value(col)))
+                for col in DATA_COLUMNS
+            ) + tuple(
+                self._to_sql_value('Employee Performance (%)', row.get(score_column(version)))
+                for version in score_versions
+            ) + (submitted_at, submission_id)
+            for row, submission_id in zip(rows, submission_ids)
+        ]
+        conn.executemany(f"INSERT INTO tasks ({sql_cols}) VALUES ({placeholders})", values)
+        rollup_version = self._rollup_version(conn)
+        score_position = (
+            len(DATA_COLUMNS) + score_versions.index(rollup_version) if rollup_version in score_versions else None
+        )
+        self._update_rollup(conn, values, score_position)
+        self._bump_data_version(conn)
+        return len(values)
+
+    @staticmethod
+    def _bump_data_version(conn):
+        """Increment the stored data version (inside the writing transaction)."""
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('data_version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    @staticmethod
+    def _update_rollup(conn, values, score_position=None):
+        """
+        Add freshly inserted task rows to daily_rollup (same transaction as the
+        INSERT). ``score_position`` is the value index of the rollup's score
+        version, when the rows carry it.
+        """
+        positions = {col: idx for idx, col in enumerate(DATA_COLUMNS)}
+        totals = {}
+        for value in values:
+            key = (value[positions['Date']] or '', value[positions['Name']] or '')
+            entry = totals.setdefault(key, [0, 0, 0.0, 0.0])
+            performance = value[positions['Employee Performance (%)']]
+            if score_position is not None and value[score_position] is not None:
+                performance = value[score_position]
+            entry[0] += 1
+            entry[1] += value[positions['Task Status']] == COMPLETED_STATUS
+            entry[2] += value[positions['Effort (in hours)']] or 0.0
+            entry[3] += performance or 0.0
+        SQLiteTaskBackend._upsert_rollup(conn, [key + tuple(entry) for key, entry in totals.items()])
+
+    @staticmethod
+    def _upsert_rollup(conn, records):
+        """Add (date, name, tasks, completed, effort, performance) totals; negative totals subtract."""
+        conn.executemany(
+            "INSERT INTO daily_rollup (date, name, task_count, completed_count, effort_sum, perf_sum) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (date, name) DO UPDATE SET "
+            "task_count = task_count + excluded.task_count, "
+            "completed_count = completed_count + excluded.completed_count, "
+            "effort_sum = effort_sum + excluded.effort_sum, "
+            "perf_sum = perf_sum + excluded.perf_sum",
+            records
+        )
+
+    def _adjust_rollup(self, conn, df, sign):
+        """Add (sign=1) or remove (sign=-1) the rows of a stored-value frame from daily_rollup."""
+        if df.empty:
+            return
+        performance = pd.to_numeric(df['Employee Performance (%)'], errors='coerce')
+        version = self._rollup_version(conn)
+        if version is not None and score_column(version) in df.columns:
+            performance = pd.to_numeric(df[score_column(version)], errors='coerce').fillna(performance)
+        parts = pd.DataFrame({
+            'date': df['Date'].astype(object).fillna(''),
+            'name': df['Name'].astype(object).fillna(''),
+            'tasks': 1,
+            'completed': (df['Task Status'] == COMPLETED_STATUS).astype(int),
+            'effort': pd.to_numeric(df['Effort (in hours)'], errors='coerce').fillna(0.0),
+            'performance': performance.fillna(0.0),
+        })
+        totals = parts.groupby(['date', 'name'], sort=False).sum().reset_index()
+        records = [
+            (date_key, name, int(tasks) * sign, int(completed) * sign, float(effort) * sign, float(perf) * sign)
+            for date_key, name, tasks, completed, effort, perf in totals.itertuples(index=False)
+        ]
+        self._upsert_rollup(conn, records)
+        conn.execute("DELETE FROM daily_rollup WHERE task_count <= 0")
+
+    @staticmethod
+    def _date_where(date_from, date_to):
+        conditions, params = SQLiteTaskBackend._predicates(date_from, date_to)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def _predicates(date_from=None, date_to=None, emp_ids=None, names=None):
+        """SQL conditions for the load_tasks filters (emp_ids upper-case, names lower-case)."""
+        conditions, params = [], []
+        if emp_ids is not None:
+            conditions.append(f"UPPER(TRIM(emp_id)) IN ({', '.join('?' * len(emp_ids))})")
+            params.extend(emp_ids)
+        if names is not None:
+            conditions.append(f"LOWER(TRIM(name)) IN ({', '.join('?' * len(names))})")
+            params.extend(names)
+        if date_from is not None:
+            conditions.append("date >= ?")
+            params.append(date_from.isoformat())
+        if date_to is not None:
+            # Exclusive upper bound also matches dates stored with a time part
+            conditions.append("date < ?")
+            params.append((date_to + timedelta(days=1)).isoformat())
+        return conditions, params
+
+    def _load(self, conn, extra_cols, where='', params=(), columns=None):
+        score_cols = self._score_sql_columns(conn)
+        data_cols = list(SQL_COLUMNS.values())
+        if columns is not None:
+            data_cols = [sql_col for col, sql_col in SQL_COLUMNS.items() if col in columns]
+            if 'Employee Performance (%)' not in columns:
+                score_cols = {}
+        select_cols = ', '.join(extra_cols + data_cols + list(score_cols.values()))
+        df = pd.read_sql_query(f"SELECT {select_cols} FROM tasks{where} ORDER BY id", conn, params=params)
+        renames = {sql_col: col for col, sql_col in SQL_COLUMNS.items()}
+        renames.update({sql_col: score_column(version) for version, sql_col in score_cols.items()})
+        return df.rename(columns=renames)
+
+    @staticmethod
+    def _load_edits(conn):
+        """Outstanding edits, oldest first: [(task id, op, {workbook column: stored value})]."""
+        return [
+            (task_id, op, json.loads(changes) if changes else {})
+            for task_id, op, changes in conn.execute("SELECT task_id, op, changes FROM task_edits ORDER BY seq")
+        ]
+
+    @staticmethod
+    def _apply_edits(df, edits):
+        """Apply edits to a loaded frame that has an 'id' column."""
+        positions = {task_id: idx for idx, task_id in enumerate(df['id'].tolist())}
+        deleted = set()
+        for task_id, op, changes in edits:
+            if task_id not in positions:
+                continue
+            if op == DELETE_OP:
+                deleted.add(task_id)
+                continue
+            for col, value in changes.items():
+                if col in df.columns:
+                    df.iloc[positions[task_id], df.columns.get_loc(col)] = value
+        return df[~df['id'].isin(deleted)].reset_index(drop=True) if deleted else df
+
+    def _read_tasks(self, conn, extra_cols, date_from=None, date_to=None, ids=None,
+                    columns=None, emp_ids=None, names=None):
+        """Stored rows matching the filters with outstanding edits applied, with their 'id'."""
+        edits = self._load_edits(conn)
+        moved = []
+        if ids is not None:
+            ids = [int(task_id) for task_id in ids]
+            where, params = f" WHERE id IN ({', '.join('?' * len(ids))})", ids
+        else:
+            conditions, params = self._predicates(date_from, date_to, emp_ids, names)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            # Rows with an edited filter column may move into or out of the result
+            filtered = set(query_columns([], emp_ids, names, date_from, date_to))
+            moved = sorted({task_id for task_id, _, changes in edits if filtered & set(changes)})
+            if where and moved:
+                where = f" WHERE ({' AND '.join(conditions)}) OR id IN ({', '.join('?' * len(moved))})"
+                params = params + moved
+        df = self._load(conn, ['id'] + extra_cols, where, params, query_columns(columns, emp_ids, names, date_from, date_to))
+        if edits:
+            df = self._apply_edits(df, edits)
+            if moved:
+                df = filter_tasks(df, date_from, date_to, emp_ids, names).reset_index(drop=True)
+        return df
+
+    def load(self, date_from=None, date_to=None, columns=None, emp_ids=None, names=None) -> pd.DataFrame:
+        conn = self._connect()
+        try:
+            df = self._read_tasks(conn, [], date_from, date_to, columns=columns, emp_ids=emp_ids, names=names)
+            return df.drop(columns='id')
+        finally:
+            conn.close()
+
+    def load_scoring_frame(self) -> pd.DataFrame:
+        """All rows with their 'Row Id' and 'Submission Id' (None if unknown) for write_scores."""
+        conn = self._connect()
+        try:
+            df = self._read_tasks(conn, ['submission_id'])
+        finally:
+            conn.close()
+        return df.rename(columns={'id': 'Row Id', 'submission_id': 'Submission Id'})
+
+    def _record_edits(self, task_ids, edits):
+        """Append edits [(task id, op, changes)] and move the rollup from the old to the new rows."""
+        conn = self._connect()
+        try:
+            with conn:
+                before = self._read_tasks(conn, [], ids=task_ids)
+                now = datetime.now().isoformat()
+                conn.executemany(
+                    "INSERT INTO task_edits (task_id, op, changes, created_at) VALUES (?, ?, ?, ?)",
+                    [(int(task_id), op, json.dumps(changes) if changes else None, now)
+                     for task_id, op, changes in edits if int(task_id) in set(before['id'].tolist())]
+                )
+                after = self._read_tasks(conn, [], ids=task_ids)
+                self._adjust_rollup(conn, before, -1)
+                self._adjust_rollup(conn, after, 1)
+                self._bump_data_version(conn)
+            return len(before)
+        finally:
+            conn.close()
+
+    def update(self, changes) -> int:
+        """
+        Record patches {row id: {workbook column: value}} without rewriting any
+        stored row. Returns the number of existing rows patched.
+        """
+        edits = []
+        for task_id, values in changes.items():
+            unknown = [col for col in values if col not in SQL_COLUMNS]
+            if unknown:
+                raise ValueError(f"Cannot edit unknown column(s): {', '.join(unknown)}")
+            edits.append((task_id, UPDATE_OP, {col: self._to_sql_value(col, value) for col, value in values.items()}))
+        return self._record_edits(list(changes), edits)
+
+    def delete(self, task_ids) -> int:
+        """Record tombstones for rows; returns the number of existing rows deleted."""
+        task_ids = list(task_ids)
+        return self._record_edits(task_ids, [(task_id, DELETE_OP, None) for task_id in task_ids])
+
+    def _fold_edits(self, conn):
+        """Apply outstanding edits to the tasks table (inside a transaction)."""
+        edits = self._load_edits(conn)
+        for task_id, op, changes in edits:
+            if op == DELETE_OP:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            elif changes:
+                assignments = ', '.join(f"{SQL_COLUMNS[col]} = ?" for col in changes)
+                conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*changes.values(), task_id))
+        conn.execute("DELETE FROM task_edits")
+        return edits
+
+    def pending_edits(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM task_edits").fetchone()[0]
+        finally:
+            conn.close()
+
+    def compact(self) -> int:
+        """
+        Fold the outstanding edits into the tasks table and, when rows were
+        deleted, VACUUM the file so it shrinks back. Reads see the same data
+        before and after. Returns the number of edits folded.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                edits = self._fold_edits(conn)
+            if any(op == DELETE_OP for _, op, _ in edits):
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
+        return len(edits)
+
+    def write_scores(self, version, row_ids, scores) -> int:
+        """Store per-row scores of a formula version in its score column."""
+        conn = self._connect()
+        try:
+            with conn:
+                sql_col = self._ensure_score_column(conn, version)
+                conn.executemany(
+                    f"UPDATE tasks SET {sql_col} = ? WHERE id = ?",
+                    zip((None if pd.isna(score) else float(score) for score in scores), (int(i) for i in row_ids))
+                )
+                self._bump_data_version(conn)
+            if version == self._rollup_version(conn):
+                self._rebuild_rollup(conn, version)
+        finally:
+            conn.close()
+        return len(row_ids)
+
+    def load_rollup(self, date_from=None, date_to=None) -> pd.DataFrame:
+        """daily_rollup rows (ROLLUP_COLUMNS without the mean); cost is O(days x employees)."""
+        where, params = self._date_where(date_from, date_to)
+        conn = self._connect()
+        try:
+            if self._rollup_version(conn) != configured_score_version():
+                self._rebuild_rollup(conn)
+            df = pd.read_sql_query(
+                "SELECT date, name, task_count, completed_count, effort_sum, perf_sum "
+                f"FROM daily_rollup{where} ORDER BY date, name",
+                conn,
+                params=params
+            )
+        finally:
+            conn.close()
+        df.columns = ROLLUP_COLUMNS[:-1]
+        return df
+
+    def append(self, rows, wal_seq=None, wal_slot=0, submission_ids=None) -> int:
+        conn = self._connect()
+        try:
+            with conn:
+                added = self._insert(conn, rows, submission_ids)
+                if wal_seq is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                        (wal_seq_key(wal_slot), str(wal_seq))
+                    )
+                return added
+        finally:
+            conn.close()
+
+    def applied_wal_seq(self, wal_slot=0) -> int:
+        """Last entry of write-ahead log ``wal_slot`` committed with the rows it carried (0 if none)."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (wal_seq_key(wal_slot),)).fetchone()
+        finally:
+            conn.close()
+        return int(row[0]) if row else 0
+
+    def count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        finally:
+            conn.close()
+
+    def data_version(self) -> int:
+        """Counter in store_meta, bumped by every write transaction."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'data_version'").fetchone()
+        finally:
+            conn.close()
+        return int(row[0]) if row else 0
+
+    def signature(self):
+        """Changes whenever the stored data may have changed (used as cache key)."""
+        # In WAL mode committed rows land in the -wal file until a checkpoint
+        return file_signature(self.db_path), file_signature(f"{self.db_path}-wal")
+
+
+def to_iso_date(value):
+    """'YYYY-MM-DD' for anything that parses as a date, else None."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d')
+    text = str(value).strip()
+    if len(text) == 10 and text[4] == '-' and text[7] == '-':
+        return text
+    parsed = pd.to_datetime(text, errors='coerce')
+    return None if pd.isna(parsed) else parsed.strftime('%Y-%m-%d')
+
+
+def as_date(value):
+    """Normalise a date bound (date, datetime, Timestamp or string) to a date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Datetimes for a Date column that may mix formats (NaT where unparseable)."""
+    parsed = pd.to_datetime(values, errors='coerce')
+    # The format is inferred from the first value; re-parse stragglers in other formats
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry].astype(str), errors='coerce', format='mixed')
+    return parsed
+
+
+def filter_date_range(df: pd.DataFrame, date_from=None, date_to=None) -> pd.DataFrame:
+    """Rows whose Date falls within [date_from, date_to] (inclusive)."""
+    if (date_from is None and date_to is None) or 'Date' not in df.columns:
+        return df
+    dates = task_dates(df)
+    mask = dates.notna()
+    if date_from is not None:
+        mask &= dates >= pd.Timestamp(date_from)
+    if date_to is not None:
+        # Inclusive of the whole last day
+        mask &= dates < pd.Timestamp(date_to) + pd.Timedelta(days=1)
+    return df[mask]
+
+
+def query_columns(columns, emp_ids=None, names=None, date_from=None, date_to=None):
+    """
+    Columns a filtered read needs: the requested ones plus those its filters
+    test, in DATA_COLUMNS order (None = every column).
+    """
+    if columns is None:
+        return None
+    needed = set(columns)
+    if emp_ids is not None:
+        needed.add('Emp Id')
+    if names is not None:
+        needed.add('Name')
+    if date_from is not None or date_to is not None:
+        needed.add('Date')
+    return [col for col in DATA_COLUMNS if col in needed]
+
+
+def filter_tasks(df: pd.DataFrame, date_from=None, date_to=None, emp_ids=None, names=None) -> pd.DataFrame:
+    """
+    Rows matching the load_tasks filters: the date range, and employee ids
+    (compared upper-case) or names (lower-case) from normalised filter lists.
+    """
+    df = filter_date_range(df, date_from, date_to)
+    mask = None
+    if emp_ids is not None and 'Emp Id' in df.columns:
+        mask = df['Emp Id'].astype(str).str.strip().str.upper().isin(emp_ids)
+    if names is not None and 'Name' in df.columns:
+        name_mask = df['Name'].astype(str).str.strip().str.lower().isin(names)
+        mask = name_mask if mask is None else mask & name_mask
+    return df if mask is None else df[mask]
+
+
+def _query_key(columns=None, emp_ids=None, names=None):
+    """Validated, normalised (columns, emp_ids, names) of a load_tasks call, usable as a cache key."""
+    if columns is not None:
+        unknown = [col for col in columns if col not in DATA_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown task column(s): {', '.join(unknown)}")
+        columns = tuple(col for col in DATA_COLUMNS if col in set(columns))
+    if emp_ids is not None:
+        emp_ids = tuple(sorted({str(emp_id).strip().upper() for emp_id in emp_ids}))
+    if names is not None:
+        names = tuple(sorted({str(name).strip().lower() for name in names}))
+    return columns, emp_ids, names
+
+
+def _covers(cached_query, query) -> bool:
+    """True when a cached frame for ``cached_query`` holds every row and column ``query`` asks for."""
+    cached_from, cached_to, cached_cols, cached_emps, cached_names = cached_query
+    date_from, date_to, columns, emp_ids, names = query
+    if cached_emps is not None or cached_names is not None:
+        return False
+    if cached_cols is not None:
+        needed = query_columns(columns or DATA_COLUMNS, emp_ids, names, date_from, date_to)
+        if not set(needed) <= set(cached_cols):
+            return False
+    if cached_from is not None and (date_from is None or date_from < cached_from):
+        return False
+    if cached_to is not None and (date_to is None or date_to > cached_to):
+        return False
+    return True
+
+
+def rollup_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily (Date, Name) totals of raw task rows, shaped like load_daily_rollup.
+
+    Used for stores without a materialised rollup and for frames that carry
+    filters the rollup cannot express (project, status, priority).
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    index = df.index
+    dates = (
+        task_dates(df).dt.strftime('%Y-%m-%d').fillna('')
+        if 'Date' in df.columns else pd.Series('', index=index)
+    )
+    names = df['Name'].astype(object).fillna('') if 'Name' in df.columns else pd.Series('', index=index)
+    status = df['Task Status'] if 'Task Status' in df.columns else pd.Series(None, index=index, dtype=object)
+    parts = pd.DataFrame({
+        'Date': dates.astype(object),
+        'Name': names,
+        'Tasks': 1,
+        'Completed': (status == COMPLETED_STATUS).astype(int),
+    })
+    for col, source in (('Effort', 'Effort (in hours)'), ('Performance Sum', 'Employee Performance (%)')):
+        values = pd.to_numeric(df[source], errors='coerce') if source in df.columns else pd.Series(0.0, index=index)
+        parts[col] = values.astype('float64').fillna(0.0)
+    rollup = parts.groupby(['Date', 'Name'], sort=True).sum().reset_index()
+    return with_rollup_mean(rollup)
+
+
+def with_rollup_mean(rollup: pd.DataFrame) -> pd.DataFrame:
+    """Add the Avg Performance column (Performance Sum / Tasks)."""
+    rollup['Avg Performance'] = (rollup['Performance Sum'] / rollup['Tasks']).astype('float64')
+    return rollup[ROLLUP_COLUMNS]
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+BACKENDS = {
+    ExcelTaskBackend.name: ExcelTaskBackend,
+    SQLiteTaskBackend.name: SQLiteTaskBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+# Parsed task frames shared by every reader in the process:
+# (backend name, abspath, score version, date_from, date_to) -> (storage signature, DataFrame)
+_frame_cache = {}
+_frame_cache_lock = threading.Lock()
+MAX_CACHED_RANGES = 8
+_cache_stats = {'hits': 0, 'misses': 0}
+# (backend name, abspath, score version, date_from, date_to) -> (storage signature, rollup DataFrame)
+_rollup_cache = {}
+# (backend name, abspath) -> (storage signature, data version)
+_version_cache = {}
+_import_versions = {'last': 0}
+
+
+def db_path_for(excel_path):
+    """SQLite file that backs the given workbook path."""
+    return str(Path(excel_path).with_suffix('.db'))
+
+
+def read_config_value(key, default=None):
+    """Single key from config.json, or ``default`` when missing/unreadable."""
+    try:
+        if Path(CONFIG_FILE).exists():
+            with open(CONFIG_FILE, 'r') as f:
+                return json.load(f).get(key, default)
+    except Exception as error:
+        logging.warning(f"Could not read '{key}' from {CONFIG_FILE}: {error}")
+    return default
+
+
+def configured_backend_name():
+    """Backend name from config.json (``task_store_backend``), defaulting to SQLite."""
+    name = read_config_value('task_store_backend', DEFAULT_BACKEND)
+    if name in BACKENDS:
+        return name
+    logging.warning(f"Unknown task_store_backend '{name}', using '{DEFAULT_BACKEND}'")
+    return DEFAULT_BACKEND
+
+
+def configured_score_version():
+    """Active scoring formula version (``score_version`` in config.json)."""
+    version = read_config_value(SCORE_VERSION_KEY, DEFAULT_SCORE_VERSION)
+    if SCORE_VERSION_PATTERN.match(str(version)):
+        return version
+    logging.warning(f"Invalid score_version '{version}', using '{DEFAULT_SCORE_VERSION}'")
+    return DEFAULT_SCORE_VERSION
+
+
+def get_backend(excel_path=None, backend_name=None):
+    """Return the (process-wide) backend instance for a workbook path."""
+    if excel_path is None:
+        excel_path = DEFAULT_EXCEL_PATH
+    if backend_name is None:
+        backend_name = configured_backend_name()
+    key = (backend_name, os.path.abspath(excel_path))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            if backend_name == SQLiteTaskBackend.name:
+                backend = SQLiteTaskBackend(db_path_for(excel_path), excel_path=excel_path)
+            else:
+                backend = BACKENDS[backend_name](excel_path)
+            _backends[key] = backend
+    return backend
+
+
+# ==================== PUBLIC API ====================
+
+def _load_normalised(backend, date_from=None, date_to=None, score_version=None,
+                     columns=None, emp_ids=None, names=None) -> pd.DataFrame:
+    df = backend.load(date_from, date_to, columns=columns, emp_ids=emp_ids, names=names)
+    wanted = DATA_COLUMNS if columns is None else list(columns)
+    for col in wanted:
+        if col not in df.columns:
+            df[col] = default_row_value(col)
+    if score_version is not None and 'Employee Performance (%)' in wanted:
+        df = apply_active_scores(df, score_version)
+    # Score columns only come along with full-width reads
+    extra_cols = [col for col in df.columns if col not in DATA_COLUMNS] if columns is None else []
+    df = df[wanted + extra_cols].reset_index(drop=True)
+    return normalise_task_frame(df)
+
+
+def shared_frame(df: pd.DataFrame, copy=False) -> pd.DataFrame:
+    """
+    A cached frame for one caller: a read-only view that shares its memory
+    (writes copy the touched columns first), or a full copy with ``copy=True``.
+    """
+    return df.copy() if copy else df.copy(deep=False)
+
+
+def load_tasks(excel_path=None, date_from=None, date_to=None, copy=False,
+               columns=None, emp_ids=None, names=None) -> pd.DataFrame:
+    """
+    Load the task history with the columns in DATA_COLUMNS order, typed once by
+    normalise_task_frame: datetime 'Date', categorical CATEGORY_COLUMNS and
+    float32 effort/performance columns. The frame is flagged (is_normalised),
+    so readers skip their own conversions.
+
+    Filters are pushed down into the backend, so it reads only what is asked for:
+
+    - ``date_from``/``date_to``: inclusive date range (index range scan in SQLite)
+    - ``columns``: only these DATA_COLUMNS (in DATA_COLUMNS order, no score columns)
+    - ``emp_ids``: only these employees (case-insensitive 'Emp Id')
+    - ``names``: only these names (case-insensitive, surrounding spaces ignored)
+
+    Parsed frames are cached process-wide and reused until the backing files
+    change (mtime/size). Callers share the cached data instead of copying it
+    (see shared_frame): treat the frame as read-only, filter it with masks, and
+    pass ``copy=True`` to get a private copy for heavy in-place edits. A cached
+    frame that holds every requested row and column (e.g. the full history)
+    serves narrower reads without touching the store.
+
+    'Employee Performance (%)' shows the scores of the active formula version
+    where the recompute job has stored them (see apply_active_scores).
+    """
+    date_from, date_to = as_date(date_from), as_date(date_to)
+    columns, emp_ids, names = _query_key(columns, emp_ids, names)
+    query = (date_from, date_to, columns, emp_ids, names)
+    backend = get_backend(excel_path)
+    score_version = configured_score_version()
+    store_key = (backend.name, os.path.abspath(backend.excel_path), score_version)
+    key = store_key + query
+    full_key = store_key + (None,) * len(query)
+    signature = backend.signature()
+    with _frame_cache_lock:
+        cached = _frame_cache.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            _cache_stats['hits'] += 1
+            return shared_frame(cached[1], copy)
+        # Narrow a cached frame that covers the request (the full history first)
+        candidates = sorted(_frame_cache, key=lambda k: k != full_key)
+        for other_key in candidates:
+            other = _frame_cache[other_key]
+            if other_key[:3] != store_key or signature is None or other[0] != signature:
+                continue
+            if not _covers(other_key[3:], query):
+                continue
+            _cache_stats['hits'] += 1
+            df = filter_tasks(other[1], date_from, date_to, emp_ids, names)
+            if columns is not None:
+                df = df[list(columns)]
+            return shared_frame(df.reset_index(drop=True), copy)
+        _cache_stats['misses'] += 1
+
+    # Keyed by the signature taken before reading: a write racing with the load
+    # only costs an extra miss next time
+    df = _load_normalised(backend, date_from, date_to, score_version, columns, emp_ids, names)
+    with _frame_cache_lock:
+        # Drop stale frames of this store and keep only a few date ranges around
+        for other_key in [k for k in _frame_cache if k[:2] == store_key[:2]]:
+            if _frame_cache[other_key][0] != signature or other_key[2] != score_version:
+                del _frame_cache[other_key]
+        range_keys = [k for k in _frame_cache if k[:3] == store_key and k != full_key]
+        for other_key in range_keys[:max(0, len(range_keys) - MAX_CACHED_RANGES + 1)]:
+            del _frame_cache[other_key]
+        _frame_cache[key] = (signature, df)
+    return shared_frame(df, copy)
+
+
+def load_daily_rollup(excel_path=None, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    Per-day, per-employee totals (ROLLUP_COLUMNS), optionally limited to
+    [date_from, date_to].
+
+    The SQLite store maintains the rollup on every append, so reading it costs
+    O(days x employees) instead of O(tasks). The Excel backend derives it from
+    the cached task frame. Results are cached like load_tasks.
+    """
+    date_from, date_to = as_date(date_from), as_date(date_to)
+    backend = get_backend(excel_path)
+    key = (backend.name, os.path.abspath(backend.excel_path), configured_score_version(), date_from, date_to)
+    signature = backend.signature()
+    with _frame_cache_lock:
+        cached = _rollup_cache.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return shared_frame(cached[1])
+
+    if hasattr(backend, 'load_rollup'):
+        rollup = with_rollup_mean(backend.load_rollup(date_from, date_to))
+    else:
+        rollup = rollup_from_frame(load_tasks(backend.excel_path, date_from, date_to))
+    with _frame_cache_lock:
+        for other_key in [k for k in _rollup_cache if k[:2] == key[:2]]:
+            if _rollup_cache[other_key][0] != signature or other_key[2] != key[2]:
+                del _rollup_cache[other_key]
+        store_keys = [k for k in _rollup_cache if k[:2] == key[:2]]
+        for other_key in store_keys[:max(0, len(store_keys) - MAX_CACHED_RANGES)]:
+            del _rollup_cache[other_key]
+        _rollup_cache[key] = (signature, rollup)
+    return shared_frame(rollup)
+
+
+def data_version(excel_path=None) -> int:
+    """
+    Monotonically increasing version of the stored task data, bumped by every
+    append, date normalisation and score recompute.
+
+    Use it (plus any filter parameters) as the key of derived caches instead of
+    hashing frames. Only a stat() call while the store is unchanged.
+    """
+    backend = get_backend(excel_path)
+    key = (backend.name, os.path.abspath(backend.excel_path))
+    signature = backend.signature()
+    with _frame_cache_lock:
+        cached = _version_cache.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+    version = backend.data_version()
+    with _frame_cache_lock:
+        _version_cache[key] = (signature, version)
+    return version
+
+
+def next_import_version() -> int:
+    """
+    New process-wide version for data imported outside the store (uploaded
+    reports), so caches keyed on it never collide between sessions.
+    """
+    with _frame_cache_lock:
+        _import_versions['last'] += 1
+        return _import_versions['last']
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the shared task frame cache."""
+    with _frame_cache_lock:
+        return {**_cache_stats, 'entries': len(_frame_cache)}
+
+
+def clear_cache():
+    with _frame_cache_lock:
+        _frame_cache.clear()
+        _rollup_cache.clear()
+        _version_cache.clear()
+        _cache_stats['hits'] = 0
+        _cache_stats['misses'] = 0
+
+
+def append_tasks(rows, excel_path=None, wal_seq=None, wal_slot=0, submission_ids=None) -> int:
+    """
+    Append submitted task rows (list of dicts keyed by DATA_COLUMNS).
+
+    ``submission_ids`` holds, per row, the key of the report submission it
+    belongs to (per-submission formulas score each submission on its own); by
+    default all rows are one submission. ``wal_seq`` is the last entry of
+    write-ahead log ``wal_slot`` the rows come from; the store records it in
+    the same commit (see applied_wal_seq).
+    """
+    if not rows:
+        return 0
+    return get_backend(excel_path).append(rows, wal_seq=wal_seq, wal_slot=wal_slot, submission_ids=submission_ids)
+
+
+def update_tasks(changes, excel_path=None) -> int:
+    """
+    Correct stored rows: ``changes`` maps a row id ('Row Id' of the scoring
+    frame) to {column: new value}. The SQLite store only appends a patch;
+    compact_store folds patches into the rows later. Returns rows patched.
+    """
+    if not changes:
+        return 0
+    return get_backend(excel_path).update(changes)
+
+
+def delete_tasks(row_ids, excel_path=None) -> int:
+    """Delete stored rows by row id (tombstones in the SQLite store). Returns rows deleted."""
+    row_ids = list(row_ids)
+    if not row_ids:
+        return 0
+    return get_backend(excel_path).delete(row_ids)
+
+
+def compact_store(excel_path=None, min_edits=1) -> int:
+    """
+    Fold recorded edits into the stored rows once at least ``min_edits`` are
+    outstanding (run off the request path by the dashboard worker). Returns
+    the number of edits folded.
+    """
+    backend = get_backend(excel_path)
+    if backend.pending_edits() < min_edits:
+        return 0
+    folded = backend.compact()
+    if folded:
+        logging.info(f"Compacted {folded} edit(s) into the {backend.name} task store")
+    return folded
+
+
+def check_write_access(excel_path=None):
+    """
+    Raise (PermissionError, OSError) unless the workbook and its folder can be
+    written, without changing the workbook: it is opened for update but not
+    written, and a scratch file is created and removed next to it.
+    """
+    if excel_path is None:
+        excel_path = DEFAULT_EXCEL_PATH
+    if os.path.exists(excel_path):
+        with open(excel_path, 'r+b'):
+            pass
+    directory = os.path.dirname(os.path.abspath(excel_path))
+    fd, scratch_path = tempfile.mkstemp(prefix='.write-test-', dir=directory)
+    os.close(fd)
+    os.remove(scratch_path)
+
+
+def applied_wal_seq(excel_path=None, wal_slot=0) -> int:
+    """Sequence number of the last entry of write-ahead log ``wal_slot`` the store has applied."""
+    return get_backend(excel_path).applied_wal_seq(wal_slot)
+
+
+def data_sheet_frame(excel_path=None) -> pd.DataFrame:
+    """
+    The task rows in the shape export_workbook writes them to the data sheet.
+
+    With the Excel backend these are the workbook's own values as read (dates and
+    submitted scores untouched), so rewriting the sheet leaves it unchanged.
+    """
+    if excel_path is None:
+        excel_path = DEFAULT_EXCEL_PATH
+    backend = get_backend(excel_path)
+    if backend.name == ExcelTaskBackend.name:
+        return export_frame(backend.load())
+    return export_frame(load_tasks(excel_path))
+
+
+def workbook_store_state(excel_path=None) -> dict | None:
+    """
+    The hidden state sheet's values ({key: value}) a rewritten workbook has to
+    keep: the Excel backend records its applied write-ahead log entries there.
+    None for backends that keep their state elsewhere.
+    """
+    backend = get_backend(excel_path)
+    if backend.name != ExcelTaskBackend.name:
+        return None
+    return backend.store_state()
+
+
+def export_workbook(excel_path=None) -> pd.DataFrame:
+    """
+    Write the stored task history to the workbook's data sheet and return it.
+
+    With the Excel backend the workbook already is the store, so it is only read.
+    Other sheets of an existing workbook (the dashboards) are kept, so they can
+    be updated incrementally afterwards.
+    """
+    if excel_path is None:
+        excel_path = DEFAULT_EXCEL_PATH
+    backend = get_backend(excel_path)
+    df = load_tasks(excel_path)
+    if backend.name != ExcelTaskBackend.name:
+        export_df = export_frame(df)
+        if os.path.exists(excel_path):
+            writer_args = {'mode': 'a', 'if_sheet_exists': 'replace'}
+        else:
+            writer_args = {'mode': 'w'}
+        # Edit a copy and rename it into place: a crash mid-write keeps the old workbook
+        with atomic_file(excel_path, copy_existing=True) as temp_path:
+            with pd.ExcelWriter(temp_path, engine='openpyxl', **writer_args) as writer:
+                export_df.to_excel(writer, index=False, sheet_name=DATA_SHEET_NAME)
+    return df
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_EXCEL_PATH
+    if len(sys.argv) > 1 and sys.argv[1] == "export":
+        exported = export_workbook(target)
+        print(f"Exported {len(exported)} rows to {target}")
+    elif len(sys.argv) > 1 and sys.argv[1] == "count":
+        print(f"{get_backend(target).count()} rows in {get_backend(target).name} task store")
+    else:
+        print("Usage: python task_store.py [export|count] [excel_path]")
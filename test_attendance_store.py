@@ -0,0 +1,234 @@
+import csv
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import attendance_store
+
+
+@pytest.fixture
+def attendance_file(tmp_path, monkeypatch):
+    path = tmp_path / 'attendance_records.csv'
+    monkeypatch.setattr(attendance_store, 'ATTENDANCE_FILE', str(path))
+    monkeypatch.setattr(attendance_store, 'EMP_FILE', str(tmp_path / 'employees.json'))
+    monkeypatch.setattr(attendance_store, 'ATTENDANCE_DB', str(tmp_path / 'attendance.db'))
+    monkeypatch.setattr(attendance_store, 'CONFIG_FILE', str(tmp_path / 'config.json'))
+    monkeypatch.setattr(attendance_store, 'RECHECK_SECONDS', 0)
+    return path
+
+
+def use_sqlite(tmp_path):
+    (tmp_path / 'config.json').write_text(json.dumps({'attendance_store_backend': 'sqlite'}))
+
+
+def write_row(path, emp_id, status, timestamp):
+    attendance_store.ensure_files()
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow([emp_id, status, timestamp.isoformat(), timestamp.isoformat(), ''])
+
+
+def test_today_lookups_follow_appends(attendance_file):
+    assert not attendance_store.check_already_checked_in_today('P-ASHA')
+
+    write_row(attendance_file, 'P-ASHA', 'WFO', datetime.now() - timedelta(days=1))
+    attendance_store.append_attendance('P-RAVI', 'WFH')
+    assert not attendance_store.check_already_checked_in_today('P-ASHA')
+    assert attendance_store.check_already_checked_in_today('P-RAVI')
+
+    # Rows written by another process are picked up, and the latest one wins
+    attendance_store.append_attendance('P-ASHA', 'WFH', notes='morning,\nthen office')
+    write_row(attendance_file, 'P-ASHA', 'WFO', datetime.now())
+    assert attendance_store.latest_attendance('P-ASHA')['status'] == 'WFO'
+    yesterday = (datetime.now() - timedelta(days=1)).date()
+    assert attendance_store.latest_attendance('P-ASHA', yesterday)['status'] == 'WFO'
+
+    # A partly written row is not indexed until it is complete
+    with open(attendance_file, 'a', encoding='utf-8') as f:
+        f.write(f"P-MEERA,On Leave,{datetime.now().isoformat()}")
+    assert attendance_store.latest_attendance('P-MEERA') is None
+    with open(attendance_file, 'a', encoding='utf-8') as f:
+        f.write(',,\n')
+    assert attendance_store.latest_attendance('P-MEERA')['status'] == 'On Leave'
+
+
+def test_index_keeps_only_recent_days(attendance_file, monkeypatch):
+    now = datetime.now()
+    for days_ago in (30, 3, 1, 0):
+        write_row(attendance_file, 'P-ASHA', f"WFO-{days_ago}", now - timedelta(days=days_ago))
+    assert attendance_store.latest_attendance('P-ASHA')['status'] == 'WFO-0'
+    assert sorted(attendance_store._index['by_day']) == [(now - timedelta(days=1)).date(), now.date()]
+
+    # Older days are still answered, from the file
+    old_day = (now - timedelta(days=30)).date()
+    assert attendance_store.latest_attendance('P-ASHA', old_day)['status'] == 'WFO-30'
+    assert attendance_store.daily_attendance(old_day).with_status('WFO-30') == ['P-ASHA']
+
+    # Days leave the index as the window moves on
+    monkeypatch.setattr(attendance_store, 'INDEXED_DAYS', 1)
+    assert attendance_store.latest_attendance('P-ASHA')['status'] == 'WFO-0'
+    assert sorted(attendance_store._index['by_day']) == [now.date()]
+    assert sorted(attendance_store._index['summaries']) == [now.date()]
+
+
+def test_index_reads_only_the_tail_of_a_long_history(attendance_file, monkeypatch):
+    now = datetime.now()
+    attendance_store.ensure_files()
+    with open(attendance_file, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for row in range(5000):
+            old = (now - timedelta(days=30, minutes=5000 - row)).isoformat()
+            writer.writerow([f"P-{row % 50:03d}", 'WFO', old, old, 'line one\nline two' if row % 7 else ''])
+        for days_ago, status in ((1, 'WFH'), (0, 'WFO')):
+            recent = (now - timedelta(days=days_ago)).isoformat()
+            writer.writerow(['P-001', status, recent, recent, 'quoted, "notes"\n'])
+    parsed = []
+    record_day = attendance_store._record_day
+    monkeypatch.setattr(attendance_store, '_record_day', lambda value: parsed.append(value) or record_day(value))
+
+    assert attendance_store.latest_attendance('P-001')['status'] == 'WFO'
+    assert attendance_store.latest_attendance('P-001', (now - timedelta(days=1)).date())['status'] == 'WFH'
+    assert sorted(attendance_store._index['by_day']) == [(now - timedelta(days=1)).date(), now.date()]
+    assert len(parsed) < 1000
+
+
+def test_replaced_file_is_reindexed(attendance_file):
+    attendance_store.append_attendance('P-ASHA', 'WFO')
+    assert attendance_store.check_already_checked_in_today('P-ASHA')
+
+    os.remove(attendance_file)
+    attendance_store.ensure_files()
+    write_row(attendance_file, 'P-RAVI', 'WFH', datetime.now())
+    assert not attendance_store.check_already_checked_in_today('P-ASHA')
+    assert attendance_store.latest_attendance('P-RAVI')['status'] == 'WFH'
+
+
+def test_sqlite_backend_imports_the_files_once(tmp_path, attendance_file):
+    write_row(attendance_file, 'P-ASHA', 'WFO', datetime(2025, 11, 7, 9, 30))
+    attendance_store.append_attendance('P-ASHA', 'WFH')
+    assert attendance_store.create_employee('p-asha', 'secret', name='Asha', email='asha@example.com') == (
+        True, 'Account created successfully')
+
+    use_sqlite(tmp_path)
+    assert attendance_store.migrate_to_sqlite()['attendance'] == 2
+    assert attendance_store.verify_login('P-ASHA', 'secret') == (True, 'Asha', '')
+    assert attendance_store.create_employee('P-ASHA', 'other', name='Asha')[0] is False
+    assert attendance_store.check_already_checked_in_today('P-ASHA')
+
+    attendance_store.append_attendance('P-RAVI', 'On Leave', notes='sick')
+    assert attendance_store.latest_attendance('P-RAVI')['notes'] == 'sick'
+    assert len(attendance_store.load_attendance()) == 3
+    assert [r['status'] for r in attendance_store.load_attendance_range('2025-11-01', '2025-11-30')] == ['WFO']
+    assert len(attendance_store.load_attendance_range(date_from=datetime.now().date(), emp_id='P-ASHA')) == 1
+
+    employees = attendance_store.load_employees()
+    employees['P-RAVI'] = {'name': 'Ravi', 'password': 'x', 'teams_id': 42}
+    del employees['P-ASHA']
+    attendance_store.save_employees(employees)
+    assert attendance_store.load_employees() == {'P-RAVI': {'name': 'Ravi', 'password': 'x', 'teams_id': 42}}
+
+    # The files are left alone once imported
+    write_row(attendance_file, 'P-MEERA', 'WFO', datetime.now())
+    assert attendance_store.latest_attendance('P-MEERA') is None
+    assert attendance_store.migrate_to_sqlite()['attendance'] == 2
+
+
+def test_employee_directory_is_cached_and_indexed(tmp_path, attendance_file, monkeypatch):
+    attendance_store.create_employee('p-asha', 'secret', name='Asha Rao', email='Asha@Example.com', department='QA')
+    attendance_store.create_employee('p-ravi', 'secret', name='Ravi', department=' qa ')
+    assert attendance_store.find_employee_by_email('asha@example.com')[0] == 'P-ASHA'
+    assert list(attendance_store.find_employees_by_name('asha rao')) == ['P-ASHA']
+    assert list(attendance_store.find_employees_by_department('QA')) == ['P-ASHA', 'P-RAVI']
+
+    # Changes written by another process are picked up from the file's stats
+    employees = json.loads((tmp_path / 'employees.json').read_text())
+    employees['P-MEERA'] = {'name': 'Meera', 'email': 'meera@example.com', 'password': 'x'}
+    (tmp_path / 'employees.json').write_text(json.dumps(employees))
+    assert attendance_store.find_employee_by_email('MEERA@example.com')[0] == 'P-MEERA'
+
+    # Between checks, logins are answered from memory alone
+    monkeypatch.setattr(attendance_store, 'RECHECK_SECONDS', 3600)
+    attendance_store.check_employee_exists('P-ASHA')
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError('the directory cache went to disk')
+
+    monkeypatch.setattr(attendance_store.os, 'stat', no_disk)
+    monkeypatch.setattr(attendance_store, '_load_employees_json', no_disk)
+    assert attendance_store.verify_login('p-asha', 'secret') == (True, 'Asha Rao', '')
+    assert attendance_store.verify_login('p-asha', 'wrong') == (False, None, None)
+
+
+@pytest.mark.parametrize('backend', ['csv', 'sqlite'])
+def test_daily_summary_follows_check_ins(tmp_path, attendance_file, backend):
+    if backend == 'sqlite':
+        use_sqlite(tmp_path)
+    today = datetime.now().date()
+    attendance_store.append_attendance('P-ASHA', 'WFO', client_time=f'{today}T09:05:00')
+    attendance_store.append_attendance('p-ravi', 'WFH', client_time=f'{today}T11:40:00')
+    attendance_store.append_attendance('P-MEERA', 'On Leave')
+    summary = attendance_store.daily_attendance()
+    assert summary.with_status('WFO') == ['P-ASHA']
+    assert summary.late == {'P-RAVI'}
+    assert summary.absent(['P-ASHA', 'P-RAVI', 'P-MEERA', 'P-JOHN']) == ['P-JOHN']
+
+    # A second check-in replaces the first instead of being counted twice
+    attendance_store.append_attendance('P-ASHA', 'WFH', client_time=f'{today}T10:45:00')
+    summary = attendance_store.daily_attendance(today)
+    assert (summary.count('WFO'), summary.count('WFH'), summary.count('On Leave')) == (0, 2, 1)
+    assert summary.present == {'P-ASHA', 'P-RAVI', 'P-MEERA'}
+    assert summary.late == {'P-ASHA', 'P-RAVI'}
+    assert not attendance_store.daily_attendance(today - timedelta(days=1)).latest
+
+
+@pytest.mark.parametrize('backend', ['csv', 'sqlite'])
+def test_repeated_check_ins_count_once_under_the_latest_status(tmp_path, attendance_file, backend):
+    if backend == 'sqlite':
+        use_sqlite(tmp_path)
+    today = datetime.now().date()
+    attendance_store.append_attendance('P-ASHA', 'WFO', client_time=f'{today}T11:00:00')
+    attendance_store.append_attendance('P-ASHA', 'WFH', client_time=f'{today}T09:00:00')
+    attendance_store.append_attendance('P-RAVI', 'WFO', client_time=f'{today}T09:30:00')
+    attendance_store.append_attendance('P-RAVI', 'WFO', client_time=f'{today}T09:45:00')
+
+    summary = attendance_store.daily_attendance()
+    # Not 3 WFO + 1 WFH: each employee counts once, as of their last check-in
+    assert {status: summary.count(status) for status in ('WFO', 'WFH')} == {'WFO': 1, 'WFH': 1}
+    assert summary.count('WFO') + summary.count('WFH') == len(summary.present) == 2
+    assert summary.with_status('WFH') == ['P-ASHA']
+    assert summary.late == set()
+
+
+@pytest.mark.parametrize('backend', ['csv', 'sqlite'])
+def test_attendance_frame_is_parsed_and_merged_column_wise(tmp_path, attendance_file, backend):
+    if backend == 'sqlite':
+        use_sqlite(tmp_path)
+    attendance_store.append_attendance('p-asha', 'WFO')
+    attendance_store.append_attendance('P-GONE', 'WFH', notes='left the company')
+    if backend == 'csv':
+        with open(attendance_file, 'a', encoding='utf-8') as f:
+            f.write('P-ASHA,WFH,2025-11-07T09:30:00+05:30,,\nP-ASHA,WFO,not a date,,\n')
+
+    frame = attendance_store.load_attendance_frame()
+    df = attendance_store.with_employee_details(frame, {'P-ASHA': {'name': 'Asha', 'department': 'QA'}})
+    assert df['name'].tolist()[:2] == ['Asha', 'P-GONE']
+    assert df['department'].tolist()[:2] == ['QA', '']
+    assert df['notes'].tolist()[:2] == ['', 'left the company']
+    assert (df['date'].iloc[:2] == pd.Timestamp(datetime.now().date())).all()
+    if backend == 'csv':
+        assert df['timestamp'].iloc[2] == pd.Timestamp('2025-11-07 09:30')
+        assert pd.isna(df['date'].iloc[3])
+
+
+def test_timestamps_sharing_one_offset_parse_naive(attendance_file):
+    attendance_store.ensure_files()
+    with open(attendance_file, 'a', encoding='utf-8') as f:
+        f.write('P-ASHA,WFO,2025-11-07T09:30:00+05:30,,\nP-RAVI,WFH,2025-11-08T10:00:00+05:30,,\n')
+
+    frame = attendance_store.load_attendance_frame()
+    df = attendance_store.with_employee_details(frame, {})
+    assert df['timestamp'].dt.tz is None
+    assert df['timestamp'].tolist() == [pd.Timestamp('2025-11-07 09:30'), pd.Timestamp('2025-11-08 10:00')]
+    assert (df['date'] >= pd.Timestamp('2025-11-08')).tolist() == [False, True]
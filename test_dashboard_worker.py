@@ -0,0 +1,60 @@
+"""
+Tests for the background workbook/dashboard rebuild worker
+Run with: python -m pytest test_dashboard_worker.py
+"""
+
+import json
+
+from openpyxl import load_workbook
+
+import dashboard_worker
+import task_store
+from test_task_store import make_row
+from workbook_dashboard import SUMMARY_SHEET_NAME
+
+
+def test_burst_of_submissions_triggers_one_rebuild(tmp_path, monkeypatch):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'task_store_backend': 'sqlite'}))
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    worker = dashboard_worker.DashboardWorker(excel_path, debounce_seconds=0.2, max_delay_seconds=5)
+
+    for name in ['Asha', 'Ravi', 'Asha', 'Mira', 'Ravi']:
+        task_store.append_tasks([make_row(name)], excel_path)
+        worker.request_rebuild()
+    assert worker.status()['pending_changes'] == 5
+
+    assert worker.wait_until_idle(timeout=10)
+    status = worker.status()
+    assert status['builds_completed'] == 1
+    assert status['pending_changes'] == 0
+    assert status['last_build_rows'] == 5
+    assert status['last_error'] is None
+    assert SUMMARY_SHEET_NAME in load_workbook(excel_path).sheetnames
+
+
+def test_streaming_build_keeps_the_excel_data_sheet(tmp_path, monkeypatch):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'task_store_backend': 'excel', 'dashboard_build_mode': 'streaming'}))
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+    task_store.clear_cache()
+
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([
+        make_row('Asha', date='11/05/2025'),
+        make_row('Ravi', date='garbage'),
+        make_row('Mira', effort=3.5),
+    ], excel_path)
+    before = list(load_workbook(excel_path)[task_store.DATA_SHEET_NAME].values)
+
+    rows, result = dashboard_worker.build_workbook(excel_path)
+
+    assert rows == 3
+    assert result['mode'] == 'streaming'
+    book = load_workbook(excel_path)
+    assert list(book[task_store.DATA_SHEET_NAME].values) == before
+    assert SUMMARY_SHEET_NAME in book.sheetnames
@@ -0,0 +1,52 @@
+"""
+Tests for the Excel reader layer
+Run with: python -m pytest test_excel_reader.py
+"""
+
+import logging
+
+import pandas as pd
+
+import excel_reader
+import task_store
+
+
+def write_workbook(excel_path):
+    data = pd.DataFrame({
+        'Date': ['2025-11-08', '2025-11-09'],
+        'Emp Id': [1024, None],
+        'Name': ['Asha', 'Ravi'],
+        'Effort (in hours)': [2.0, 3.5],
+        'Notes': ['not a task column', ''],
+    })
+    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Employee': ['Asha']}).to_excel(writer, index=False, sheet_name='Summary')
+        data.to_excel(writer, index=False, sheet_name=task_store.DATA_SHEET_NAME)
+
+
+def test_read_data_sheet_reads_only_task_columns(tmp_path):
+    excel_path = tmp_path / 'task_tracker.xlsx'
+    write_workbook(excel_path)
+
+    df = task_store.read_data_sheet(excel_path, engine='openpyxl')
+
+    assert list(df.columns) == ['Date', 'Emp Id', 'Name', 'Effort (in hours)']
+    assert df['Emp Id'].tolist()[0] == '1024'
+    assert pd.isna(df['Emp Id'].tolist()[1])
+    assert df['Effort (in hours)'].tolist() == [2.0, 3.5]
+
+
+def test_missing_engine_falls_back_to_openpyxl(tmp_path, monkeypatch, caplog):
+    excel_path = tmp_path / 'task_tracker.xlsx'
+    write_workbook(excel_path)
+    monkeypatch.setattr(excel_reader, 'engine_available', lambda engine: engine == 'openpyxl')
+
+    assert excel_reader.resolve_engine('auto') == 'openpyxl'
+    with caplog.at_level(logging.WARNING):
+        df = excel_reader.read_sheet(excel_path, task_store.DATA_SHEET_NAME, engine='calamine')
+    assert 'not installed' in caplog.text
+    assert df['Name'].tolist() == ['Asha', 'Ravi']
+
+    # Only one sheet, named differently: read the first one
+    pd.DataFrame({'Name': ['Mira']}).to_excel(tmp_path / 'other.xlsx', index=False, sheet_name='Report')
+    assert excel_reader.read_sheet(tmp_path / 'other.xlsx', task_store.DATA_SHEET_NAME)['Name'].tolist() == ['Mira']
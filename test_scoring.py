@@ -0,0 +1,232 @@
+"""
+Tests for the vectorised task scoring
+Run with: python -m pytest test_scoring.py
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboard_worker
+import scoring
+import submission_queue
+import task_store
+from benchmarks import make_task_frame
+
+
+@pytest.fixture
+def store_config(tmp_path, monkeypatch):
+    """Temporary config.json for the task store; returns a function updating it."""
+    config_path = tmp_path / 'config.json'
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+    task_store.clear_cache()
+
+    def configure(**values):
+        config = json.loads(config_path.read_text()) if config_path.exists() else {}
+        config.update(values)
+        config_path.write_text(json.dumps(config))
+
+    configure(task_store_backend='sqlite')
+    return configure
+
+
+def make_row(name, priority, effort, perf, date='2025-11-08'):
+    row = {col: '' for col in task_store.DATA_COLUMNS}
+    row.update({
+        'Date': date, 'Emp Id': f"P-{name[:3].upper()}", 'Name': name, 'Task Title': f"{name} task",
+        'Task Priority': priority, 'Task Status': 'Completed', 'Effort (in hours)': effort,
+        'Employee Performance (%)': perf,
+    })
+    return row
+
+
+def legacy_task_performance(row):
+    """Row-by-row scoring as main.calculate_task_performance used to do it."""
+    priority_scores = {'Critical': 100, 'High': 75, 'Medium': 50, 'Low': 25}
+    base_score = priority_scores.get(str(row.get('Task Priority', 'Medium')).strip().title(), 50)
+    status = str(row.get('Task Status', '')).lower().strip()
+    if any(keyword in status for keyword in ['complet', 'done', 'finish', 'closed']):
+        multiplier = 1.0
+    elif any(keyword in status for keyword in ['progress', 'ongoing', 'working', 'active', 'started']):
+        multiplier = 0.65
+    else:
+        multiplier = 0.30
+    return round(base_score * multiplier, 2)
+
+
+def legacy_employee_performance(emp_df):
+    """iterrows() version of main.calculate_performance_from_priority."""
+    weights = {'Critical': 100, 'High': 75, 'Medium': 50, 'Low': 25}
+    total_weighted_score = 0
+    total_possible_score = 0
+    counts = {'completed': 0, 'in_progress': 0, 'pending': 0}
+    for _, row in emp_df.iterrows():
+        weight = weights.get(str(row.get('Task Priority', 'Medium')).strip().title(), 50)
+        status = str(row.get('Task Status', '')).lower().strip()
+        if any(keyword in status for keyword in ['complet', 'done', 'finish', 'closed']):
+            multiplier = 1.0
+            counts['completed'] += 1
+        elif any(keyword in status for keyword in ['progress', 'ongoing', 'working', 'active', 'started']):
+            multiplier = 0.5
+            counts['in_progress'] += 1
+        else:
+            multiplier = 0.3
+            counts['pending'] += 1
+        total_weighted_score += weight * multiplier
+        total_possible_score += weight
+    avg = round((total_weighted_score / total_possible_score) * 100, 2) if total_possible_score > 0 else 0.0
+    if counts['completed'] == 0 and counts['in_progress'] == 0:
+        avg = max(avg, 30.0)
+    return {'avg_performance': avg, **counts}
+
+
+def legacy_submission_performance(tasks_list):
+    """main.calculate_performance before it moved into the scoring engine."""
+    priority_weights = {'Low': 1, 'Medium': 2, 'High': 3, 'Critical': 4}
+    total_priority_weight = 0
+    total_effort = 0
+    for task in tasks_list:
+        try:
+            effort = float(task.get('Effort (in hours)', 0))
+        except Exception:
+            effort = 0.0
+        total_priority_weight += priority_weights.get(task.get('Task Priority', 'Low'), 1)
+        total_effort += effort
+    if total_effort == 0:
+        return 0.0
+    return min(round((total_priority_weight / total_effort) * 100, 2), 100.0)
+
+
+def messy_frame():
+    df = make_task_frame(2000, employees=7, seed=3)
+    df['Task Priority'] = df['Task Priority'].astype(object)
+    df['Task Status'] = df['Task Status'].astype(object)
+    df.loc[::7, 'Task Priority'] = ' high '
+    df.loc[::11, 'Task Priority'] = None
+    df.loc[::13, 'Task Priority'] = 'Urgent'
+    df.loc[::5, 'Task Status'] = 'DONE'
+    df.loc[::9, 'Task Status'] = 'Work started'
+    df.loc[::17, 'Task Status'] = np.nan
+    return df
+
+
+def test_task_scores_match_row_by_row_scoring():
+    df = messy_frame()
+    expected = df.apply(legacy_task_performance, axis=1).tolist()
+    assert scoring.task_scores(df).tolist() == expected
+    # Categorical columns (as loaded from the task store) score the same
+    compact = df.astype({'Task Priority': 'category', 'Task Status': 'category'})
+    assert scoring.task_scores(compact).tolist() == expected
+
+
+def test_employee_scores_match_iterrows_version():
+    df = messy_frame()
+    per_employee = scoring.score_employees(df)
+    for name, emp_df in df.groupby('Name'):
+        expected = legacy_employee_performance(emp_df)
+        assert scoring.score_employee(emp_df) == expected
+        assert per_employee.loc[name].to_dict() == expected
+
+    # Nothing started yet: the assigned-work floor applies
+    pending = pd.DataFrame({'Task Priority': ['Low', 'Low'], 'Task Status': ['Pending', 'Blocked']})
+    assert scoring.score_employee(pending) == legacy_employee_performance(pending)
+    # Missing columns fall back to Medium / pending like row.get() did
+    assert scoring.score_employee(pd.DataFrame({'Name': ['Asha']}))['avg_performance'] == 30.0
+
+
+def test_submission_formula_matches_calculate_performance():
+    df = make_task_frame(3000, employees=9, days=30, seed=5)
+    df['Effort (in hours)'] = np.random.default_rng(1).uniform(0.25, 9.5, len(df)).round(2)
+    df.loc[::19, 'Task Priority'] = 'urgent'
+    scores = scoring.FORMULAS[task_store.DEFAULT_SCORE_VERSION].score(df)
+    for _, report in df.groupby(['Date', 'Emp Id', 'Name']):
+        expected = legacy_submission_performance(report.to_dict('records'))
+        assert set(scores[report.index]) == {expected}
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_recompute_writes_versioned_scores(tmp_path, store_config, monkeypatch, backend):
+    store_config(task_store_backend=backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    df = make_task_frame(400, employees=4, days=10, seed=2)
+    task_store.append_tasks(df.to_dict('records'), excel_path)
+
+    # Chunked process-pool path and the in-process path agree
+    monkeypatch.setattr(scoring, 'MIN_PARALLEL_ROWS', 0)
+    assert scoring.recompute_scores(excel_path, 'task_status_v1', workers=2) == 400
+    loaded = task_store.load_tasks(excel_path)
+    expected = scoring.task_scores(df)
+    assert loaded[task_store.score_column('task_status_v1')].tolist() == expected.tolist()
+
+    # Dashboards read the active version through the performance column and rollup
+    assert loaded['Employee Performance (%)'].tolist() == df['Employee Performance (%)'].astype('float32').tolist()
+    store_config(score_version='task_status_v1')
+    loaded = task_store.load_tasks(excel_path)
+    assert loaded['Employee Performance (%)'].tolist() == expected.astype('float32').tolist()
+    rollup = task_store.load_daily_rollup(excel_path)
+    assert rollup['Performance Sum'].sum() == pytest.approx(expected.sum())
+
+
+def test_submission_scores_are_not_recomputed_without_submission_keys(tmp_path, store_config):
+    store_config(task_store_backend='excel')
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    df = make_task_frame(20, employees=2, days=2, seed=3)
+    task_store.append_tasks(df.to_dict('records'), excel_path)
+
+    with pytest.raises(ValueError, match='Submission Id'):
+        scoring.recompute_scores(excel_path, task_store.DEFAULT_SCORE_VERSION)
+    assert task_store.score_column(task_store.DEFAULT_SCORE_VERSION) not in task_store.load_tasks(excel_path).columns
+
+
+def test_submission_scores_are_recomputed_per_submission(tmp_path, store_config, monkeypatch):
+    monkeypatch.setattr(dashboard_worker, 'request_rebuild', lambda path, changes=1: None)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    # Two same-day reports in the legacy workbook, imported into SQLite with no submission key
+    store_config(task_store_backend='excel')
+    task_store.append_tasks([make_row('Asha', priority='High', effort=3.0, perf=100.0)], excel_path)
+    task_store.append_tasks([make_row('Asha', priority='Low', effort=8.0, perf=12.5)], excel_path)
+    store_config(task_store_backend='sqlite')
+    # And two same-day reports group-committed in one batch
+    queue = submission_queue.SubmissionQueue(excel_path, flush_interval_ms=200)
+    first = queue.submit([make_row('Ravi', priority='Critical', effort=4.0, perf=100.0)])
+    second = queue.submit([make_row('Ravi', priority='Low', effort=4.0, perf=25.0)])
+    assert [first.wait(timeout=10), second.wait(timeout=10)] == [1, 1]
+    assert queue.batches_written == 1
+
+    assert scoring.recompute_scores(excel_path, task_store.DEFAULT_SCORE_VERSION) == 2
+    loaded = task_store.load_tasks(excel_path)
+    assert loaded['Employee Performance (%)'].tolist() == [100.0, 12.5, 100.0, 25.0]
+    scores = loaded[task_store.score_column(task_store.DEFAULT_SCORE_VERSION)]
+    assert scores.iloc[:2].isna().all()
+
+
+def test_what_if_matches_row_scoring():
+    df = messy_frame()
+    features = scoring.FeatureMatrix(df)
+    weights = [scoring.PRIORITY_SCORES[level] for level in scoring.PRIORITY_LEVELS]
+    scores = features.score(weights, scoring.EMPLOYEE_STATUS_MULTIPLIERS).set_index('Name')
+
+    for name, emp_df in df.groupby('Name'):
+        bases = scoring.priority_scores(emp_df)
+        credit = (bases * np.array(scoring.EMPLOYEE_STATUS_MULTIPLIERS)[scoring.status_classes(emp_df)]).sum()
+        assert scores.loc[name, 'Weighted Credit (%)'] == round(credit / bases.sum() * 100, 2)
+        assert scores.loc[name, 'Tasks'] == len(emp_df)
+
+        per_hour = bases.sum() / emp_df['Effort (in hours)'].sum() * 100
+        assert scores.loc[name, 'Priority per Hour (%)'] == round(per_hour, 2)
+
+    ranked = scoring.what_if_scores(
+        features, [1, 2, 3, 5], scoring.EMPLOYEE_STATUS_MULTIPLIERS,
+        baseline=([1, 2, 3, 4], scoring.EMPLOYEE_STATUS_MULTIPLIERS)
+    )
+    assert ranked['Rank'].tolist() == sorted(ranked['Rank'])
+    assert ranked['Weighted Credit (%)'].is_monotonic_decreasing
+    # Same weights as the baseline: nothing moves
+    unchanged = scoring.what_if_scores(
+        features, [1, 2, 3, 4], scoring.EMPLOYEE_STATUS_MULTIPLIERS,
+        baseline=([1, 2, 3, 4], scoring.EMPLOYEE_STATUS_MULTIPLIERS)
+    )
+    assert (unchanged['Rank Change'] == 0).all()
@@ -0,0 +1,166 @@
+"""
+Tests for the group-commit submission queue
+Run with: python -m pytest test_submission_queue.py
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+import dashboard_worker
+import submission_queue
+import task_store
+import write_ahead_log
+from test_task_store import make_row
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'task_store_backend': 'sqlite'}))
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+    rebuilds = []
+    monkeypatch.setattr(dashboard_worker, 'request_rebuild', lambda path, changes=1: rebuilds.append(changes))
+    return str(tmp_path / 'task_tracker.xlsx'), rebuilds
+
+
+def test_concurrent_submissions_are_group_committed(sqlite_store):
+    excel_path, rebuilds = sqlite_store
+    queue = submission_queue.SubmissionQueue(excel_path, flush_interval_ms=200)
+    start = threading.Barrier(20)
+    results = []
+
+    def session(idx):
+        start.wait()
+        results.append(queue.submit([make_row(f"Emp{idx:02d}"), make_row(f"Emp{idx:02d}")]).wait(timeout=10))
+
+    threads = [threading.Thread(target=session, args=(idx,)) for idx in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [2] * 20
+    assert queue.submissions_written == 20
+    assert queue.batches_written < 20
+    assert sum(rebuilds) == 40
+    assert sorted(task_store.load_tasks(excel_path)['Name'].unique()) == [f"Emp{idx:02d}" for idx in range(20)]
+
+
+def test_failed_write_is_reported_to_every_submission(sqlite_store, monkeypatch):
+    excel_path, _ = sqlite_store
+
+    def broken_append(rows, path=None, wal_seq=None, wal_slot=0, submission_ids=None):
+        raise PermissionError("store is locked")
+
+    monkeypatch.setattr(task_store, 'append_tasks', broken_append)
+    queue = submission_queue.SubmissionQueue(excel_path, flush_interval_ms=50)
+    first = queue.submit([make_row('Asha')])
+    second = queue.submit([make_row('Ravi')])
+
+    for submission in (first, second):
+        with pytest.raises(PermissionError):
+            submission.wait(timeout=10)
+
+    # Nothing the sessions were told failed is replayed later
+    assert queue.wal.pending() == []
+
+
+def test_logged_submissions_are_replayed_once_after_a_crash(sqlite_store):
+    excel_path, rebuilds = sqlite_store
+    wal = write_ahead_log.WriteAheadLog(write_ahead_log.wal_path_for(excel_path))
+    committed = wal.append([make_row('Asha')])
+    lost = wal.append([make_row('Ravi'), make_row('Ravi')])
+    # The process died after committing the first entry but before trimming the log,
+    # and in the middle of logging a third one
+    task_store.append_tasks([make_row('Asha')], excel_path, wal_seq=committed)
+    with open(wal.path, 'a') as f:
+        f.write('{"seq": 99')
+
+    queue = submission_queue.SubmissionQueue(excel_path)
+
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Asha', 'Ravi', 'Ravi']
+    assert task_store.applied_wal_seq(excel_path) == lost
+    assert queue.replayed_rows == 2
+    assert rebuilds == [2]
+    assert queue.wal.pending() == []
+    assert queue.submit([make_row('Meera')]).wait(timeout=10) == 1
+    assert task_store.load_tasks(excel_path)['Name'].tolist()[-1] == 'Meera'
+
+
+def test_timed_out_submission_is_cancelled_only_if_not_yet_written(sqlite_store, monkeypatch):
+    excel_path, _ = sqlite_store
+    queue = submission_queue.SubmissionQueue(excel_path, flush_interval_ms=0)
+    release = threading.Event()
+    writing = threading.Event()
+    append_tasks = task_store.append_tasks
+
+    def slow_append(rows, path, wal_seq=None, wal_slot=0, submission_ids=None):
+        writing.set()
+        release.wait(10)
+        return append_tasks(rows, path, wal_seq=wal_seq, wal_slot=wal_slot, submission_ids=submission_ids)
+
+    monkeypatch.setattr(task_store, 'append_tasks', slow_append)
+    in_flight = queue.submit([make_row('Asha')])
+    assert writing.wait(10)
+    waiting = queue.submit([make_row('Ravi')])
+    with pytest.raises(TimeoutError):
+        waiting.wait(timeout=0.1)
+
+    assert queue.cancel(waiting)
+    assert not queue.cancel(in_flight)
+    with pytest.raises(RuntimeError):
+        waiting.wait(timeout=1)
+    release.set()
+    assert in_flight.wait(timeout=10) == 1
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Asha']
+    assert queue.wal.pending() == []
+
+
+def test_processes_sharing_a_store_never_trim_each_others_logs(sqlite_store):
+    excel_path, rebuilds = sqlite_store
+    # Three writer processes; the second and third log a report each but die before committing it
+    first, second, third = (submission_queue.SubmissionQueue(excel_path) for _ in range(3))
+    assert [queue.wal.slot for queue in (first, second, third)] == [0, 1, 2]
+    lost = second.wal.append([make_row('Ravi')])
+    also_lost = third.wal.append([make_row('Meera'), make_row('Meera')])
+    assert first.submit([make_row('Asha')]).wait(timeout=10) == 1
+    assert second.wal.pending() == [(lost, [make_row('Ravi')])]
+    second.wal.release()
+    third.wal.release()
+
+    restarted = submission_queue.SubmissionQueue(excel_path)
+
+    assert restarted.wal.slot == 1
+    assert restarted.replayed_rows == 3
+    assert sorted(task_store.load_tasks(excel_path)['Name'].tolist()) == ['Asha', 'Meera', 'Meera', 'Ravi']
+    assert task_store.applied_wal_seq(excel_path, 2) == also_lost
+    assert not os.path.exists(write_ahead_log.wal_path_for(excel_path, 2))
+    assert restarted.wal.pending() == []
+    assert sorted(rebuilds) == [1, 1, 2]
+
+
+def test_streaming_build_between_commit_and_trim_keeps_the_applied_entry(tmp_path, monkeypatch):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'task_store_backend': 'excel', 'dashboard_build_mode': 'streaming'}))
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+    task_store.clear_cache()
+    monkeypatch.setattr(dashboard_worker, 'request_rebuild', lambda path, changes=1: None)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    wal = write_ahead_log.WriteAheadLog(write_ahead_log.wal_path_for(excel_path))
+    committed = wal.append([make_row('Asha'), make_row('Ravi')])
+    task_store.append_tasks([make_row('Asha'), make_row('Ravi')], excel_path, wal_seq=committed)
+
+    # The workbook is rewritten before the log is trimmed, then the process dies
+    dashboard_worker.build_workbook(excel_path)
+    assert task_store.applied_wal_seq(excel_path) == committed
+
+    queue = submission_queue.SubmissionQueue(excel_path)
+
+    assert queue.replayed_rows == 0
+    assert queue.wal.pending() == []
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Asha', 'Ravi']
@@ -0,0 +1,328 @@
+"""
+Tests for the pluggable task store used by report submissions
+Run with: python -m pytest test_task_store.py
+"""
+
+import json
+import sqlite3
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import task_store
+
+
+def make_row(name, date='2025-11-08', status='Completed', priority='High', effort=2.0):
+    return {
+        'Date': date,
+        'Work Mode': 'WFO',
+        'Emp Id': f"P-{name[:3].upper()}",
+        'Name': name,
+        'Project Name': 'Tracker',
+        'Task Title': f"{name} task",
+        'Task Assigned By': 'Lead',
+        'Task Priority': priority,
+        'Task Status': status,
+        'Plan for next day': 'Continue',
+        'Support Request': '',
+        'Availability': 'Fully Busy',
+        'Effort (in hours)': effort,
+        'Employee Performance (%)': 75.0,
+    }
+
+
+@pytest.fixture
+def store_config(tmp_path, monkeypatch):
+    """Point the task store at a temporary config.json and return a setter for the backend."""
+    config_path = tmp_path / 'config.json'
+    monkeypatch.setattr(task_store, 'CONFIG_FILE', str(config_path))
+    monkeypatch.setattr(task_store, '_backends', {})
+    task_store.clear_cache()
+
+    def use_backend(name):
+        config_path.write_text(json.dumps({'task_store_backend': name}))
+
+    use_backend('sqlite')
+    return use_backend
+
+
+def test_sqlite_append_and_load_roundtrip(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+
+    assert task_store.append_tasks([make_row('Asha'), make_row('Ravi')], excel_path) == 2
+    assert task_store.append_tasks([make_row('Asha', status='In Progress')], excel_path) == 1
+
+    df = task_store.load_tasks(excel_path)
+    assert list(df.columns) == task_store.DATA_COLUMNS
+    assert df['Name'].tolist() == ['Asha', 'Ravi', 'Asha']
+    assert df['Task Status'].tolist() == ['Completed', 'Completed', 'In Progress']
+    assert df['Effort (in hours)'].tolist() == [2.0, 2.0, 2.0]
+    # Blank cells come back as missing, exactly like a workbook round-trip
+    assert df['Support Request'].isna().all()
+    # The workbook is not touched by appends with the SQLite backend
+    assert not (tmp_path / 'task_tracker.xlsx').exists()
+
+
+def test_sqlite_store_seeds_from_existing_workbook(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    pd.DataFrame([make_row('Legacy')]).to_excel(excel_path, index=False)
+
+    task_store.append_tasks([make_row('New')], excel_path)
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Legacy', 'New']
+
+    # Seeding happens once per database, even for a fresh backend instance
+    task_store._backends.clear()
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Legacy', 'New']
+
+
+def test_export_workbook_writes_data_sheet(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha'), make_row('Ravi')], excel_path)
+
+    exported = task_store.export_workbook(excel_path)
+
+    assert len(exported) == 2
+    on_disk = pd.read_excel(excel_path, sheet_name=task_store.DATA_SHEET_NAME)
+    assert on_disk['Name'].tolist() == ['Asha', 'Ravi']
+
+
+def test_excel_backend_keeps_legacy_behaviour(tmp_path, store_config):
+    store_config('excel')
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+
+    task_store.append_tasks([make_row('Asha')], excel_path)
+    task_store.append_tasks([make_row('Ravi')], excel_path)
+
+    on_disk = pd.read_excel(excel_path)
+    assert on_disk['Name'].tolist() == ['Asha', 'Ravi']
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Asha', 'Ravi']
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_load_tasks_is_cached_until_the_store_changes(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha')], excel_path)
+
+    first = task_store.load_tasks(excel_path)
+    first.loc[0, 'Task Title'] = 'Changed by caller'
+    assert task_store.load_tasks(excel_path)['Task Title'].tolist() == ['Asha task']
+    assert task_store.cache_stats()['hits'] == 1
+    assert task_store.cache_stats()['misses'] == 1
+
+    task_store.append_tasks([make_row('Ravi')], excel_path)
+    assert task_store.load_tasks(excel_path)['Name'].tolist() == ['Asha', 'Ravi']
+    assert task_store.cache_stats()['misses'] == 2
+
+
+def test_load_tasks_shares_the_cached_frame(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha'), make_row('Ravi')], excel_path)
+
+    first = task_store.load_tasks(excel_path)
+    second = task_store.load_tasks(excel_path)
+    effort = 'Effort (in hours)'
+    assert np.shares_memory(first[effort].to_numpy(), second[effort].to_numpy())
+    private = task_store.load_tasks(excel_path, copy=True)
+    assert not np.shares_memory(first[effort].to_numpy(), private[effort].to_numpy())
+
+    selected = task_store.select_rows(first, {'Name': 'Ravi', 'Project Name': 'All'})
+    assert selected['Name'].tolist() == ['Ravi']
+    assert task_store.select_rows(first, {'Name': 'All'}) is first
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_load_tasks_date_range(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([
+        make_row('Old', date='2025-10-31'),
+        make_row('Start', date='2025-11-01'),
+        make_row('Slash', date='11/05/2025'),
+        make_row('End', date='2025-11-08'),
+        make_row('Later', date='2025-11-09'),
+    ], excel_path)
+
+    in_range = task_store.load_tasks(excel_path, date_from='2025-11-01', date_to=date(2025, 11, 8))
+    assert in_range['Name'].tolist() == ['Start', 'Slash', 'End']
+
+    # A cached full history serves range reads without touching the store
+    task_store.load_tasks(excel_path)
+    hits = task_store.cache_stats()['hits']
+    assert task_store.load_tasks(excel_path, date_from='2025-11-09')['Name'].tolist() == ['Later']
+    assert task_store.cache_stats()['hits'] == hits + 1
+
+
+def test_sqlite_store_keeps_dates_as_iso_text(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha', date='11/05/2025')], excel_path)
+    assert task_store.get_backend(excel_path).load()['Date'].tolist() == ['2025-11-05']
+    # and the export writes them back as text
+    task_store.export_workbook(excel_path)
+    exported = pd.read_excel(excel_path, sheet_name=task_store.DATA_SHEET_NAME, dtype={'Date': str})
+    assert exported['Date'].tolist() == ['2025-11-05']
+
+
+def test_loaded_frame_is_typed_once(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha', date='11/05/2025')], excel_path)
+
+    df = task_store.load_tasks(excel_path)
+    assert task_store.is_normalised(df)
+    assert df['Date'].tolist() == [pd.Timestamp('2025-11-05')]
+    # Typed frames (and slices of them) are not converted or copied again
+    assert task_store.ensure_numeric_columns(df) is df
+    assert task_store.task_dates(df).equals(df['Date'])
+    assert task_store.is_normalised(df[df['Name'] == 'Asha'])
+    assert not task_store.is_normalised(pd.DataFrame({'Date': ['2025-11-05']}))
+
+
+def test_loaded_frame_uses_compact_dtypes(tmp_path, store_config):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    row = make_row('Asha')
+    row['Employee Performance (%)'] = 75.33
+    task_store.append_tasks([row, make_row('Ravi')], excel_path)
+
+    df = task_store.load_tasks(excel_path)
+    for col in task_store.CATEGORY_COLUMNS:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert df['Effort (in hours)'].dtype == 'float32'
+    assert df['Employee Performance (%)'].dtype == 'float32'
+
+    # Values written back to files are exact again
+    assert task_store.widen_numeric(df)['Employee Performance (%)'].tolist() == [75.33, 75.0]
+    task_store.export_workbook(excel_path)
+    on_disk = pd.read_excel(excel_path, sheet_name=task_store.DATA_SHEET_NAME)
+    assert on_disk['Employee Performance (%)'].tolist() == [75.33, 75.0]
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_daily_rollup_tracks_appends(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([
+        make_row('Asha', effort=2.0),
+        make_row('Asha', status='In Progress', effort=3.0),
+        make_row('Ravi', date='2025-11-09'),
+    ], excel_path)
+    task_store.load_daily_rollup(excel_path)
+    task_store.append_tasks([make_row('Ravi', date='2025-11-09', status='Blocked')], excel_path)
+
+    rollup = task_store.load_daily_rollup(excel_path)
+    assert list(rollup.columns) == task_store.ROLLUP_COLUMNS
+    assert rollup[['Date', 'Name', 'Tasks', 'Completed', 'Effort']].values.tolist() == [
+        ['2025-11-08', 'Asha', 2, 1, 5.0],
+        ['2025-11-09', 'Ravi', 2, 1, 4.0],
+    ]
+    assert rollup['Avg Performance'].tolist() == [75.0, 75.0]
+    pd.testing.assert_frame_equal(
+        rollup, task_store.rollup_from_frame(task_store.load_tasks(excel_path)), check_dtype=False
+    )
+
+    in_range = task_store.load_daily_rollup(excel_path, date_from='2025-11-09')
+    assert in_range['Name'].tolist() == ['Ravi']
+
+
+def test_daily_rollup_is_rebuilt_for_existing_stores(tmp_path, store_config, monkeypatch):
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha'), make_row('Ravi')], excel_path)
+    # A store written before the rollup existed
+    conn = sqlite3.connect(task_store.db_path_for(excel_path))
+    with conn:
+        conn.execute("DELETE FROM daily_rollup")
+        conn.execute("DELETE FROM store_meta WHERE key = 'daily_rollup_version'")
+    conn.close()
+
+    # Fresh process: the backend initialises again
+    monkeypatch.setattr(task_store, '_backends', {})
+    task_store.clear_cache()
+    assert task_store.load_daily_rollup(excel_path)['Tasks'].tolist() == [1, 1]
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_data_version_increases_with_every_write(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([make_row('Asha')], excel_path)
+    first = task_store.data_version(excel_path)
+    assert task_store.data_version(excel_path) == first
+
+    task_store.append_tasks([make_row('Ravi')], excel_path)
+    second = task_store.data_version(excel_path)
+    assert second > first
+
+    task_store.get_backend(excel_path).write_scores('task_status_v1', [0], [50.0])
+    assert task_store.data_version(excel_path) > second
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_edits_and_deletes_are_applied_until_compaction(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([
+        make_row('Asha'),
+        make_row('Ravi', status='In Progress'),
+        make_row('Meera', date='2025-11-01'),
+    ], excel_path)
+    row_ids = task_store.get_backend(excel_path).load_scoring_frame()['Row Id'].tolist()
+
+    # Ravi's task is finished and moved into the range; Meera's report is withdrawn
+    assert task_store.update_tasks(
+        {row_ids[1]: {'Task Status': 'Completed', 'Date': '2025-11-09'}}, excel_path
+    ) == 1
+    assert task_store.delete_tasks([row_ids[2], 10_000], excel_path) == 1
+
+    def current():
+        df = task_store.load_tasks(excel_path)
+        return df[['Name', 'Task Status']].astype(str).values.tolist(), task_store.load_daily_rollup(excel_path)
+
+    rows, rollup = current()
+    assert rows == [['Asha', 'Completed'], ['Ravi', 'Completed']]
+    assert task_store.load_tasks(excel_path, date_from='2025-11-09')['Name'].tolist() == ['Ravi']
+    pd.testing.assert_frame_equal(
+        rollup, task_store.rollup_from_frame(task_store.load_tasks(excel_path)), check_dtype=False
+    )
+
+    if backend == 'sqlite':
+        assert task_store.get_backend(excel_path).pending_edits() == 2
+        assert task_store.get_backend(excel_path).count() == 3
+    task_store.compact_store(excel_path)
+    assert task_store.get_backend(excel_path).pending_edits() == 0
+    assert task_store.get_backend(excel_path).count() == 2
+    compacted_rows, compacted_rollup = current()
+    assert compacted_rows == rows
+    pd.testing.assert_frame_equal(compacted_rollup, rollup)
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'excel'])
+def test_load_tasks_reads_only_the_requested_slice(tmp_path, store_config, backend):
+    store_config(backend)
+    excel_path = str(tmp_path / 'task_tracker.xlsx')
+    task_store.append_tasks([
+        make_row('Asha', date='2025-11-07'),
+        make_row('Asha'),
+        make_row(' Ravi ', date='2025-11-08'),
+        make_row('Meera', date='2025-11-09'),
+    ], excel_path)
+
+    today = task_store.load_tasks(excel_path, date_from='2025-11-08', date_to='2025-11-08', columns=['Name', 'Date'])
+    assert list(today.columns) == ['Date', 'Name']
+    assert today['Name'].tolist() == ['Asha', ' Ravi ']
+
+    by_id = task_store.load_tasks(excel_path, emp_ids=['p-ash'], columns=['Task Title'])
+    assert by_id['Task Title'].tolist() == ['Asha task', 'Asha task']
+    assert list(by_id.columns) == ['Task Title']
+    assert task_store.load_tasks(excel_path, names=['ravi'])['Emp Id'].tolist() == ['P- RA']
+
+    # Once the full history is cached, narrower reads are served from it
+    full = task_store.load_tasks(excel_path)
+    hits = task_store.cache_stats()['hits']
+    narrowed = task_store.load_tasks(excel_path, date_from='2025-11-09', emp_ids=['P-MEE'], columns=['Name'])
+    assert narrowed['Name'].tolist() == ['Meera']
+    assert task_store.cache_stats()['hits'] == hits + 1
+    assert len(full) == 4
+
+    with pytest.raises(ValueError):
+        task_store.load_tasks(excel_path, columns=['Salary'])
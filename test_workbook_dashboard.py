@@ -0,0 +1,104 @@
+"""
+Tests for the Excel dashboard sheets built from the task history
+Run with: python -m pytest test_workbook_dashboard.py
+"""
+
+import pandas as pd
+from openpyxl import load_workbook
+
+import workbook_dashboard
+from task_store import DATA_COLUMNS, DATA_SHEET_NAME
+
+
+def make_row(name, status='Completed', perf=75.0, date='2025-11-08'):
+    row = {col: '' for col in DATA_COLUMNS}
+    row.update({
+        'Date': date,
+        'Name': name,
+        'Task Title': f"{name} task",
+        'Task Status': status,
+        'Effort (in hours)': 2.0,
+        'Employee Performance (%)': perf,
+    })
+    return row
+
+
+def write_data_sheet(excel_path, rows):
+    df = pd.DataFrame(rows, columns=DATA_COLUMNS)
+    if excel_path.exists():
+        writer_args = {'mode': 'a', 'if_sheet_exists': 'replace'}
+    else:
+        writer_args = {'mode': 'w'}
+    with pd.ExcelWriter(excel_path, engine='openpyxl', **writer_args) as writer:
+        df.to_excel(writer, index=False, sheet_name=DATA_SHEET_NAME)
+    return df
+
+
+def test_full_build_creates_all_sheets(tmp_path):
+    excel_path = tmp_path / 'task_tracker.xlsx'
+    df = write_data_sheet(excel_path, [make_row('Asha', perf=90.0), make_row('Ravi', perf=60.0)])
+
+    result = workbook_dashboard.update_dashboard_sheets(str(excel_path), df, incremental=True)
+
+    assert result == {'mode': 'full', 'rebuilt': ['Asha', 'Ravi']}
+    book = load_workbook(excel_path)
+    assert book.sheetnames == [
+        DATA_SHEET_NAME,
+        workbook_dashboard.SUMMARY_SHEET_NAME,
+        'Asha Dashboard',
+        'Ravi Dashboard',
+        workbook_dashboard.PERFORMANCE_SHEET_NAME,
+        workbook_dashboard.WEEKLY_SHEET_NAME,
+        workbook_dashboard.STATE_SHEET_NAME,
+    ]
+    assert book[workbook_dashboard.STATE_SHEET_NAME].sheet_state == 'hidden'
+
+
+def test_incremental_build_only_rebuilds_changed_employees(tmp_path):
+    excel_path = tmp_path / 'task_tracker.xlsx'
+    rows = [make_row('Asha', perf=90.0), make_row('Ravi', perf=60.0), make_row('Mira', perf=30.0)]
+    df = write_data_sheet(excel_path, rows)
+    workbook_dashboard.update_dashboard_sheets(str(excel_path), df, incremental=True)
+
+    # Ravi submits another report; Mira leaves the data set
+    rows = rows[:2] + [make_row('Ravi', status='In Progress', perf=60.0)]
+    df = write_data_sheet(excel_path, rows)
+    result = workbook_dashboard.update_dashboard_sheets(str(excel_path), df, incremental=True)
+
+    assert result == {'mode': 'incremental', 'rebuilt': ['Ravi']}
+    book = load_workbook(excel_path)
+    assert 'Mira Dashboard' not in book.sheetnames
+
+    summary = [
+        row for row in book[workbook_dashboard.SUMMARY_SHEET_NAME].iter_rows(min_row=2, values_only=True)
+    ]
+    assert [row[:4] for row in summary] == [('Asha', 1, 1, 0), ('Ravi', 2, 1, 1)]
+    assert book['Ravi Dashboard'].cell(row=3, column=2).value == 2
+    assert book['Ravi Dashboard'].cell(row=12, column=9).value == 'In Progress'
+
+    # Same data again: nothing to rebuild
+    result = workbook_dashboard.update_dashboard_sheets(str(excel_path), df, incremental=True)
+    assert result == {'mode': 'incremental', 'rebuilt': []}
+
+
+def test_streaming_build_matches_regular_build(tmp_path):
+    regular_path = tmp_path / 'regular.xlsx'
+    streamed_path = tmp_path / 'streamed.xlsx'
+    rows = [make_row('Asha', perf=90.0), make_row('Ravi', perf=60.0), make_row('Asha', status='Pending')]
+    write_data_sheet(regular_path, rows)
+    df = pd.read_excel(regular_path)
+    workbook_dashboard.update_dashboard_sheets(str(regular_path), df)
+
+    result = workbook_dashboard.write_streaming_workbook(str(streamed_path), df)
+
+    assert result['mode'] == 'streaming'
+    regular, streamed = load_workbook(regular_path), load_workbook(streamed_path)
+    assert streamed.sheetnames == regular.sheetnames
+    for sheet_name in regular.sheetnames:
+        assert list(streamed[sheet_name].values) == list(regular[sheet_name].values), sheet_name
+        assert streamed[sheet_name].freeze_panes == regular[sheet_name].freeze_panes
+        assert streamed[sheet_name].merged_cells.ranges == regular[sheet_name].merged_cells.ranges
+
+    # A streamed workbook carries the build state, so incremental updates continue from it
+    result = workbook_dashboard.update_dashboard_sheets(str(streamed_path), df, incremental=True)
+    assert result == {'mode': 'incremental', 'rebuilt': []}
@@ -0,0 +1,674 @@
+"""
+Excel dashboard sheets for the task tracker workbook.
+
+Builds the summary, ranked performance, weekly and per-employee "<Name> Dashboard"
+sheets that sit next to the exported task data. In incremental mode only the
+sheets of employees whose rows changed since the last build are regenerated; the
+per-employee row counts and fingerprints needed to detect that are kept in a
+hidden sheet inside the workbook, so they can never drift from the file itself.
+"""
+
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from task_store import (
+    DATA_COLUMNS,
+    DATA_SHEET_NAME,
+    STORE_STATE_SHEET_NAME,
+    atomic_file,
+    ensure_numeric_columns,
+    is_normalised,
+    widen_numeric,
+)
+
+SUMMARY_SHEET_NAME = '📈 Employee Progress Dashboard'
+PERFORMANCE_SHEET_NAME = 'Employee Performance'
+WEEKLY_SHEET_NAME = '📊 Weekly Progress Dashboard'
+EMPLOYEE_SHEET_SUFFIX = ' Dashboard'
+STATE_SHEET_NAME = '_dashboard_state'
+
+SUMMARY_HEADERS = [
+    'Employee Name',
+    'Total Tasks',
+    'Completed Tasks',
+    'Pending Tasks',
+    'Completion Rate (%)',
+    'Employee Performance (%)',
+    'Last Update',
+    'Individual Dashboard'
+]
+STATE_HEADERS = ['Employee Name', 'Sheet Name', 'Row Count', 'Fingerprint']
+SUMMARY_DATA_START_ROW = 2
+
+
+# ==================== HELPERS ====================
+
+def sanitize_sheet_name(name: str) -> str:
+    """Return a workbook-safe base sheet name (<=31 chars, invalid chars removed)."""
+    safe = re.sub(r'[\\/*?:\[\]]', '_', str(name)).strip()
+    if not safe:
+        safe = 'Unnamed'
+    return safe[:31]
+
+
+def build_employee_sheet_name(base_name: str, used_names: set[str]) -> str:
+    """Construct a unique sheet name for an employee while respecting Excel limits."""
+    suffix = EMPLOYEE_SHEET_SUFFIX
+    max_base_len = max(0, 31 - len(suffix))
+    trimmed_base = base_name[:max_base_len] if max_base_len else base_name[:31]
+    candidate = f"{trimmed_base}{suffix}"
+
+    counter = 2
+    while candidate in used_names:
+        extra = f" {counter}"
+        counter += 1
+        allowed_len = max(0, 31 - len(suffix) - len(extra))
+        trimmed_base = base_name[:allowed_len] if allowed_len else ''
+        fallback = trimmed_base if trimmed_base else 'Employee'
+        candidate = f"{fallback}{extra}{suffix}"
+
+    used_names.add(candidate)
+    return candidate
+
+
+def is_dashboard_sheet(sheet_name: str) -> bool:
+    """True for every sheet generated by update_dashboard_sheets."""
+    return (
+        sheet_name in (SUMMARY_SHEET_NAME, PERFORMANCE_SHEET_NAME, WEEKLY_SHEET_NAME, STATE_SHEET_NAME)
+        or sheet_name.endswith(EMPLOYEE_SHEET_SUFFIX)
+    )
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Per-row hash over the data columns."""
+    cols = [col for col in DATA_COLUMNS if col in df.columns]
+    return pd.util.hash_pandas_object(df[cols], index=False)
+
+
+def employee_fingerprint(emp_row_hashes) -> str:
+    """Order-independent hash of an employee's task rows (from their row hashes)."""
+    return hashlib.md5(np.sort(np.asarray(emp_row_hashes)).tobytes()).hexdigest()
+
+
+def format_last_update(last_update) -> str:
+    if last_update is None or pd.isna(last_update):
+        return ""
+    if isinstance(last_update, pd.Timestamp):
+        return last_update.date().isoformat()
+    return str(last_update)
+
+
+def employee_key(df: pd.DataFrame) -> pd.Series:
+    """Normalised employee name per row (stripped text, '' for missing)."""
+    return df['Name'].astype(str).str.strip().where(df['Name'].notna(), '')
+
+
+def group_by_employee(df: pd.DataFrame) -> dict:
+    """Employee name -> that employee's rows, from a single groupby pass (first-seen order)."""
+    keys = employee_key(df)
+    valid = keys != ''
+    return {name: rows for name, rows in df[valid].groupby(keys[valid], sort=False)}
+
+
+def build_summary_records(full_df: pd.DataFrame) -> list[dict]:
+    """Per-employee all-time summary, sorted by performance then completion rate."""
+    keys = employee_key(full_df)
+    valid = keys != ''
+    if not valid.any():
+        return []
+    df = full_df[valid]
+    keys = keys[valid]
+
+    # One vectorised aggregation for every employee
+    aggregations = {
+        'total_tasks': ('Employee Performance (%)', 'size'),
+        'avg_performance': ('Employee Performance (%)', 'mean'),
+    }
+    frame = df[['Employee Performance (%)']]
+    if 'Task Status' in df.columns:
+        frame = frame.assign(_completed=(df['Task Status'] == 'Completed'))
+        aggregations['completed_tasks'] = ('_completed', 'sum')
+    if 'Date' in df.columns:
+        frame = frame.assign(_date=df['Date'])
+        aggregations['last_update'] = ('_date', 'max')
+    stats = frame.groupby(keys, sort=False).agg(**aggregations)
+    groups = group_by_employee(df)
+    hashes = {name: values.to_numpy() for name, values in row_hashes(df).groupby(keys, sort=False)}
+
+    summary_records = []
+    for name, row in zip(stats.index, stats.itertuples(index=False)):
+        total_tasks = int(row.total_tasks)
+        completed_tasks = int(row.completed_tasks) if 'completed_tasks' in stats.columns else 0
+        pending_tasks = max(total_tasks - completed_tasks, 0)
+        completion_rate = round((completed_tasks / total_tasks * 100) if total_tasks else 0.0, 2)
+
+        last_update = None
+        if 'last_update' in stats.columns and not pd.isna(row.last_update):
+            last_update = row.last_update
+
+        summary_records.append({
+            'name': name,
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'pending_tasks': pending_tasks,
+            'completion_rate': completion_rate,
+            'avg_performance': round(float(row.avg_performance), 2),
+            'last_update': last_update,
+            'rows': groups[name],   # group slice for the detail sheet
+            'fingerprint': employee_fingerprint(hashes[name]),
+        })
+
+    # Sort by average performance descending, then completion rate
+    summary_records.sort(
+        key=lambda record: (record['avg_performance'], record['completion_rate']),
+        reverse=True
+    )
+    return summary_records
+
+
+def summary_row_values(record: dict, sheet_name: str) -> list:
+    return [
+        record['name'],
+        record['total_tasks'],
+        record['completed_tasks'],
+        record['pending_tasks'],
+        record['completion_rate'],
+        record['avg_performance'],
+        format_last_update(record['last_update']),
+        f'=HYPERLINK("#\'{sheet_name}\'!A1", "View Dashboard")',
+    ]
+
+
+# ==================== STATE ====================
+
+def read_dashboard_state(book) -> dict | None:
+    """Return {name: {'sheet', 'rows', 'fingerprint', 'position'}} from the hidden state sheet."""
+    if STATE_SHEET_NAME not in book.sheetnames:
+        return None
+    state = {}
+    for position, row in enumerate(book[STATE_SHEET_NAME].iter_rows(min_row=2, values_only=True)):
+        if not row or row[0] is None:
+            continue
+        state[str(row[0])] = {
+            'sheet': str(row[1]),
+            'rows': int(row[2] or 0),
+            'fingerprint': str(row[3] or ''),
+            'position': position,
+        }
+    return state
+
+
+def write_dashboard_state(ws_state, records: list[dict], sheet_names: dict) -> None:
+    ws_state.sheet_state = 'hidden'
+    ws_state.append(STATE_HEADERS)
+    for record in records:
+        ws_state.append([
+            record['name'],
+            sheet_names[record['name']],
+            record['total_tasks'],
+            record['fingerprint'],
+        ])
+
+
+def replace_sheet(book, sheet_name: str, default_index: int | None = None):
+    """Delete a sheet (if present) and recreate it at the same position."""
+    index = default_index
+    if sheet_name in book.sheetnames:
+        index = book.sheetnames.index(sheet_name)
+        del book[sheet_name]
+    return book.create_sheet(sheet_name, index)
+
+
+# ==================== SHEET WRITERS ====================
+# Writers only append whole rows to a fresh sheet, so the same code fills a
+# regular worksheet and a write-only (streaming) one.
+
+def styled(ws, value, font):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    return cell
+
+
+def set_column_widths(ws, widths) -> None:
+    for idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+
+
+def merge_range(ws, cell_range: str) -> None:
+    if hasattr(ws, 'merge_cells'):
+        ws.merge_cells(cell_range)
+    else:
+        ws.merged_cells.add(cell_range)
+
+
+def detail_rows(emp_details: pd.DataFrame) -> list[list]:
+    """Task rows as plain lists in DATA_COLUMNS order (blank for missing, dates without time)."""
+    values = emp_details.reindex(columns=DATA_COLUMNS)
+    if 'Date' in values.columns and pd.api.types.is_datetime64_any_dtype(values['Date']):
+        values = values.assign(Date=values['Date'].dt.date)
+    values = values.astype(object)
+    return values.where(values.notna(), "").to_numpy().tolist()
+
+
+def write_summary_sheet(ws_summary, records: list[dict], sheet_names: dict) -> None:
+    ws_summary.freeze_panes = "A2"
+    set_column_widths(ws_summary, [28, 14, 16, 14, 20, 20, 16, 24])
+
+    ws_summary.append(SUMMARY_HEADERS)
+    for record in records:
+        ws_summary.append(summary_row_values(record, sheet_names[record['name']]))
+
+    if records:
+        ws_summary.auto_filter.ref = f"A1:H{SUMMARY_DATA_START_ROW + len(records) - 1}"
+
+
+def patch_summary_sheet(ws_summary, records: list[dict], sheet_names: dict,
+                        previous_state: dict, changed_names: set[str]) -> int:
+    """Rewrite only the summary rows whose employee changed or moved. Returns rows written."""
+    written = 0
+    for offset, record in enumerate(records):
+        previous = previous_state.get(record['name'])
+        if (
+            previous is not None
+            and record['name'] not in changed_names
+            and previous['position'] == offset
+        ):
+            continue
+        row_idx = SUMMARY_DATA_START_ROW + offset
+        for col_idx, value in enumerate(summary_row_values(record, sheet_names[record['name']]), start=1):
+            ws_summary.cell(row=row_idx, column=col_idx, value=value)
+        written += 1
+
+    stale_start = SUMMARY_DATA_START_ROW + len(records)
+    if ws_summary.max_row >= stale_start:
+        ws_summary.delete_rows(stale_start, ws_summary.max_row - stale_start + 1)
+    if records:
+        ws_summary.auto_filter.ref = f"A1:H{SUMMARY_DATA_START_ROW + len(records) - 1}"
+    return written
+
+
+def write_employee_sheet(ws_emp, record: dict) -> None:
+    last_update_value = format_last_update(record['last_update'])
+
+    ws_emp.freeze_panes = "A8"
+    set_column_widths(ws_emp, [18] * len(DATA_COLUMNS))
+
+    back_link = f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A1", "View All Employees")'
+    ws_emp.append([styled(ws_emp, "Employee Dashboard", Font(bold=True, size=14))])
+    ws_emp.append(["Employee Name", record['name'], None, "Last Update", last_update_value])
+    ws_emp.append(["Total Tasks", record['total_tasks'], None, "Back to Dashboard", back_link])
+    ws_emp.append(["Completed Tasks", record['completed_tasks']])
+    ws_emp.append(["Pending Tasks", record['pending_tasks']])
+    ws_emp.append(["Completion Rate (%)", record['completion_rate']])
+    ws_emp.append(["Avg Performance (%)", record['avg_performance']])
+    ws_emp.append([])
+    ws_emp.append(["Task Details"])
+
+    # Header row (row 10) and detail rows
+    ws_emp.append(DATA_COLUMNS)
+    emp_details = record['rows']
+    if 'Date' in emp_details.columns:
+        emp_details = emp_details.sort_values(by='Date', kind='stable')
+    for row in detail_rows(emp_details):
+        ws_emp.append(row)
+
+
+def write_performance_sheet(ws_perf, records: list[dict]) -> None:
+    perf_headers = [
+        'Rank',
+        'Employee Name',
+        'Total Tasks',
+        'Completed Tasks',
+        'Completion Rate (%)',
+        'Employee Performance (%)',
+        'Last Update',
+        'Dashboard Link'
+    ]
+    ws_perf.freeze_panes = "A2"
+    set_column_widths(ws_perf, [8, 28, 14, 16, 20, 20, 16, 24])
+
+    ws_perf.append(perf_headers)
+    for rank, record in enumerate(records, start=1):
+        ws_perf.append([
+            rank,
+            record['name'],
+            record['total_tasks'],
+            record['completed_tasks'],
+            record['completion_rate'],
+            record['avg_performance'],
+            format_last_update(record['last_update']),
+            f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A{SUMMARY_DATA_START_ROW + rank - 1}", '
+            f'"Open Dashboard")',
+        ])
+
+    ws_perf.auto_filter.ref = f"A1:H{len(records) + 1}"
+
+
+def write_weekly_sheet(ws_weekly, full_df: pd.DataFrame, records: list[dict], sheet_names: dict) -> None:
+    """Last 7 days inclusive (today - 6 days ... today)."""
+    today = datetime.now().date()
+    week_start = today - timedelta(days=6)
+
+    weekly_df = full_df[
+        (full_df['Date'].dt.date >= week_start) &
+        (full_df['Date'].dt.date <= today)
+    ].copy()
+
+    weekly_groups = group_by_employee(weekly_df)
+    empty_week = weekly_df.iloc[0:0]
+    weekly_summary_records = []
+
+    for record in records:
+        name = record['name']
+        emp_weekly = weekly_groups.get(name, empty_week)
+
+        total_tasks_week = len(emp_weekly)
+
+        if 'Task Status' in emp_weekly.columns:
+            completed_week = int((emp_weekly['Task Status'] == 'Completed').sum())
+        else:
+            completed_week = 0
+
+        pending_week = max(total_tasks_week - completed_week, 0)
+        completion_rate_week = round((completed_week / total_tasks_week * 100) if total_tasks_week else 0.0, 2)
+        avg_perf_week = round(emp_weekly['Employee Performance (%)'].mean(), 2)
+        total_effort_week = round(emp_weekly['Effort (in hours)'].sum(), 1)
+
+        workload_status = 'Unknown'
+        if 'Availability' in emp_weekly.columns and not emp_weekly.empty:
+            avail_counts = emp_weekly['Availability'].value_counts().loc[lambda counts: counts > 0]
+            if not avail_counts.empty:
+                workload_status = avail_counts.index[0]  # Most common availability
+
+        weekly_summary_records.append({
+            'name': name,
+            'total_tasks': total_tasks_week,
+            'completed_tasks': completed_week,
+            'pending_tasks': pending_week,
+            'completion_rate': completion_rate_week,
+            'avg_performance': avg_perf_week,
+            'total_effort': total_effort_week,
+            'workload_status': workload_status
+        })
+
+    weekly_summary_records.sort(key=lambda record: record['avg_performance'], reverse=True)
+
+    overall_total_tasks = len(weekly_df)
+    overall_completed = (
+        int((weekly_df['Task Status'] == 'Completed').sum())
+        if 'Task Status' in weekly_df.columns else 0
+    )
+    overall_completion = round((overall_completed / overall_total_tasks * 100) if overall_total_tasks else 0.0, 2)
+    overall_avg_perf = round(weekly_df['Employee Performance (%)'].mean(), 2)
+    overall_total_effort = round(weekly_df['Effort (in hours)'].sum(), 1)
+
+    ws_weekly.freeze_panes = "A7"
+    set_column_widths(ws_weekly, [28, 18, 14, 14, 20, 20, 16, 16, 24])
+
+    # Title
+    ws_weekly.append([styled(
+        ws_weekly,
+        f"📊 Weekly Progress Dashboard - Week of "
+        f"{week_start.strftime('%Y-%m-%d')} to {today.strftime('%Y-%m-%d')}",
+        Font(bold=True, size=14)
+    )])
+    merge_range(ws_weekly, 'A1:I1')
+
+    # Back to Summary Link
+    ws_weekly.append([
+        "Back to Overall Dashboard",
+        f'=HYPERLINK("#\'{SUMMARY_SHEET_NAME}\'!A1", "View All-Time Summary")'
+    ])
+
+    # Overall Metrics Section
+    ws_weekly.append([styled(ws_weekly, "Overall Weekly Metrics", Font(bold=True))])
+    merge_range(ws_weekly, 'A3:B3')
+
+    overall_metrics = [
+        ('Total Tasks', overall_total_tasks),
+        ('Completed Tasks', overall_completed),
+        ('Overall Completion Rate (%)', overall_completion),
+        ('Average Performance (%)', overall_avg_perf),
+        ('Total Effort (Hours)', overall_total_effort)
+    ]
+    for label, value in overall_metrics:
+        ws_weekly.append([label, value])
+    ws_weekly.append([])
+
+    # Weekly Table Headers
+    table_start_row = 4 + len(overall_metrics) + 1
+    weekly_headers = [
+        'Employee Name',
+        'Total Tasks (Week)',
+        'Completed',
+        'Pending',
+        'Completion Rate (%)',
+        'Avg Performance (%)',
+        'Total Effort (hrs)',
+        'Workload Status',
+        'Individual Dashboard'
+    ]
+    ws_weekly.append([styled(ws_weekly, header, Font(bold=True)) for header in weekly_headers])
+
+    # Populate weekly table
+    for record in weekly_summary_records:
+        employee_sheet_name = sheet_names[record['name']]
+        ws_weekly.append([
+            record['name'],
+            record['total_tasks'],
+            record['completed_tasks'],
+            record['pending_tasks'],
+            record['completion_rate'],
+            record['avg_performance'],
+            record['total_effort'],
+            record['workload_status'],
+            f'=HYPERLINK("#\'{employee_sheet_name}\'!A1", "View Dashboard")',
+        ])
+
+    if weekly_summary_records:
+        last_row = table_start_row + len(weekly_summary_records)
+        ws_weekly.auto_filter.ref = f"A{table_start_row}:I{last_row}"
+
+
+# ==================== ENTRY POINTS ====================
+
+def prepare_dashboard_frame(full_df: pd.DataFrame) -> pd.DataFrame | None:
+    """Validate and normalise the task frame; None when there is nothing to build."""
+    if full_df is None or full_df.empty:
+        logging.info("Skipping dashboard sheet update because there is no data.")
+        return None
+
+    if 'Name' not in full_df.columns:
+        logging.warning("Cannot build dashboard sheets because 'Name' column is missing.")
+        return None
+
+    try:
+        if is_normalised(full_df):
+            # Typed at load: only the float32 columns need widening for the workbook
+            return widen_numeric(full_df)
+        full_df = widen_numeric(ensure_numeric_columns(full_df))
+        if 'Date' in full_df.columns:
+            full_df['Date'] = pd.to_datetime(full_df['Date'], errors='coerce')
+    except Exception as parse_error:
+        logging.error(f"Failed to normalise data for dashboard sheets: {parse_error}")
+        return None
+    return full_df
+
+
+def assign_sheet_names(records: list[dict], used_sheet_names: set[str], previous_state: dict) -> dict:
+    """Employee -> sheet name; known employees keep theirs so hyperlinks stay valid."""
+    used_sheet_names = used_sheet_names | {SUMMARY_SHEET_NAME, PERFORMANCE_SHEET_NAME, WEEKLY_SHEET_NAME}
+    sheet_names = {}
+    for record in records:
+        previous = previous_state.get(record['name'])
+        if previous is not None:
+            sheet_names[record['name']] = previous['sheet']
+        else:
+            base_name = sanitize_sheet_name(record['name'])
+            sheet_names[record['name']] = build_employee_sheet_name(base_name, used_sheet_names)
+    return sheet_names
+
+
+def update_dashboard_sheets(excel_path: str, full_df: pd.DataFrame, incremental: bool = False) -> dict | None:
+    """
+    Regenerate the performance-related dashboard sheets in the Excel workbook:
+
+    - SUMMARY_SHEET_NAME (overall summary per employee)
+    - PERFORMANCE_SHEET_NAME (ranked performance table)
+    - WEEKLY_SHEET_NAME (weekly metrics + per-employee weekly summary)
+    - Individual employee sheets: "<Employee Name> Dashboard"
+
+    With ``incremental=True`` only the sheets of employees whose rows changed since
+    the previous build are rebuilt and the affected summary rows are patched. It
+    falls back to a full rebuild when the workbook has no usable build state.
+
+    Returns {'mode': 'full' | 'incremental', 'rebuilt': [names]} or None when skipped.
+    """
+    full_df = prepare_dashboard_frame(full_df)
+    if full_df is None:
+        return None
+
+    try:
+        book = load_workbook(excel_path)
+    except Exception as workbook_error:
+        logging.error(f"Unable to open workbook '{excel_path}' to update dashboard sheets: {workbook_error}")
+        return None
+
+    summary_records = build_summary_records(full_df)
+
+    previous_state = read_dashboard_state(book) if incremental else None
+    can_patch = (
+        previous_state is not None
+        and SUMMARY_SHEET_NAME in book.sheetnames
+        and all(entry['sheet'] in book.sheetnames for entry in previous_state.values())
+    )
+
+    if not can_patch:
+        # Full rebuild: clean up existing dashboard-related sheets
+        for sheet_name in list(book.sheetnames):
+            if is_dashboard_sheet(sheet_name):
+                del book[sheet_name]
+        previous_state = {}
+
+    sheet_names = assign_sheet_names(summary_records, set(book.sheetnames), previous_state)
+
+    changed_names = {
+        record['name'] for record in summary_records
+        if previous_state.get(record['name'], {}).get('fingerprint') != record['fingerprint']
+    }
+    current_names = {record['name'] for record in summary_records}
+    for name, previous in previous_state.items():
+        if name not in current_names and previous['sheet'] in book.sheetnames:
+            del book[previous['sheet']]
+
+    # SUMMARY SHEET (📈 Employee Progress Dashboard)
+    if can_patch:
+        ws_summary = book[SUMMARY_SHEET_NAME]
+        patched_rows = patch_summary_sheet(ws_summary, summary_records, sheet_names, previous_state, changed_names)
+        logging.info(f"Patched {patched_rows} summary row(s) in '{SUMMARY_SHEET_NAME}'")
+    else:
+        ws_summary = book.create_sheet(SUMMARY_SHEET_NAME)
+        write_summary_sheet(ws_summary, summary_records, sheet_names)
+
+    # INDIVIDUAL EMPLOYEE SHEETS ("<Name> Dashboard"), new ones go before the performance sheet
+    for record in summary_records:
+        if record['name'] not in changed_names:
+            continue
+        insert_at = (
+            book.sheetnames.index(PERFORMANCE_SHEET_NAME)
+            if PERFORMANCE_SHEET_NAME in book.sheetnames else None
+        )
+        ws_emp = replace_sheet(book, sheet_names[record['name']], insert_at)
+        write_employee_sheet(ws_emp, record)
+
+    # PERFORMANCE SHEET ("Employee Performance"), O(employees) so always rebuilt
+    if summary_records:
+        write_performance_sheet(replace_sheet(book, PERFORMANCE_SHEET_NAME), summary_records)
+    elif PERFORMANCE_SHEET_NAME in book.sheetnames:
+        del book[PERFORMANCE_SHEET_NAME]
+
+    # WEEKLY PROGRESS DASHBOARD depends on today's date, so always rebuilt
+    write_weekly_sheet(replace_sheet(book, WEEKLY_SHEET_NAME), full_df, summary_records, sheet_names)
+
+    write_dashboard_state(replace_sheet(book, STATE_SHEET_NAME), summary_records, sheet_names)
+
+    # Save workbook (to a temp file renamed into place, so a crash keeps the old one)
+    try:
+        with atomic_file(excel_path) as temp_path:
+            book.save(temp_path)
+    except Exception as save_error:
+        logging.error(f"Failed to save workbook with updated dashboard sheets: {save_error}")
+        return None
+
+    rebuilt = [record['name'] for record in summary_records if record['name'] in changed_names]
+    return {'mode': 'incremental' if can_patch else 'full', 'rebuilt': rebuilt}
+
+
+def write_streaming_workbook(excel_path: str, data_df: pd.DataFrame,
+                             sheet_df: pd.DataFrame | None = None,
+                             store_state: dict | None = None) -> dict | None:
+    """
+    Write the whole workbook (data sheet + every dashboard sheet) in one pass with
+    openpyxl's write-only worksheets.
+
+    The dashboards are built from ``data_df``; the data sheet gets ``sheet_df``,
+    the rows as the store keeps them (task_store.data_sheet_frame), and falls
+    back to ``data_df`` when not given. ``store_state`` ({key: value}) is written to
+    the task store's hidden state sheet, which the Excel backend keeps in the
+    workbook (task_store.workbook_store_state).
+
+    Rows are streamed to disk as they are appended instead of being kept as cell
+    objects, so memory stays flat for large histories. The result has the same
+    sheets, hyperlinks, frozen panes and build state as update_dashboard_sheets,
+    so later incremental updates can continue from it. The file is written next
+    to the target and moved into place once complete.
+
+    Returns {'mode': 'streaming', 'rebuilt': [names]} or None when skipped.
+    """
+    full_df = prepare_dashboard_frame(data_df)
+    if full_df is None:
+        return None
+
+    summary_records = build_summary_records(full_df)
+    sheet_names = assign_sheet_names(summary_records, {DATA_SHEET_NAME}, {})
+
+    book = Workbook(write_only=True)
+
+    # DATA SHEET (Sheet1): blank cells stay empty like a pandas export
+    ws_data = book.create_sheet(DATA_SHEET_NAME)
+    data_values = widen_numeric(data_df if sheet_df is None else sheet_df).astype(object)
+    ws_data.append(list(data_values.columns))
+    for row in data_values.where(data_values.notna(), None).to_numpy().tolist():
+        ws_data.append(row)
+
+    write_summary_sheet(book.create_sheet(SUMMARY_SHEET_NAME), summary_records, sheet_names)
+    for record in summary_records:
+        write_employee_sheet(book.create_sheet(sheet_names[record['name']]), record)
+    if summary_records:
+        write_performance_sheet(book.create_sheet(PERFORMANCE_SHEET_NAME), summary_records)
+    write_weekly_sheet(book.create_sheet(WEEKLY_SHEET_NAME), full_df, summary_records, sheet_names)
+    write_dashboard_state(book.create_sheet(STATE_SHEET_NAME), summary_records, sheet_names)
+    if store_state:
+        ws_store = book.create_sheet(STORE_STATE_SHEET_NAME)
+        ws_store.sheet_state = 'hidden'
+        ws_store.append(['key', 'value'])
+        for key, value in store_state.items():
+            ws_store.append([key, str(value)])
+
+    try:
+        with atomic_file(excel_path) as temp_path:
+            book.save(temp_path)
+    except Exception as save_error:
+        logging.error(f"Failed to save streamed workbook '{excel_path}': {save_error}")
+        return None
+
+    return {'mode': 'streaming', 'rebuilt': [record['name'] for record in summary_records]}
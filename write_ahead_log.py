@@ -0,0 +1,163 @@
+"""
+Write-ahead log for task report submissions.
+
+Every submission is appended to a small JSON-lines file next to the workbook
+(``task_tracker.wal``) and fsync'd before it is queued for the task store.
+The store records the sequence number of the last entry it applied in the same
+commit as the rows (``store_meta`` for SQLite, a hidden sheet for the Excel
+backend), and applied entries are then dropped from the log. If the process
+dies between the two steps, ``pending`` returns the entries that never made it
+into the store, and the submission queue replays them on startup.
+
+Every writer process logs to a file of its own (log 0 is ``task_tracker.wal``,
+then ``task_tracker.1.wal`` ...) and the store keeps one applied sequence
+number per log, so trimming one process's log never drops entries another
+process has logged but not committed yet. A process holds an exclusive lock on
+``<log>.lock`` while it uses a log; logs whose lock is free belong to a process
+that is gone and are replayed by the next one to start.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import task_store
+
+
+# Writer processes that can share one workbook (one log each)
+MAX_LOGS = 64
+
+
+def wal_path_for(excel_path, slot=0):
+    """Log file ``slot`` that belongs to the given workbook path."""
+    return str(Path(excel_path).with_suffix(f'.{slot}.wal' if slot else '.wal'))
+
+
+def _try_lock(path):
+    """
+    Open ``path`` and take an exclusive lock on it without waiting. Returns the
+    open file, which holds the lock until it is closed (or the process exits),
+    or None if another open file holds it.
+    """
+    handle = open(path, 'a+b')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+class WriteAheadLog:
+    """Append-only, fsync'd log of submitted row batches."""
+
+    def __init__(self, path, slot=0):
+        self.path = path
+        self.slot = slot
+        self._lock = threading.Lock()
+        self._last_seq = None
+        self._owner_lock = None
+
+    @classmethod
+    def claim(cls, excel_path):
+        """The first log of the workbook no running process uses, locked for this one."""
+        for slot in range(MAX_LOGS):
+            path = wal_path_for(excel_path, slot)
+            owner_lock = _try_lock(path + '.lock')
+            if owner_lock is not None:
+                wal = cls(path, slot)
+                wal._owner_lock = owner_lock
+                return wal
+        raise RuntimeError(f"All {MAX_LOGS} write-ahead logs of '{excel_path}' are in use")
+
+    @classmethod
+    def orphans(cls, excel_path):
+        """Existing logs of the workbook whose process is gone, each locked for the caller."""
+        for slot in range(MAX_LOGS):
+            path = wal_path_for(excel_path, slot)
+            if not os.path.exists(path):
+                continue
+            owner_lock = _try_lock(path + '.lock')
+            if owner_lock is not None:
+                wal = cls(path, slot)
+                wal._owner_lock = owner_lock
+                yield wal
+
+    def release(self):
+        """Give up the log so another process may claim (or replay) it."""
+        if self._owner_lock is not None:
+            self._owner_lock.close()
+            self._owner_lock = None
+
+    def _read(self):
+        """(seq, rows) entries in log order; a torn last line is ignored."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    entries.append((int(entry['seq']), entry['rows']))
+                except (ValueError, KeyError, TypeError) as error:
+                    # Only the last line can be incomplete (crash during append)
+                    logging.warning(f"Skipping unreadable entry at {self.path}:{line_number}: {error}")
+        return entries
+
+    def _next_seq(self):
+        if self._last_seq is None:
+            entries = self._read()
+            self._last_seq = entries[-1][0] if entries else 0
+        # Clock-based, so numbers stay above anything applied before a restart
+        # even when the log itself was emptied
+        self._last_seq = max(self._last_seq + 1, time.time_ns())
+        return self._last_seq
+
+    def append(self, rows) -> int:
+        """Durably log one submission; returns its sequence number."""
+        with self._lock:
+            seq = self._next_seq()
+            line = json.dumps({'seq': seq, 'rows': rows}, default=str) + '\n'
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            return seq
+
+    def pending(self, applied_seq=0) -> list:
+        """Logged entries newer than ``applied_seq``, oldest first."""
+        with self._lock:
+            return [(seq, rows) for seq, rows in self._read() if seq > applied_seq]
+
+    def discard(self, seqs=None, up_to=None):
+        """
+        Drop entries from the log: the given ``seqs`` and/or every entry up to
+        ``up_to``. The log is rewritten next to itself and renamed into place.
+        """
+        seqs = set(seqs or ())
+        with self._lock:
+            entries = self._read()
+            keep = [
+                (seq, rows) for seq, rows in entries
+                if seq not in seqs and (up_to is None or seq > up_to)
+            ]
+            if len(keep) == len(entries):
+                return
+            if not keep:
+                os.remove(self.path)
+                return
+            with task_store.atomic_file(self.path) as temp_path:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for seq, rows in keep:
+                        f.write(json.dumps({'seq': seq, 'rows': rows}, default=str) + '\n')